@@ -27,7 +27,7 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
         
-    query = select(User).filter(User.username == username)
+    query = select(User).filter(User.username == username, User.deleted_at.is_(None))
     result = await db.execute(query)
     user = result.scalar_one_or_none()
     
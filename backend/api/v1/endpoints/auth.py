@@ -5,43 +5,21 @@ from fastapi.responses import JSONResponse
 from models import User
 from schemas.user import UserCreate, UserResponse, Token
 from services.auth import AuthService
+from services.purge import PurgeService, schedule_purge
+from services.email import send_email
 from core.security import verify_password, get_password_hash, create_access_token, decode_token
 from core.config import settings
 from database import get_db
 from typing import Dict, Any
 import logging
 import json
-import smtplib
-from email.mime.text import MIMEText
 import os
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
-SMTP_USERNAME = os.getenv("SMTP_USERNAME")
-SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 FRONTEND_URL = os.getenv("FRONTEND_URL", "https://ai-powered-goal-tracker-z0co.onrender.com")
 
-async def send_email(to_email: str, subject: str, body: str):
-    try:
-        msg = MIMEText(body, "html")
-        msg["Subject"] = subject
-        msg["From"] = SMTP_USERNAME
-        msg["To"] = to_email
-
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SMTP_USERNAME, SMTP_PASSWORD)
-            server.send_message(msg)
-            
-        logger.info(f"Email sent successfully to {to_email}")
-        return True
-    except Exception as e:
-        logger.error(f"Failed to send email: {str(e)}")
-        return False
-
 @router.post("/register")
 async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     try:
@@ -149,7 +127,7 @@ async def login(request: Request, db: AsyncSession = Depends(get_db)):
                 content={"success": False, "detail": "Username and password required"}
             )
 
-        query = select(User).filter(User.username == data["username"])
+        query = select(User).filter(User.username == data["username"], User.deleted_at.is_(None))
         result = await db.execute(query)
         user = result.scalar_one_or_none()
 
@@ -203,7 +181,7 @@ async def get_current_user(request: Request, db: AsyncSession = Depends(get_db))
             if not username:
                 raise HTTPException(status_code=401, detail="Invalid token")
 
-            query = select(User).filter(User.username == username)
+            query = select(User).filter(User.username == username, User.deleted_at.is_(None))
             result = await db.execute(query)
             user = result.scalar_one_or_none()
 
@@ -229,7 +207,7 @@ async def update_user(request: Request, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=401, detail="Not authenticated")
 
     data = await request.json()
-    query = select(User).filter(User.id == int(user_id))
+    query = select(User).filter(User.id == int(user_id), User.deleted_at.is_(None))
     result = await db.execute(query)
     user = result.scalar_one_or_none()
     if not user:
@@ -252,13 +230,17 @@ async def delete_user(request: Request, db: AsyncSession = Depends(get_db)):
     if not user_id:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    query = select(User).filter(User.id == int(user_id))
+    query = select(User).filter(User.id == int(user_id), User.deleted_at.is_(None))
     result = await db.execute(query)
     user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    await db.delete(user)
-    await db.commit()
+    # Hide the account right away; its data is removed in the background
+    await PurgeService(db).mark_deleted(user)
+    schedule_purge(user.id)
     request.session.clear()
-    return {"success": True, "message": "User deleted successfully"}
+    return JSONResponse(
+        status_code=202,
+        content={"success": True, "message": "Account scheduled for deletion"}
+    )
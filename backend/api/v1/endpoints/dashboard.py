@@ -0,0 +1,132 @@
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db
+from models import User
+from services.rollup import RollupService
+from services.dashboard import DashboardService
+from api.v1.deps import get_current_user
+from core.rate_limit import RateLimit
+from datetime import date, timedelta
+from typing import Optional, Tuple
+import hashlib
+import json
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+DEFAULT_RANGE_DAYS = 30
+MAX_RANGE_DAYS = 366
+
+def _resolve_range(start: Optional[date], end: Optional[date]) -> Tuple[date, date]:
+    end = end or date.today()
+    start = start or end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if start > end:
+        raise ValueError("start must not be after end")
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise ValueError(f"Range must not exceed {MAX_RANGE_DAYS} days")
+    return start, end
+
+@router.get("")
+async def get_dashboard(
+    request: Request,
+    suggestions: str = Query("inline", pattern="^(inline|defer)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> Response:
+    """The user, their goals with latest progress and AI suggestions in one response.
+
+    With ``suggestions=defer`` the AI part is never waited for: cached
+    suggestions are included, otherwise ``suggestions_pending`` is true
+    and /goals/suggestions/{user_id} can be fetched after rendering.
+    Responses carry an ETag, so an unchanged dashboard is a 304.
+    """
+    try:
+        content = {
+            "success": True,
+            **await DashboardService(db).build(
+                current_user,
+                defer_suggestions=suggestions == "defer",
+                rate_limit=lambda: RateLimit("suggestions")(request)
+            )
+        }
+    except Exception as e:
+        logger.error(f"Error building dashboard: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={"success": False, "detail": str(e)}
+        )
+
+    body = json.dumps(content, separators=(",", ":")).encode()
+    headers = {
+        "ETag": f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        # Per user, and stale as soon as a goal changes: always revalidate
+        "Cache-Control": "private, no-cache",
+        "Vary": "Authorization"
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get("/categories")
+async def get_category_dashboard(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> JSONResponse:
+    try:
+        start, end = _resolve_range(start, end)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"success": False, "detail": str(e)})
+
+    try:
+        categories = await RollupService(db).category_summary(current_user.id, start, end)
+        return JSONResponse(
+            status_code=200,
+            content={
+                "success": True,
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "categories": categories
+            }
+        )
+    except Exception as e:
+        logger.error(f"Error building category dashboard: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={"success": False, "detail": str(e)}
+        )
+
+@router.get("/daily")
+async def get_daily_dashboard(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    category: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> JSONResponse:
+    try:
+        start, end = _resolve_range(start, end)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"success": False, "detail": str(e)})
+
+    try:
+        days = await RollupService(db).daily_series(current_user.id, start, end, category)
+        return JSONResponse(
+            status_code=200,
+            content={
+                "success": True,
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "category": category,
+                "days": days
+            }
+        )
+    except Exception as e:
+        logger.error(f"Error building daily dashboard: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={"success": False, "detail": str(e)}
+        )
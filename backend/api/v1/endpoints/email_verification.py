@@ -7,33 +7,11 @@ from schemas.user import UserCreate, PasswordResetRequest
 from services.auth import AuthService
 from core.security import create_access_token, get_password_hash, decode_token
 from database import get_db
-import smtplib
-from email.mime.text import MIMEText
-import os
+from services.email import send_email
+import logging
 
 router = APIRouter()
-
-SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
-SMTP_USERNAME = os.getenv("SMTP_USERNAME")
-SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
-
-async def send_email(to_email: str, subject: str, body: str):
-    if not SMTP_USERNAME or not SMTP_PASSWORD:
-        raise ValueError("SMTP credentials are not set.")
-    
-    msg = MIMEText(body, "html")
-    msg["Subject"] = subject
-    msg["From"] = SMTP_USERNAME
-    msg["To"] = to_email
-
-    try:
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SMTP_USERNAME, SMTP_PASSWORD)
-            server.sendmail(SMTP_USERNAME, to_email, msg.as_string())
-    except smtplib.SMTPException as e:
-        raise ValueError(f"SMTP error occurred: {str(e)}")
+logger = logging.getLogger(__name__)
 
 @router.post("/request-password-reset")
 async def request_password_reset(request: PasswordResetRequest, db: AsyncSession = Depends(get_db)):
@@ -54,8 +32,9 @@ async def request_password_reset(request: PasswordResetRequest, db: AsyncSession
     
     try:
         await send_email(user.email, "Password Reset Request", email_body)
-    except ValueError as e:
-        return JSONResponse(status_code=500, content={"success": False, "detail": str(e)})
+    except Exception as e:
+        logger.error(f"Failed to send password reset email: {str(e)}")
+        return JSONResponse(status_code=500, content={"success": False, "detail": "Failed to send password reset email"})
     
     return JSONResponse(status_code=200, content={"success": True, "message": "Password reset email sent"})
 
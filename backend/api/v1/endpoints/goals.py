@@ -1,14 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from database import get_db
-from models import Goal, ProgressUpdate, User
-from services.ai import AIService
+from models import Goal, User
+from services.goals import GoalService
+from services.dashboard import (
+    STARTER_SUGGESTIONS, format_goal, suggestion_inputs, cached_suggestions, fresh, generation
+)
+from services.rollup import RollupService
+from services.search import SearchService
+# services.analytics and services.similarity load NumPy, so they are
+# imported inside the handlers that use them instead of at startup
 from datetime import datetime
 from typing import Dict, Any
+import asyncio
 import logging
 from core.security import decode_token
+from core.rate_limit import RateLimit
+from core.exceptions import RateLimitException
+from core.realtime import publish_user_event
+from core.idempotency import IdempotentRequest
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -21,7 +33,7 @@ async def get_user_from_token(request: Request, db: AsyncSession = Depends(get_d
             payload = decode_token(token)
             username = payload.get("sub")
             if username:
-                query = select(User).filter(User.username == username)
+                query = select(User).filter(User.username == username, User.deleted_at.is_(None))
                 result = await db.execute(query)
                 user = result.scalar_one_or_none()
                 if user:
@@ -32,7 +44,7 @@ async def get_user_from_token(request: Request, db: AsyncSession = Depends(get_d
     # Fallback to session if token auth fails
     user_id = request.session.get('user_id')
     if user_id:
-        query = select(User).filter(User.id == int(user_id))
+        query = select(User).filter(User.id == int(user_id), User.deleted_at.is_(None))
         result = await db.execute(query)
         user = result.scalar_one_or_none()
         if user:
@@ -40,14 +52,29 @@ async def get_user_from_token(request: Request, db: AsyncSession = Depends(get_d
     
     raise HTTPException(status_code=401, detail="Not authenticated")
 
+def serialize_goal(goal: Goal) -> Dict[str, Any]:
+    return {
+        "id": goal.id,
+        "category": goal.category,
+        "description": goal.description,
+        "target_date": goal.target_date.isoformat(),
+        "created_at": goal.created_at.isoformat()
+    }
+
 @router.post("/create")
 async def create_goal(
     request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_user_from_token)
 ) -> JSONResponse:
+    idempotency = None
     try:
         data = await request.json()
+
+        idempotency = IdempotentRequest(request, "goals.create", current_user.id, data)
+        replay = await idempotency.claim()
+        if replay is not None:
+            return replay
         
         goal = Goal(
             user_id=current_user.id,
@@ -57,24 +84,23 @@ async def create_goal(
         )
     
         db.add(goal)
+        await db.flush()
+        from services.similarity import SimilarityService
+        await SimilarityService(db).index_goal(goal)
+
+        goal_data = serialize_goal(goal)
+        content = {"success": True, "goal": goal_data}
+        await idempotency.complete(201, content, session=db)
         await db.commit()
-        await db.refresh(goal)
+        from services.analytics import invalidate_user_analytics
+        await invalidate_user_analytics(current_user.id)
+        await publish_user_event(current_user.id, "goal.created", goal_data)
     
-        return JSONResponse(
-            status_code=201,
-            content={
-                "success": True,
-                "goal": {
-                    "id": goal.id,
-                    "category": goal.category,
-                    "description": goal.description,
-                    "target_date": goal.target_date.isoformat(),
-                    "created_at": goal.created_at.isoformat()
-                }
-            }
-        )
+        return JSONResponse(status_code=201, content=content)
     except Exception as e:
         await db.rollback()
+        if idempotency is not None:
+            await idempotency.release()
         logger.error(f"Error creating goal: {str(e)}")
         return JSONResponse(
             status_code=500,
@@ -95,29 +121,10 @@ async def get_user_goals(
                 content={"success": False, "detail": "Not authorized"}
             )
 
-        # Fetch goals
-        query = select(Goal).filter(Goal.user_id == user_id)
-        result = await db.execute(query)
-        goals = result.scalars().all()
-
-        # Format goals
-        formatted_goals = []
-        for goal in goals:
-            # Get latest progress
-            progress_query = select(ProgressUpdate).filter(
-                ProgressUpdate.goal_id == goal.id
-            ).order_by(ProgressUpdate.created_at.desc())
-            progress_result = await db.execute(progress_query)
-            latest_progress = progress_result.scalar_one_or_none()
+        # Fetch goals together with their latest progress
+        goals = await GoalService(db).get_user_goals_with_latest_progress(user_id)
 
-            formatted_goals.append({
-                "id": goal.id,
-                "category": goal.category,
-                "description": goal.description,
-                "target_date": goal.target_date.isoformat(),
-                "created_at": goal.created_at.isoformat(),
-                "progress": latest_progress.progress_value if latest_progress else 0
-            })
+        formatted_goals = [format_goal(goal, latest_progress) for goal, latest_progress in goals]
 
         return JSONResponse(
             status_code=200,
@@ -149,42 +156,11 @@ async def get_suggestions(
                 content={"success": False, "detail": "Not authorized"}
             )
         
-        # Get user's goals with progress information
-        goals_query = select(Goal).filter(Goal.user_id == user_id)
-        result = await db.execute(goals_query)
-        goals = result.scalars().all()
+        # Get user's goals with their latest progress update
+        goals = await GoalService(db).get_user_goals_with_latest_progress(user_id)
         
         # Format goals with their latest progress
-        formatted_goals = []
-        for goal in goals:
-            try:
-                # Get latest progress update
-                progress_query = select(ProgressUpdate).filter(
-                    ProgressUpdate.goal_id == goal.id
-                ).order_by(ProgressUpdate.created_at.desc())
-                progress_result = await db.execute(progress_query)
-                latest_progress = progress_result.scalar_one_or_none()
-                
-                # Ensure progress_value is a valid number
-                progress_value = 0
-                if latest_progress and hasattr(latest_progress, 'progress_value'):
-                    try:
-                        progress_value = float(latest_progress.progress_value)
-                        if not (0 <= progress_value <= 100):
-                            progress_value = 0
-                    except (TypeError, ValueError):
-                        progress_value = 0
-                
-                formatted_goals.append({
-                    "category": goal.category,
-                    "description": goal.description,
-                    "target_date": goal.target_date.isoformat() if goal.target_date else None,
-                    "progress": progress_value,
-                    "created_at": goal.created_at.isoformat() if goal.created_at else None
-                })
-            except Exception as e:
-                logger.error(f"Error formatting goal {goal.id}: {str(e)}")
-                continue  # Skip this goal if there's an error
+        formatted_goals = suggestion_inputs(goals)
 
         # If no goals yet, return starter suggestions
         if not goals:
@@ -193,17 +169,20 @@ async def get_suggestions(
                 status_code=200,
                 content={
                     "success": True,
-                    "suggestions": [
-                        "Start by creating your first SMART goal - make it Specific, Measurable, Achievable, Relevant, and Time-bound",
-                        "Think about what you want to achieve in different areas of your life: Health, Career, Personal Development",
-                        "Consider breaking down your future goals into smaller, manageable milestones"
-                    ]
+                    "suggestions": STARTER_SUGGESTIONS
                 }
             )
 
-        # Use AI service to generate personalized suggestions
-        ai_service = AIService()
-        suggestions = await ai_service.get_personalized_suggestions(formatted_goals)
+        # Reuse suggestions generated for exactly these goals, or join the
+        # generation /dashboard already started; only a new provider call
+        # spends from the rate limit
+        suggestions = fresh(await cached_suggestions(user_id), formatted_goals)
+        if suggestions is None:
+            task = await generation(
+                user_id, formatted_goals, rate_limit=lambda: RateLimit("suggestions")(request)
+            )
+            # Shielded: a client that goes away must not cancel a shared generation
+            suggestions = await asyncio.shield(task)
         
         return JSONResponse(
             status_code=200,
@@ -213,6 +192,8 @@ async def get_suggestions(
             }
         )
         
+    except RateLimitException:
+        raise
     except Exception as e:
         logger.error(f"Error getting suggestions: {str(e)}", exc_info=True)
         return JSONResponse(
@@ -223,6 +204,66 @@ async def get_suggestions(
             }
         )
 
+@router.get("/analytics/{user_id}")
+async def get_goal_analytics(
+    user_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_user_from_token)
+) -> JSONResponse:
+    try:
+        if user_id != current_user.id:
+            return JSONResponse(
+                status_code=403,
+                content={"success": False, "detail": "Not authorized"}
+            )
+
+        from services.analytics import AnalyticsService
+        analytics = await AnalyticsService(db).get_user_analytics(user_id)
+
+        return JSONResponse(
+            status_code=200,
+            content={
+                "success": True,
+                "analytics": analytics
+            }
+        )
+    except Exception as e:
+        logger.error(f"Error computing goal analytics: {str(e)}", exc_info=True)
+        return JSONResponse(
+            status_code=500,
+            content={"success": False, "detail": str(e)}
+        )
+
+@router.get("/search")
+async def search_goals(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=1000),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_user_from_token)
+) -> JSONResponse:
+    try:
+        page = await SearchService(db).search(current_user.id, q, limit, offset)
+
+        return JSONResponse(
+            status_code=200,
+            content={
+                "success": True,
+                "query": q,
+                "limit": limit,
+                "offset": offset,
+                **page
+            }
+        )
+    except Exception as e:
+        logger.error(f"Error searching goals: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={"success": False, "detail": str(e)}
+        )
+
 @router.get("/{goal_id}")
 async def get_goal(
     goal_id: int,
@@ -266,6 +307,49 @@ async def get_goal(
             content={"success": False, "detail": str(e)}
         )
 
+@router.get("/{goal_id}/similar")
+async def get_similar_goals(
+    goal_id: int,
+    request: Request,
+    limit: int = Query(5, ge=1, le=50),
+    min_score: float = Query(0.2, ge=0, le=1),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_user_from_token)
+) -> JSONResponse:
+    try:
+        goal = await db.get(Goal, goal_id)
+        if not goal:
+            return JSONResponse(
+                status_code=404,
+                content={"success": False, "detail": "Goal not found"}
+            )
+
+        if goal.user_id != current_user.id:
+            return JSONResponse(
+                status_code=403,
+                content={"success": False, "detail": "Not authorized"}
+            )
+
+        from services.similarity import SimilarityService
+        similar = await SimilarityService(db).find_similar(goal, limit, min_score)
+        await db.commit()
+
+        return JSONResponse(
+            status_code=200,
+            content={
+                "success": True,
+                "goal_id": goal_id,
+                "similar": similar
+            }
+        )
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Error finding similar goals: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={"success": False, "detail": str(e)}
+        )
+
 @router.put("/update")
 async def update_goal(
     request: Request,
@@ -288,27 +372,29 @@ async def update_goal(
                 content={"success": False, "detail": "Not authorized"}
             )
 
-        if 'category' in data:
+        if 'category' in data and data['category'] != goal.category:
             goal.category = data['category']
+            await RollupService(db).update_goal_category(goal.id, goal.category)
         if 'description' in data:
             goal.description = data['description']
+            from services.similarity import SimilarityService
+            await SimilarityService(db).index_goal(goal)
         if 'target_date' in data:
             goal.target_date = datetime.strptime(data['target_date'], '%Y-%m-%d').date()
 
         await db.commit()
         await db.refresh(goal)
+        from services.analytics import invalidate_user_analytics
+        await invalidate_user_analytics(current_user.id)
+
+        goal_data = serialize_goal(goal)
+        await publish_user_event(current_user.id, "goal.updated", goal_data)
         
         return JSONResponse(
             status_code=200,
             content={
                 "success": True,
-                "goal": {
-                    "id": goal.id,
-                    "category": goal.category,
-                    "description": goal.description,
-                    "target_date": goal.target_date.isoformat(),
-                    "created_at": goal.created_at.isoformat()
-                }
+                "goal": goal_data
             }
         )
     except Exception as e:
@@ -342,6 +428,9 @@ async def delete_goal(
 
         await db.delete(goal)
         await db.commit()
+        from services.analytics import invalidate_user_analytics
+        await invalidate_user_analytics(current_user.id)
+        await publish_user_event(current_user.id, "goal.deleted", {"id": goal_id})
         
         return JSONResponse(
             status_code=200,
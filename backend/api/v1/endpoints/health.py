@@ -1,42 +1,25 @@
 # backend/api/v1/endpoints/health.py
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
-from database import get_db
+from fastapi import APIRouter
 from fastapi.responses import JSONResponse
+from core.health import get_health_monitor
+from core.loop_monitor import get_loop_monitor
 
 router = APIRouter()
 
 @router.get("/health")
-async def health_check(db: AsyncSession = Depends(get_db)):
-    """API health check endpoint"""
-    try:
-        # Test database connection
-        await db.execute("SELECT 1")
-        
-        return JSONResponse({
-            "status": "healthy",
-            "services": {
-                "database": "connected",
-                "api": "running"
-            },
-            "details": {
-                "database_connection": "ok",
-                "api_status": "ok"
-            }
-        })
-    except Exception as e:
-        return JSONResponse(
-            status_code=503,
-            content={
-                "status": "unhealthy",
-                "services": {
-                    "database": str(e),
-                    "api": "running"
-                },
-                "details": {
-                    "database_connection": "failed",
-                    "api_status": "ok"
-                }
-            }
-        )
\ No newline at end of file
+async def health_check():
+    """Detailed health from the background checks (no database work per request)"""
+    readiness = get_health_monitor().readiness()
+    return JSONResponse(
+        status_code=200 if readiness["ready"] else 503,
+        content={"status": "healthy" if readiness["ready"] else "unhealthy", **readiness}
+    )
+
+@router.get("/loop")
+async def event_loop_stats():
+    """Event loop lag and the routes of recent stalls; their stacks are only logged"""
+    monitor = get_loop_monitor()
+    if monitor is None:
+        return JSONResponse({"enabled": False})
+    return JSONResponse(monitor.stats())
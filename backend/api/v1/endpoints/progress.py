@@ -1,13 +1,20 @@
 # backend/api/v1/endpoints/progress.py
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from database import get_db
 from models import ProgressUpdate, Goal, User
 from services.ai import AIService
-from typing import Dict, Any
+from services.rollup import RollupService
+from services.analysis_memo import AnalysisMemoService
+from services.history import ProgressHistoryService
+from typing import Dict, Any, Optional
 import logging
 from core.security import decode_token
+from core.rate_limit import RateLimit
+from core.realtime import publish_user_event
+from core.idempotency import IdempotentRequest
+from core.config import settings
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -24,7 +31,7 @@ async def get_user_from_token(request: Request, db: AsyncSession) -> User:
         if not username:
             raise HTTPException(status_code=401, detail="Invalid token")
 
-        query = select(User).filter(User.username == username)
+        query = select(User).filter(User.username == username, User.deleted_at.is_(None))
         result = await db.execute(query)
         user = result.scalar_one_or_none()
         
@@ -35,12 +42,13 @@ async def get_user_from_token(request: Request, db: AsyncSession) -> User:
         logger.error(f"Authentication error: {str(e)}")
         raise HTTPException(status_code=401, detail="Authentication failed")
 
-@router.post("/{goal_id}")
+@router.post("/{goal_id}", dependencies=[Depends(RateLimit("progress"))])
 async def update_progress(
     goal_id: int,
     request: Request,
     db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
+    idempotency = None
     try:
         current_user = await get_user_from_token(request, db)
         data = await request.json()
@@ -54,9 +62,18 @@ async def update_progress(
         if not goal or goal.user_id != current_user.id:
             raise HTTPException(status_code=404, detail="Goal not found")
 
+        # A retried submission replays the first response instead of
+        # paying for another analysis
+        idempotency = IdempotentRequest(request, f"progress.create:{goal_id}", current_user.id, data)
+        replay = await idempotency.claim()
+        if replay is not None:
+            return replay
+
         # Use AI to analyze progress
         ai_service = AIService()
-        analysis_result = await ai_service.analyze_progress(update_text, goal.description)
+        analysis_result = await ai_service.analyze_progress(
+            update_text, goal.description, memo=AnalysisMemoService(db)
+        )
 
         progress_update = ProgressUpdate(
             goal_id=goal_id,
@@ -66,25 +83,39 @@ async def update_progress(
         )
 
         db.add(progress_update)
-        await db.commit()
-        await db.refresh(progress_update)
+        await db.flush()
+        await RollupService(db).record_progress(goal, progress_update)
 
-        return {
+        update_data = {
+            "id": progress_update.id,
+            "text": progress_update.update_text,
+            "progress": progress_update.progress_value,
+            "analysis": progress_update.analysis,
+            "created_at": progress_update.created_at.isoformat()
+        }
+        content = {
             "success": True,
-            "update": {
-                "id": progress_update.id,
-                "text": progress_update.update_text,
-                "progress": progress_update.progress_value,
-                "analysis": progress_update.analysis,
-                "created_at": progress_update.created_at.isoformat()
-            }
+            "update": update_data
         }
+        await idempotency.complete(200, content, session=db)
+        await db.commit()
+        from services.analytics import invalidate_user_analytics
+        await invalidate_user_analytics(current_user.id)
+        await publish_user_event(
+            current_user.id, "progress.analyzed", {"goal_id": goal_id, "update": update_data}
+        )
+
+        return content
 
     except HTTPException:
+        if idempotency is not None:
+            await idempotency.release()
         raise
     except Exception as e:
         logger.error(f"Progress update error: {str(e)}")
         await db.rollback()
+        if idempotency is not None:
+            await idempotency.release()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{goal_id}")
@@ -101,27 +132,48 @@ async def get_progress_history(
         if not goal or goal.user_id != current_user.id:
             raise HTTPException(status_code=404, detail="Goal not found")
 
-        # Get progress updates
-        query = select(ProgressUpdate).filter(
-            ProgressUpdate.goal_id == goal_id
-        ).order_by(ProgressUpdate.created_at.desc())
-        
-        result = await db.execute(query)
-        updates = result.scalars().all()
+        # Hot and archived updates, newest first
+        updates = await ProgressHistoryService(db).updates(goal_id)
 
         return {
             "success": True,
-            "updates": [{
-                "id": update.id,
-                "text": update.update_text,
-                "progress": update.progress_value,
-                "analysis": update.analysis,
-                "created_at": update.created_at.isoformat()
-            } for update in updates]
+            "updates": updates
         }
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error fetching progress updates: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{goal_id}/series")
+async def get_progress_series(
+    goal_id: int,
+    request: Request,
+    points: int = Query(settings.PROGRESS_SERIES_DEFAULT_POINTS, ge=3, le=settings.PROGRESS_SERIES_MAX_POINTS),
+    bucket: Optional[str] = Query(None, pattern="^(hour|day|week)$"),
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """Timestamps and progress values for charts, at most ``points`` of them.
+
+    ``bucket`` first reduces the history to the last value per hour, day
+    or week; the result is then downsampled with LTTB, which keeps the
+    shape of the curve.
+    """
+    try:
+        current_user = await get_user_from_token(request, db)
+
+        goal = await db.get(Goal, goal_id)
+        if not goal or goal.user_id != current_user.id:
+            raise HTTPException(status_code=404, detail="Goal not found")
+
+        # Loaded on first use so NumPy stays off the startup path
+        from services.series import ProgressSeriesService
+        series = await ProgressSeriesService(db).series(goal_id, points, bucket)
+        return {"success": True, "goal_id": goal_id, **series}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching progress series: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,48 @@
+# backend/api/v1/endpoints/realtime.py
+from fastapi import APIRouter, WebSocket, status
+from sqlalchemy import select
+from database import AsyncSessionLocal
+from models import User
+from core.security import decode_token
+from core.realtime import get_connection_manager
+from typing import Optional
+import logging
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+async def _user_id_from_token(token: Optional[str]) -> Optional[int]:
+    if not token:
+        return None
+    try:
+        username = decode_token(token).get("sub")
+    except Exception:
+        return None
+    if not username:
+        return None
+
+    # A short-lived session: the socket may stay open for hours
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(User.id).filter(User.username == username, User.deleted_at.is_(None))
+        )
+        return result.scalar_one_or_none()
+
+@router.websocket("/ws")
+async def live_updates(websocket: WebSocket, token: Optional[str] = None):
+    """Push goal and progress events for the authenticated user.
+
+    Browsers cannot set headers on WebSocket requests, so the JWT from
+    login is passed as the ``token`` query parameter. Messages are JSON
+    ``{"type": ..., "data": {...}}``; the server sends ``ping`` regularly
+    and closes sockets that stay silent past the idle timeout.
+    """
+    user_id = await _user_id_from_token(token)
+    # Accept before rejecting: closing during the handshake becomes an
+    # HTTP 403, which browsers report as 1006 and the client retries
+    await websocket.accept()
+    if user_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await get_connection_manager().serve(websocket, user_id)
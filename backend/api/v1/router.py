@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from api.v1.endpoints import auth, goals, progress, health,email_verification
+from api.v1.endpoints import auth, goals, progress, health,email_verification, dashboard, realtime
 
 api_router = APIRouter()
 
@@ -7,4 +7,6 @@ api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(goals.router, prefix="/goals", tags=["goals"])
 api_router.include_router(progress.router, prefix="/progress", tags=["progress"])
 api_router.include_router(health.router, prefix="/health", tags=["health"])
-api_router.include_router(email_verification.router, prefix="/email", tags=["email_verification"])
\ No newline at end of file
+api_router.include_router(email_verification.router, prefix="/email", tags=["email_verification"])
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+api_router.include_router(realtime.router, tags=["realtime"])
\ No newline at end of file
@@ -0,0 +1,93 @@
+# backend/benchmarks/fake_ai.py
+"""Local stand-in for the Groq chat completions API.
+
+    python -m benchmarks.fake_ai --port 8701 --latency-ms 400 --error-rate 0.02
+
+Point the app at it with GROQ_BASE_URL=http://127.0.0.1:8701. Replies are
+shaped like the real ones the services parse: a JSON object for progress
+analysis and plain lines for suggestions.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+def create_fake_ai_app(latency_ms: float = 300, jitter_ms: float = 100, error_rate: float = 0.0) -> FastAPI:
+    app = FastAPI(title="Fake Groq")
+    stats = {"requests": 0, "errors": 0}
+
+    def _reply(prompt: str) -> str:
+        if "percentage" in prompt:
+            return json.dumps({
+                "percentage": random.randint(5, 95),
+                "analysis": "Steady progress; keep the current routine and review weekly."
+            })
+        return "\n".join([
+            "Schedule three focused sessions this week for your most urgent goal.",
+            "Break the next milestone into daily tasks you can finish in 30 minutes.",
+            "Review progress every Sunday and adjust the plan for the week ahead."
+        ])
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        stats["requests"] += 1
+        body = await request.json()
+        delay = max(0.0, random.gauss(latency_ms, jitter_ms)) / 1000.0
+        await asyncio.sleep(delay)
+
+        if random.random() < error_rate:
+            stats["errors"] += 1
+            return JSONResponse(
+                status_code=503,
+                content={"error": {"message": "Simulated provider error", "type": "server_error"}}
+            )
+
+        prompt = " ".join(str(message.get("content", "")) for message in body.get("messages", []))
+        content = _reply(prompt)
+        return {
+            "id": f"fake-{stats['requests']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": len(prompt) // 4,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": (len(prompt) + len(content)) // 4
+            }
+        }
+
+    @app.get("/openai/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "fake", "object": "model"}]}
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run a fake Groq API server")
+    parser.add_argument("--port", type=int, default=8701)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--jitter-ms", type=float, default=100)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_fake_ai_app(args.latency_ms, args.jitter_ms, args.error_rate),
+        host="127.0.0.1",
+        port=args.port,
+        log_level="warning"
+    )
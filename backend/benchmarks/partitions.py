@@ -0,0 +1,306 @@
+# backend/benchmarks/partitions.py
+"""Check progress_updates partitioning (services/partitions.py) on a real Postgres.
+
+    python -m benchmarks.partitions --database-url postgresql+asyncpg://postgres@localhost:5432/partitions
+    python -m benchmarks.partitions --database-url ... --no-ssl   # local server without TLS
+
+DROPS EVERY TABLE in the given database, so point it at a scratch one.
+Seeds an unpartitioned progress_updates spanning more than a year,
+then turns PROGRESS_PARTITIONING on and runs migrate.py the way a
+deploy would. Checks that rows, ids and the id sequence survive the
+conversion, that deleting a goal still cascades, that the full-text
+search index exists on the parent and is used, that created_at bounds
+prune partitions, that archived months are detached while a month
+holding a goal's latest update is kept, and that a second maintenance
+run changes nothing. Then repeats the checks that apply on a database
+created with partitioning already on. Exits 1 on any failed check.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+GOALS = 20
+UPDATE_EVERY_DAYS = 3
+HISTORY_DAYS = 420
+# A goal whose latest update is old enough to be in an archivable month
+IDLE_GOAL_DAYS_AGO = 300
+
+class Checks:
+    def __init__(self, phase: str):
+        self.phase = phase
+        self.failures: List[str] = []
+
+    def check(self, ok: bool, label: str, detail: Any = "") -> None:
+        print(f"{'ok  ' if ok else 'FAIL'} [{self.phase}] {label}{f': {detail}' if detail != '' else ''}")
+        if not ok:
+            self.failures.append(label)
+
+async def _reset(engine) -> None:
+    from sqlalchemy import text
+    from database import Base
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.execute(text("DROP TABLE IF EXISTS schema_migrations"))
+
+async def _stats(db) -> Dict[str, Any]:
+    from sqlalchemy import text
+    row = (await db.execute(text(
+        "SELECT count(*), coalesce(max(id), 0), coalesce(sum(id), 0), "
+        "coalesce(sum(length(update_text)), 0) FROM progress_updates"
+    ))).one()
+    return {"count": row[0], "max_id": row[1], "id_sum": int(row[2]), "text_length": int(row[3])}
+
+async def _schema(db) -> Dict[str, List[str]]:
+    from sqlalchemy import text
+    indexes = await db.execute(text(
+        "SELECT indexname FROM pg_indexes WHERE tablename = 'progress_updates' ORDER BY indexname"
+    ))
+    constraints = await db.execute(text(
+        "SELECT conname FROM pg_constraint WHERE conrelid = 'progress_updates'::regclass ORDER BY conname"
+    ))
+    return {"indexes": list(indexes.scalars().all()), "constraints": list(constraints.scalars().all())}
+
+async def _explain(db, sql: str) -> str:
+    from sqlalchemy import text
+    result = await db.execute(text(f"EXPLAIN {sql}"))
+    return "\n".join(result.scalars().all())
+
+async def seed() -> int:
+    """Unpartitioned schema with more than a year of updates; state goes to stdout."""
+    from sqlalchemy import text
+    from database import AsyncSessionLocal, engine
+    from migrate import migrate
+    from models import Goal, ProgressUpdate, User
+
+    await _reset(engine)
+    await migrate()
+    now = datetime.utcnow()
+    async with AsyncSessionLocal() as db:
+        user = User(username="partitions", email="partitions@example.com", hashed_password="x", is_verified=True)
+        db.add(user)
+        await db.flush()
+        goals = [
+            Goal(user_id=user.id, category="Health", description=f"Goal {index}",
+                 target_date=(now + timedelta(days=90)).date(), created_at=now - timedelta(days=HISTORY_DAYS))
+            for index in range(GOALS + 1)
+        ]
+        db.add_all(goals)
+        await db.flush()
+        active, idle = goals[:-1], goals[-1]
+        for goal in active:
+            for days_ago in range(HISTORY_DAYS, -1, -UPDATE_EVERY_DAYS):
+                db.add(ProgressUpdate(
+                    goal_id=goal.id, update_text=f"Ran {days_ago % 10 + 1} km along the river",
+                    progress_value=(HISTORY_DAYS - days_ago) / HISTORY_DAYS * 100,
+                    created_at=now - timedelta(days=days_ago, hours=goal.id)
+                ))
+        for days_ago in (IDLE_GOAL_DAYS_AGO + 20, IDLE_GOAL_DAYS_AGO):
+            db.add(ProgressUpdate(goal_id=idle.id, update_text="Swam laps", progress_value=10,
+                                  created_at=now - timedelta(days=days_ago)))
+        await db.commit()
+        # Rows written before created_at had a default must still be copied
+        await db.execute(text(
+            "INSERT INTO progress_updates (goal_id, update_text, progress_value) "
+            "VALUES (:goal_id, 'Stretched after the run', 5)"
+        ), {"goal_id": active[0].id})
+        await db.execute(text("UPDATE progress_updates SET created_at = NULL WHERE id = (SELECT max(id) FROM progress_updates)"))
+        await db.commit()
+
+        state = await _stats(db)
+        state.update({
+            "user_id": user.id,
+            "goal_id": active[0].id,
+            "goal_updates": await db.scalar(text(
+                "SELECT count(*) FROM progress_updates WHERE goal_id = :goal_id"
+            ), {"goal_id": active[0].id}),
+            "cascade_goal_id": active[1].id,
+            "cascade_goal_updates": await db.scalar(text(
+                "SELECT count(*) FROM progress_updates WHERE goal_id = :goal_id"
+            ), {"goal_id": active[1].id}),
+            "idle_goal_id": idle.id,
+            "idle_latest": (now - timedelta(days=IDLE_GOAL_DAYS_AGO)).isoformat(),
+            "oldest": (now - timedelta(days=HISTORY_DAYS, hours=GOALS)).isoformat(),
+        })
+    await engine.dispose()
+    print(json.dumps(state))
+    return 0
+
+async def _common_checks(checks: Checks, db) -> None:
+    """Checks that hold on every partitioned progress_updates."""
+    from sqlalchemy import text
+    from services.partitions import PartitionService, month_start, partition_name
+    service = PartitionService(db)
+
+    checks.check(await service.is_partitioned() is True, "progress_updates is partitioned")
+    schema = await _schema(db)
+    for name in ("progress_updates_pkey", "progress_updates_goal_id_fkey"):
+        checks.check(name in schema["constraints"], f"constraint {name} on the parent")
+    for name in ("ix_progress_updates_fts", "ix_progress_updates_goal_id", "ix_progress_updates_goal_id_created_at"):
+        checks.check(name in schema["indexes"], f"index {name} on the parent")
+
+    since = month_start((datetime.utcnow() - timedelta(days=7)).date())
+    recent = await _explain(db, f"SELECT count(*) FROM progress_updates WHERE created_at >= '{since.isoformat()}'")
+    scanned = sorted({word for word in recent.split() if word.startswith("progress_updates_p")})
+    checks.check(scanned and scanned[0] == partition_name(since), "a created_at bound prunes older partitions", scanned)
+
+    # Small tables read sequentially anyway; this asks whether the index can be used at all
+    await db.execute(text("SET LOCAL enable_seqscan = off"))
+    from services.search import _POSTGRES_PROGRESS
+    search_plan = await _explain(db, str(_POSTGRES_PROGRESS).replace(":q", "'river'")
+                                 .replace(":user_id", "1").replace(":limit", "20"))
+    checks.check("Bitmap Index Scan on progress_updates_p" in search_plan,
+                 "full-text search uses the partitions' GIN indexes")
+    await db.rollback()
+
+    checks.check(await service.maintain() == [], "a second maintenance run is a no-op")
+
+async def convert() -> int:
+    """PROGRESS_PARTITIONING on, against the seeded unpartitioned table."""
+    from sqlalchemy import text
+    from database import AsyncSessionLocal, engine
+    from migrate import migrate
+    from models import ProgressUpdate
+    from services.archive import run_archive
+    from services.history import ProgressHistoryService
+    from services.partitions import DEFAULT_PARTITION, PartitionService, partition_name, month_start
+    from services.search import SearchService
+
+    state = json.loads(sys.stdin.read())
+    checks = Checks("convert")
+    await migrate()
+    async with AsyncSessionLocal() as db:
+        after = await _stats(db)
+        for key in ("count", "max_id", "id_sum", "text_length"):
+            checks.check(after[key] == state[key], f"{key} preserved", f"{state[key]} -> {after[key]}")
+        defaulted = await db.scalar(text(f"SELECT count(*) FROM {DEFAULT_PARTITION}"))
+        checks.check(defaulted == 0, "every row landed in a monthly partition", f"{defaulted} in the default")
+        months = await PartitionService(db).partitions()
+        oldest = month_start(datetime.fromisoformat(state["oldest"]).date())
+        checks.check(months[0] == oldest, "partitions start at the oldest row's month", partition_name(months[0]))
+
+        update = ProgressUpdate(goal_id=state["goal_id"], update_text="First run after the switch", progress_value=50)
+        db.add(update)
+        await db.commit()
+        checks.check(update.id == state["max_id"] + 1, "the id sequence continues", update.id)
+
+        found = await SearchService(db).search(state["user_id"], "switch")
+        checks.check([result["id"] for result in found["results"]] == [update.id], "search finds the new update")
+
+        await db.execute(text("DELETE FROM goals WHERE id = :goal_id"), {"goal_id": state["cascade_goal_id"]})
+        await db.commit()
+        left = await db.scalar(text("SELECT count(*) FROM progress_updates WHERE goal_id = :goal_id"),
+                               {"goal_id": state["cascade_goal_id"]})
+        checks.check(state["cascade_goal_updates"] > 0 and left == 0, "deleting a goal cascades to every partition",
+                     f"{state['cascade_goal_updates']} -> {left}")
+
+        await _common_checks(checks, db)
+
+    moved = await run_archive()
+    async with AsyncSessionLocal() as db:
+        before = set(await PartitionService(db).partitions())
+        detached = await PartitionService(db).maintain()
+        remaining = set(await PartitionService(db).partitions())
+        idle_month = month_start(datetime.fromisoformat(state["idle_latest"]).date())
+        cutoff = datetime.utcnow() - timedelta(days=180)
+        checks.check(moved > 0 and len(detached) > 0, "archived months are detached", f"{moved} archived, {detached}")
+        checks.check(idle_month in remaining, "the month holding a goal's latest update is kept",
+                     partition_name(idle_month))
+        checks.check(all(datetime.combine(month, datetime.min.time()) < cutoff for month in before - remaining),
+                     "only months before the archive cutoff are detached")
+        history = await ProgressHistoryService(db).updates(state["goal_id"])
+        checks.check(len(history) == state["goal_updates"] + 1, "a goal's history spans the archive and the partitions",
+                     len(history))
+        checks.check(await PartitionService(db).maintain() == [], "maintenance after detaching is a no-op")
+    await engine.dispose()
+    return 1 if checks.failures else 0
+
+async def fresh() -> int:
+    """A new database created with PROGRESS_PARTITIONING already on."""
+    from database import AsyncSessionLocal, engine
+    from migrate import migrate
+    from models import Goal, ProgressUpdate, User
+    from services.partitions import PartitionService
+
+    checks = Checks("fresh")
+    await _reset(engine)
+    await migrate()
+    async with AsyncSessionLocal() as db:
+        months = await PartitionService(db).partitions()
+        checks.check(len(months) == int(os.environ["PROGRESS_PARTITIONS_AHEAD"]) + 1,
+                     "this month and the months ahead are created", len(months))
+        user = User(username="fresh", email="fresh@example.com", hashed_password="x", is_verified=True)
+        db.add(user)
+        await db.flush()
+        goal = Goal(user_id=user.id, category="Health", description="Run along the river",
+                    target_date=datetime.utcnow().date())
+        db.add(goal)
+        await db.flush()
+        update = ProgressUpdate(goal_id=goal.id, update_text="Ran 5 km along the river", progress_value=10)
+        db.add(update)
+        await db.commit()
+        checks.check(update.id == 1, "inserts get ids from the sequence", update.id)
+        await _common_checks(checks, db)
+    await engine.dispose()
+    return 1 if checks.failures else 0
+
+PHASES = {"seed": seed, "convert": convert, "fresh": fresh}
+
+def _run_phase(phase: str, env: Dict[str, str], stdin: str = "") -> subprocess.CompletedProcess:
+    # Each phase is its own process: models.py reads PROGRESS_PARTITIONING at import
+    return subprocess.run(
+        [sys.executable, "-m", "benchmarks.partitions", "--phase", phase],
+        cwd=BACKEND_DIR, env=env, input=stdin, text=True, capture_output=True
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check progress_updates partitioning on a scratch Postgres database")
+    parser.add_argument("--database-url", help="postgresql+asyncpg:// URL of a scratch database; every table is dropped")
+    parser.add_argument("--no-ssl", action="store_true", help="Connect without TLS (DB_SSL=false)")
+    parser.add_argument("--phase", choices=sorted(PHASES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.phase:
+        from database import engine
+        # Statement logging would drown the report
+        engine.echo = False
+        sys.exit(asyncio.run(PHASES[args.phase]()))
+    if not args.database_url or not args.database_url.startswith("postgresql"):
+        parser.error("--database-url must point at a PostgreSQL database")
+
+    env = dict(os.environ)
+    env.setdefault("SECRET_KEY", "partitions-secret-key")
+    env.update({
+        "DATABASE_URL": args.database_url,
+        "DB_SSL": "false" if args.no_ssl else env.get("DB_SSL", "true"),
+        "PROGRESS_PARTITIONS_AHEAD": "3",
+        "PROGRESS_ARCHIVE_AFTER_DAYS": "180",
+        "PROGRESS_ARCHIVE_PAUSE_SECONDS": "0",
+        "LOG_LEVEL": "WARNING",
+    })
+
+    exit_code = 0
+    seeded = _run_phase("seed", {**env, "PROGRESS_PARTITIONING": "false"})
+    if seeded.returncode != 0:
+        print(seeded.stdout + seeded.stderr)
+        sys.exit(1)
+    state = seeded.stdout.strip().splitlines()[-1]
+    print(f"Seeded unpartitioned progress_updates: {state}")
+    for phase, stdin in (("convert", state), ("fresh", "")):
+        result = _run_phase(phase, {**env, "PROGRESS_PARTITIONING": "true"}, stdin)
+        print(result.stdout, end="")
+        if result.returncode != 0:
+            if not result.stdout.strip() or "Traceback" in result.stderr:
+                print(result.stderr)
+            exit_code = 1
+    sys.exit(exit_code)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+# backend/benchmarks/query_budget.py
+"""Query-count budget for every API route.
+
+    python -m benchmarks.query_budget            # exits 1 on any violation
+    python -m benchmarks.query_budget --verbose  # print every statement
+
+Seeds a throwaway SQLite database with users that have many goals and
+progress updates, calls each route of api/v1/router.py in-process and
+counts the SQL statements it executes. A route that issues more
+statements than its budget, or a route without a budget, fails the run.
+Budgets are fixed numbers, so a per-row query (N+1) added to any route
+trips them once the seeded data is large enough.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+GOALS_PER_USER = 25
+UPDATES_PER_GOAL = 12
+
+@dataclass
+class Scenario:
+    method: str
+    path: str
+    budget: int
+    # Builds request kwargs (url, json, params, headers) from the seeded fixture
+    request: Callable[["Fixture"], Dict[str, Any]]
+    expected_status: Optional[int] = 200
+    # Awaited inside the measurement, for work the route hands to a background task
+    settle: Optional[Callable[[], Awaitable[None]]] = None
+
+@dataclass
+class Fixture:
+    user_id: int
+    username: str
+    email: str
+    headers: Dict[str, str]
+    goal_ids: List[int] = field(default_factory=list)
+    # A second seeded user with as much data, for the account update and delete
+    other_user_id: int = 0
+
+class QueryCounter:
+    """Counts statements sent to the database through SQLAlchemy events."""
+
+    def __init__(self, engine):
+        self.engine = engine.sync_engine
+        self.statements: List[str] = []
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        from sqlalchemy import event
+        event.listen(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        from sqlalchemy import event
+        event.remove(self.engine, "before_cursor_execute", self._before_cursor_execute)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+def _auth(fixture: Fixture, **kwargs) -> Dict[str, Any]:
+    return {"headers": fixture.headers, **kwargs}
+
+def _token(subject: str) -> str:
+    from core.security import create_access_token
+    return create_access_token(subject=subject)
+
+def _session(user_id: int, **kwargs) -> Dict[str, Any]:
+    """Request kwargs with a session cookie signed the way SessionMiddleware signs it."""
+    import json
+    from base64 import b64encode
+    from itsdangerous import TimestampSigner
+    from core.config import settings
+    cookie = TimestampSigner(str(settings.SECRET_KEY)).sign(b64encode(json.dumps({"user_id": user_id}).encode()))
+    return {"headers": {"Cookie": f"session={cookie.decode()}"}, **kwargs}
+
+async def _purges_done() -> None:
+    from services.purge import wait_for_purges
+    await wait_for_purges()
+
+# Routes are exercised in this order; destructive calls come last.
+SCENARIOS = [
+    Scenario("POST", "/auth/register", 3, lambda f: {
+        "url": "/auth/register",
+        "json": {"username": "budget_new", "email": "budget_new@example.com", "password": "password123"}
+    }, expected_status=201),
+    Scenario("GET", "/auth/verify-email", 2, lambda f: {
+        "url": "/auth/verify-email", "params": {"token": _token("budget_new@example.com")}
+    }),
+    Scenario("POST", "/auth/login", 1, lambda f: {
+        "url": "/auth/login", "json": {"username": f.username, "password": "password123"}
+    }),
+    Scenario("GET", "/auth/me", 1, lambda f: _auth(f, url="/auth/me")),
+    Scenario("GET", "/goals/user/{user_id}", 2, lambda f: _auth(f, url=f"/goals/user/{f.user_id}")),
+    Scenario("GET", "/goals/suggestions/{user_id}", 2, lambda f: _auth(f, url=f"/goals/suggestions/{f.user_id}")),
+    Scenario("GET", "/goals/analytics/{user_id}", 4, lambda f: _auth(f, url=f"/goals/analytics/{f.user_id}")),
+    Scenario("GET", "/goals/search", 3, lambda f: _auth(f, url="/goals/search", params={"q": "books"})),
+    Scenario("GET", "/goals/{goal_id}", 2, lambda f: _auth(f, url=f"/goals/{f.goal_ids[0]}")),
+    Scenario("GET", "/goals/{goal_id}/similar", 4, lambda f: _auth(f, url=f"/goals/{f.goal_ids[0]}/similar")),
+    Scenario("POST", "/goals/create", 4, lambda f: _auth(f, url="/goals/create", json={
+        "category": "Learning",
+        "description": "Read two books about databases",
+        "target_date": (date.today() + timedelta(days=60)).isoformat()
+    }), expected_status=201),
+    Scenario("PUT", "/goals/update", 6, lambda f: _auth(f, url="/goals/update", json={
+        "id": f.goal_ids[1], "category": "Career", "description": "Read three books about databases"
+    })),
+    Scenario("POST", "/progress/{goal_id}", 6, lambda f: _auth(
+        f, url=f"/progress/{f.goal_ids[0]}", json={"update_text": "Finished another chapter"}
+    )),
+    Scenario("GET", "/progress/{goal_id}", 4, lambda f: _auth(f, url=f"/progress/{f.goal_ids[0]}")),
+    Scenario("GET", "/progress/{goal_id}/series", 4, lambda f: _auth(
+        f, url=f"/progress/{f.goal_ids[0]}/series?points=20&bucket=day"
+    )),
+    Scenario("GET", "/dashboard", 2, lambda f: _auth(f, url="/dashboard")),
+    Scenario("GET", "/dashboard/categories", 2, lambda f: _auth(f, url="/dashboard/categories")),
+    Scenario("GET", "/dashboard/daily", 2, lambda f: _auth(f, url="/dashboard/daily")),
+    Scenario("GET", "/health/health", 0, lambda f: {"url": "/health/health"}),
+    Scenario("GET", "/health/loop", 0, lambda f: {"url": "/health/loop"}),
+    Scenario("POST", "/email/request-password-reset", 1, lambda f: {
+        "url": "/email/request-password-reset", "json": {"email": f.email}
+    }, expected_status=None),
+    Scenario("POST", "/email/reset-password", 2, lambda f: {
+        "url": "/email/reset-password", "params": {"token": _token(f.email), "new_password": "password123"}
+    }),
+    # Account changes use session auth; they act on the second user so the
+    # owner's token stays valid for the scenarios after them
+    Scenario("PUT", "/auth/update", 3, lambda f: _session(
+        f.other_user_id, url="/auth/update", json={"email": "budget_renamed@example.com"}
+    )),
+    Scenario("POST", "/auth/logout", 0, lambda f: {"url": "/auth/logout"}),
+    Scenario("DELETE", "/goals/{goal_id}", 3, lambda f: _auth(f, url=f"/goals/{f.goal_ids[-1]}")),
+    # Includes the background purge of the user's goals and updates
+    Scenario("DELETE", "/auth/delete", 7, lambda f: _session(f.other_user_id, url="/auth/delete"),
+             expected_status=202, settle=_purges_done),
+]
+
+async def seed(session_factory) -> Fixture:
+    from core.security import get_password_hash
+    from models import Goal, ProgressUpdate, User
+    from services.rollup import RollupService
+    from services.similarity import SimilarityService
+
+    descriptions = [
+        "Read {n} books about software architecture",
+        "Run {n} kilometres every week",
+        "Save {n}00 dollars for a new laptop",
+        "Learn {n} new recipes from Italian cooking",
+        "Practice guitar for {n} minutes a day",
+    ]
+    async with session_factory() as session:
+        users = []
+        for i in range(2):
+            user = User(
+                username=f"budget_user_{i}",
+                email=f"budget_user_{i}@example.com",
+                hashed_password=get_password_hash("password123"),
+                is_verified=True
+            )
+            session.add(user)
+            users.append(user)
+        await session.flush()
+
+        started = datetime.utcnow() - timedelta(days=UPDATES_PER_GOAL * 3)
+        goals = []
+        for user in users:
+            for g in range(GOALS_PER_USER):
+                goal = Goal(
+                    user_id=user.id,
+                    category=["Health", "Career", "Learning", "Finance"][g % 4],
+                    description=descriptions[g % len(descriptions)].format(n=g + 2),
+                    target_date=date.today() + timedelta(days=30 + g),
+                    created_at=started
+                )
+                session.add(goal)
+                goals.append(goal)
+        await session.flush()
+
+        for goal in goals:
+            for u in range(UPDATES_PER_GOAL):
+                session.add(ProgressUpdate(
+                    goal_id=goal.id,
+                    update_text=f"Update {u} for goal {goal.id}",
+                    progress_value=min(100.0, (u + 1) * 100.0 / UPDATES_PER_GOAL),
+                    analysis="Steady progress",
+                    created_at=started + timedelta(days=u * 3)
+                ))
+            await SimilarityService(session).index_goal(goal)
+        await session.commit()
+        await RollupService(session).catch_up()
+
+        owner = users[0]
+        return Fixture(
+            user_id=owner.id,
+            username=owner.username,
+            email=owner.email,
+            headers={"Authorization": f"Bearer {_token(owner.username)}"},
+            goal_ids=[goal.id for goal in goals if goal.user_id == owner.id],
+            other_user_id=users[1].id
+        )
+
+async def check_budgets(verbose: bool) -> int:
+    import httpx
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+    from api.v1.router import api_router
+    from core.config import settings
+    from core import warmup
+    from core.health import get_health_monitor
+    from database import Base, engine
+    from main import app
+    from services import analysis_memo
+
+    # The memo evicts on a random sample of writes; budgets cover the
+    # common path, so keep the count deterministic
+    analysis_memo.EVICTION_PROBABILITY = 0.0
+    # Statement logging would drown the report; --verbose prints them instead
+    engine.echo = False
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    fixture = await seed(async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+    # /health/health reports what startup's warm-up and background checks
+    # found; the in-process client never runs startup, so do it once here
+    await warmup.run_warmup()
+    await get_health_monitor().run_checks()
+
+    budgeted = {(scenario.method, scenario.path) for scenario in SCENARIOS}
+    routes = {
+        (method, route.path)
+        for route in api_router.routes
+        for method in getattr(route, "methods", None) or ()
+    }
+    failures = [f"{method} {path}: no query budget" for method, path in sorted(routes - budgeted)]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url=f"http://test{settings.API_V1_STR}") as client:
+        # Let lazily created clients and caches settle outside the measurement
+        await client.get(f"/goals/user/{fixture.user_id}", headers=fixture.headers)
+
+        print(f"{'route':<42}{'status':>8}{'queries':>9}{'budget':>8}")
+        for scenario in SCENARIOS:
+            kwargs = scenario.request(fixture)
+            with QueryCounter(engine) as counter:
+                response = await client.request(scenario.method, **kwargs)
+                if scenario.settle is not None:
+                    await scenario.settle()
+            label = f"{scenario.method} {scenario.path}"
+            print(f"{label:<42}{response.status_code:>8}{counter.count:>9}{scenario.budget:>8}")
+            if verbose:
+                for statement in counter.statements:
+                    print("    " + " ".join(statement.split())[:160])
+
+            if counter.count > scenario.budget:
+                failures.append(f"{label}: {counter.count} queries, budget {scenario.budget}")
+            if scenario.expected_status is not None and response.status_code != scenario.expected_status:
+                failures.append(f"{label}: status {response.status_code}, expected {scenario.expected_status}")
+
+    await engine.dispose()
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check per-route query budgets")
+    parser.add_argument("--verbose", action="store_true", help="Print the statements of every request")
+    args = parser.parse_args()
+
+    from benchmarks.run import _free_port, _wait_for
+
+    workdir = tempfile.mkdtemp(prefix="goal-tracker-queries-")
+    ai_port = _free_port()
+    os.environ.setdefault("SECRET_KEY", "query-budget-secret-key")
+    os.environ.update({
+        "DATABASE_URL": f"sqlite+aiosqlite:///{workdir}/queries.db",
+        "GROQ_API_KEY": "fake",
+        "GROQ_BASE_URL": f"http://127.0.0.1:{ai_port}",
+        "SMTP_SERVER": "127.0.0.1",
+        "SMTP_PORT": "9",
+        "RATE_LIMIT_AI_BURST": "1000000",
+        "CACHE_BACKEND": "memory",
+    })
+
+    fake_ai = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_ai", "--port", str(ai_port), "--latency-ms", "0", "--jitter-ms", "0"],
+        cwd=BACKEND_DIR
+    )
+    try:
+        _wait_for(f"http://127.0.0.1:{ai_port}/openai/v1/models")
+        exit_code = asyncio.run(check_budgets(args.verbose))
+    finally:
+        fake_ai.terminate()
+        fake_ai.wait(timeout=15)
+    sys.exit(exit_code)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+# backend/benchmarks/run.py
+"""End-to-end load test of the API against a local database and fake AI.
+
+    python -m benchmarks.run --users 50 --concurrency 10 --output bench.json
+    python -m benchmarks.run --compare bench.json   # show deltas vs a previous run
+
+Boots the fake Groq server and the app as subprocesses (uvicorn, or
+serve.py with --workers > 1), then runs one journey per virtual user:
+register, verify, login, create goals, post progress and read the
+dashboard views. Reports p50/p95/p99 per step plus overall throughput.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+CATEGORIES = ["Health", "Career", "Learning", "Finance", "Personal"]
+GOAL_TEMPLATES = [
+    "Run a half marathon in under two hours",
+    "Read {n} books about software architecture",
+    "Save {n}00 dollars for the emergency fund",
+    "Practice Spanish for {n} minutes every day",
+    "Ship the side project MVP with {n} features",
+]
+PROGRESS_TEMPLATES = [
+    "Completed {n} sessions this week and felt stronger",
+    "Finished chapter {n}, took notes on the key ideas",
+    "Set aside money on payday, now at {n} percent of target",
+    "Missed two days but caught up with {n} extra minutes",
+]
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    async def call(self, step: str, request) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            response = None
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.latencies.setdefault(step, []).append(elapsed_ms)
+        if response is None or response.status_code >= 400:
+            self.errors[step] = self.errors.get(step, 0) + 1
+        return response
+
+    def report(self, wall_seconds: float) -> Dict[str, Any]:
+        steps = {}
+        for step, values in self.latencies.items():
+            ordered = sorted(values)
+            steps[step] = {
+                "count": len(ordered),
+                "errors": self.errors.get(step, 0),
+                "mean_ms": round(sum(ordered) / len(ordered), 2),
+                "p50_ms": round(percentile(ordered, 0.50), 2),
+                "p95_ms": round(percentile(ordered, 0.95), 2),
+                "p99_ms": round(percentile(ordered, 0.99), 2),
+                "max_ms": round(ordered[-1], 2)
+            }
+        total = sum(step["count"] for step in steps.values())
+        return {
+            "requests": total,
+            "errors": sum(self.errors.values()),
+            "wall_seconds": round(wall_seconds, 2),
+            "throughput_rps": round(total / wall_seconds, 2) if wall_seconds else 0.0,
+            "steps": steps
+        }
+
+async def user_journey(client: httpx.AsyncClient, recorder: Recorder, run_id: str, index: int, args) -> None:
+    from core.security import create_access_token
+
+    username = f"bench_{run_id}_{index}"
+    email = f"{username}@example.com"
+    password = "benchmark-password"
+
+    await recorder.call("register", client.post(
+        "/auth/register", json={"username": username, "email": email, "password": password}
+    ))
+    await recorder.call("verify_email", client.get(
+        "/auth/verify-email", params={"token": create_access_token(subject=email)}
+    ))
+    response = await recorder.call("login", client.post(
+        "/auth/login", json={"username": username, "password": password}
+    ))
+    if response is None or response.status_code != 200:
+        return
+    body = response.json()
+    user_id = body["user_id"]
+    headers = {"Authorization": f"Bearer {body['token']}"}
+
+    goal_ids = []
+    for g in range(args.goals):
+        response = await recorder.call("create_goal", client.post("/goals/create", headers=headers, json={
+            "category": random.choice(CATEGORIES),
+            "description": random.choice(GOAL_TEMPLATES).format(n=random.randint(2, 12)),
+            "target_date": (date.today() + timedelta(days=random.randint(7, 180))).isoformat()
+        }))
+        if response is not None and response.status_code == 201:
+            goal_ids.append(response.json()["goal"]["id"])
+
+    for _ in range(args.updates if goal_ids else 0):
+        await recorder.call("post_progress", client.post(
+            f"/progress/{random.choice(goal_ids)}",
+            headers=headers,
+            json={"update_text": random.choice(PROGRESS_TEMPLATES).format(n=random.randint(1, 9))}
+        ))
+
+    for _ in range(args.reads):
+        await recorder.call("list_goals", client.get(f"/goals/user/{user_id}", headers=headers))
+        await recorder.call("dashboard_categories", client.get("/dashboard/categories", headers=headers))
+        await recorder.call("analytics", client.get(f"/goals/analytics/{user_id}", headers=headers))
+        await recorder.call("search", client.get("/goals/search", headers=headers, params={"q": "books"}))
+        if goal_ids:
+            await recorder.call("progress_history", client.get(f"/progress/{goal_ids[0]}", headers=headers))
+    await recorder.call("suggestions", client.get(f"/goals/suggestions/{user_id}", headers=headers))
+
+def _wait_for(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=2.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready within {timeout}s")
+
+def _prepare_database(env: Dict[str, str]) -> None:
+    code = (
+        "import asyncio\n"
+        "from database import engine, Base\n"
+        "import models\n"
+        "async def main():\n"
+        "    async with engine.begin() as conn:\n"
+        "        await conn.run_sync(Base.metadata.create_all)\n"
+        "    await engine.dispose()\n"
+        "asyncio.run(main())\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, check=True,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    def delta(current: float, previous: Optional[float]) -> str:
+        if not previous:
+            return ""
+        return f" ({(current - previous) / previous * 100:+.0f}%)"
+
+    base_steps = (baseline or {}).get("results", {}).get("steps", {})
+    results = report["results"]
+    print(f"\ncommit {report['commit']}  users={report['config']['users']} "
+          f"concurrency={report['config']['concurrency']} workers={report['config']['workers']}")
+    print(f"{'step':<22}{'count':>7}{'err':>5}{'p50 ms':>16}{'p95 ms':>16}{'p99 ms':>16}")
+    for step, stats in results["steps"].items():
+        previous = base_steps.get(step, {})
+        print(
+            f"{step:<22}{stats['count']:>7}{stats['errors']:>5}"
+            f"{stats['p50_ms'] + 0:>9.1f}{delta(stats['p50_ms'], previous.get('p50_ms')):<7}"
+            f"{stats['p95_ms'] + 0:>9.1f}{delta(stats['p95_ms'], previous.get('p95_ms')):<7}"
+            f"{stats['p99_ms'] + 0:>9.1f}{delta(stats['p99_ms'], previous.get('p99_ms')):<7}"
+        )
+    previous_rps = (baseline or {}).get("results", {}).get("throughput_rps")
+    print(f"throughput {results['throughput_rps']} req/s{delta(results['throughput_rps'], previous_rps)}, "
+          f"{results['errors']} errors in {results['requests']} requests")
+
+async def drive(base_url: str, args) -> Dict[str, Any]:
+    recorder = Recorder()
+    run_id = uuid.uuid4().hex[:8]
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+        async def journey(index: int) -> None:
+            async with semaphore:
+                await user_journey(client, recorder, run_id, index, args)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(journey(i) for i in range(args.users)))
+        return recorder.report(time.perf_counter() - started)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the API with a fake AI provider")
+    parser.add_argument("--users", type=int, default=20, help="Virtual users (one journey each)")
+    parser.add_argument("--concurrency", type=int, default=5, help="Journeys running at once")
+    parser.add_argument("--goals", type=int, default=5, help="Goals created per user")
+    parser.add_argument("--updates", type=int, default=10, help="Progress updates posted per user")
+    parser.add_argument("--reads", type=int, default=3, help="Dashboard read rounds per user")
+    parser.add_argument("--workers", type=int, default=1, help=">1 runs serve.py with that many workers")
+    parser.add_argument("--database-url", default=None, help="Defaults to a fresh SQLite file")
+    parser.add_argument("--ai-latency-ms", type=float, default=300)
+    parser.add_argument("--ai-jitter-ms", type=float, default=100)
+    parser.add_argument("--ai-error-rate", type=float, default=0.0)
+    parser.add_argument("--keep-rate-limits", action="store_true",
+                        help="Keep production AI rate limits instead of disabling them")
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    parser.add_argument("--compare", default=None, help="Previous JSON report to compare against")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="goal-tracker-bench-")
+    database_url = args.database_url or f"sqlite+aiosqlite:///{workdir}/bench.db"
+    ai_port, app_port = _free_port(), _free_port()
+
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": database_url,
+        "GROQ_API_KEY": "fake",
+        "GROQ_BASE_URL": f"http://127.0.0.1:{ai_port}",
+        # Nothing listens here, so verification emails fail fast
+        "SMTP_SERVER": "127.0.0.1",
+        "SMTP_PORT": "9",
+        "PORT": str(app_port),
+        "WEB_CONCURRENCY": str(args.workers),
+    })
+    if not args.keep_rate_limits:
+        env["RATE_LIMIT_AI_BURST"] = "1000000"
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    _prepare_database(env)
+    processes = []
+    try:
+        processes.append(subprocess.Popen([
+            sys.executable, "-m", "benchmarks.fake_ai", "--port", str(ai_port),
+            "--latency-ms", str(args.ai_latency_ms), "--jitter-ms", str(args.ai_jitter_ms),
+            "--error-rate", str(args.ai_error_rate)
+        ], cwd=BACKEND_DIR, env=env))
+        if args.workers > 1:
+            app_command = [sys.executable, "serve.py"]
+        else:
+            app_command = [sys.executable, "-m", "uvicorn", "main:app",
+                           "--port", str(app_port), "--log-level", "warning"]
+        processes.append(subprocess.Popen(
+            app_command, cwd=BACKEND_DIR, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        ))
+
+        _wait_for(f"http://127.0.0.1:{ai_port}/openai/v1/models")
+        _wait_for(f"http://127.0.0.1:{app_port}/ready")
+
+        results = asyncio.run(drive(f"http://127.0.0.1:{app_port}/api/v1", args))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": int(time.time()),
+        "config": {
+            key: getattr(args, key) for key in
+            ("users", "concurrency", "goals", "updates", "reads", "workers",
+             "ai_latency_ms", "ai_jitter_ms", "ai_error_rate")
+        },
+        "database": "sqlite" if database_url.startswith("sqlite") else "postgresql",
+        "results": results
+    }
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_report(report, baseline)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# backend/benchmarks/startup.py
+"""Cold start profile: import-time breakdown and time to first response.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 5 --top 25
+
+Imports ``main`` under ``python -X importtime`` and lists the slowest
+modules, cumulative (with everything they import) and grouped by
+top-level package. Then starts uvicorn against a fresh SQLite database
+and measures, from process spawn, how long it takes until ``/`` answers
+(the process is serving) and until ``/ready`` passes (warm-up and the
+first background checks done). Times are the median of --runs cold
+processes.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+from benchmarks.run import BACKEND_DIR, _free_port, _prepare_database
+
+def import_times(env: Dict[str, str]) -> List[Tuple[str, int, int]]:
+    """(module, self_us, cumulative_us) for every module ``import main`` loads."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return rows
+
+def print_import_report(rows: List[Tuple[str, int, int]], top: int) -> None:
+    total = max((cumulative for name, _, cumulative in rows if name.strip() == "main"), default=0)
+    print(f"import main: {total / 1000:.0f} ms")
+
+    print("\nSlowest imports (cumulative):")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {self_us / 1000:7.1f} ms self  {name}")
+
+    packages: Dict[str, int] = {}
+    for name, self_us, _ in rows:
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    print("\nBy top-level package (self time):")
+    for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"  {self_us / 1000:8.1f} ms  {package}")
+
+def _poll(url: str, deadline: float) -> float:
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return time.monotonic()
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.01)
+    raise RuntimeError(f"{url} did not answer in time")
+
+def time_to_first_response(env: Dict[str, str], timeout: float = 60.0) -> Tuple[float, float]:
+    """Seconds from spawn until ``/`` answers and until ``/ready`` passes."""
+    port = _free_port()
+    started = time.monotonic()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = started + timeout
+        serving = _poll(f"http://127.0.0.1:{port}/", deadline)
+        ready = _poll(f"http://127.0.0.1:{port}/ready", deadline)
+        return serving - started, ready - started
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile application cold start")
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts to take the median of")
+    parser.add_argument("--top", type=int, default=20, help="Rows per import table")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="goal-tracker-startup-")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": f"sqlite+aiosqlite:///{workdir}/startup.db",
+        "GROQ_API_KEY": "fake",
+        # Keep the AI client off the network; its health check is not needed
+        "GROQ_BASE_URL": "http://127.0.0.1:9",
+        "HEALTH_AI_CHECK_INTERVAL_SECONDS": "0",
+    })
+    _prepare_database(env)
+
+    print_import_report(import_times(env), args.top)
+
+    serving, ready = [], []
+    for _ in range(args.runs):
+        first, warm = time_to_first_response(env)
+        serving.append(first)
+        ready.append(warm)
+    print(f"\nTime to first response: {statistics.median(serving) * 1000:.0f} ms (median of {args.runs})")
+    print(f"Time to ready:          {statistics.median(ready) * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# backend/build_assets.py
+"""Fingerprint and precompress the static assets for production.
+
+    python build_assets.py
+
+Every file under STATIC_SOURCE_DIR is copied to STATIC_BUILD_DIR with a
+content hash in its name (styles/styles.css -> styles/styles.1a2b3c4d.css)
+plus ``.gz`` and, when the optional ``brotli`` package is installed,
+``.br`` siblings. manifest.json maps the original paths to the hashed
+ones. A changed file gets a new name, which is what allows the server to
+mark assets immutable; clients look the current names up in
+/static/manifest.json, which is served with ``no-cache``. The file is
+also kept under its original name, likewise ``no-cache``, so links to
+the plain path keep working.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+from typing import Dict
+
+from core.config import settings
+from core.static_assets import MANIFEST_NAME
+
+logger = logging.getLogger(__name__)
+
+HASH_LENGTH = 8
+# Below this, compression saves less than the headers it adds
+MIN_COMPRESS_BYTES = 256
+# Formats that are already compressed
+SKIP_COMPRESSION = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".woff", ".woff2", ".gz", ".br", ".zip"}
+
+def fingerprinted_name(relative_path: str, content: bytes) -> str:
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    stem, ext = os.path.splitext(relative_path)
+    return f"{stem}.{digest}{ext}"
+
+def _write_if_smaller(path: str, original: bytes, compressed: bytes) -> bool:
+    if len(compressed) >= len(original):
+        return False
+    with open(path, "wb") as f:
+        f.write(compressed)
+    return True
+
+def compress(path: str, content: bytes) -> Dict[str, int]:
+    """Write the precompressed siblings of ``path``; returns their sizes."""
+    sizes: Dict[str, int] = {}
+    if len(content) < MIN_COMPRESS_BYTES or os.path.splitext(path)[1].lower() in SKIP_COMPRESSION:
+        return sizes
+
+    # mtime=0 keeps the output byte-identical between builds
+    gzipped = gzip.compress(content, compresslevel=9, mtime=0)
+    if _write_if_smaller(path + ".gz", content, gzipped):
+        sizes["gzip"] = len(gzipped)
+
+    try:
+        import brotli
+    except ImportError:
+        return sizes
+    compressed = brotli.compress(content, quality=11)
+    if _write_if_smaller(path + ".br", content, compressed):
+        sizes["br"] = len(compressed)
+    return sizes
+
+def build(source_dir: str, build_dir: str) -> Dict[str, str]:
+    """Rebuild ``build_dir`` from ``source_dir``; returns the manifest."""
+    if os.path.isdir(build_dir):
+        shutil.rmtree(build_dir)
+    os.makedirs(build_dir)
+
+    manifest: Dict[str, str] = {}
+    for root, _, files in os.walk(source_dir):
+        for name in sorted(files):
+            source = os.path.join(root, name)
+            relative = os.path.relpath(source, source_dir).replace(os.sep, "/")
+            with open(source, "rb") as f:
+                content = f.read()
+
+            hashed = fingerprinted_name(relative, content)
+            sizes: Dict[str, Dict[str, int]] = {}
+            for copy_name in (hashed, relative):
+                target = os.path.join(build_dir, copy_name)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with open(target, "wb") as f:
+                    f.write(content)
+                sizes[copy_name] = compress(target, content)
+            manifest[relative] = hashed
+            logger.info(f"{relative} -> {hashed} ({len(content)} bytes, {sizes[hashed] or 'uncompressed'})")
+
+    with open(os.path.join(build_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    manifest = build(settings.STATIC_SOURCE_DIR, settings.STATIC_BUILD_DIR)
+    print(f"Built {len(manifest)} assets into {settings.STATIC_BUILD_DIR}")
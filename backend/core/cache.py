@@ -0,0 +1,212 @@
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+from core.config import settings
+import asyncio
+import json
+import time
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+class CacheBackend:
+    """Key/value store for JSON-serialisable values."""
+
+    async def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    async def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+class InProcessCache(CacheBackend):
+    """LRU dictionary with per-entry expiry, private to one worker."""
+
+    def __init__(self, max_entries: int = 10000, default_ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = ttl if ttl is not None else self.default_ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+class RedisCache(CacheBackend):
+    """Cache shared by every worker, stored in Redis as JSON."""
+
+    def __init__(self, client, prefix: str = "cache:", default_ttl: Optional[float] = None):
+        self.client = client
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = ttl if ttl is not None else self.default_ttl
+        await self.client.set(
+            self.prefix + key,
+            json.dumps(value),
+            px=int(ttl * 1000) if ttl else None
+        )
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*(self.prefix + key for key in keys))
+
+    async def clear(self) -> None:
+        async for key in self.client.scan_iter(match=self.prefix + "*"):
+            await self.client.delete(key)
+
+class Cache:
+    """Two-tier cache that stays coherent across workers.
+
+    Reads hit the worker's in-process tier first, then the optional shared
+    tier. ``invalidate`` removes keys from both tiers and publishes them on
+    a Redis channel so every other worker evicts its local copy too. If the
+    subscription drops, local entries may have missed invalidations, so the
+    local tier is cleared on reconnect; its short TTL bounds staleness in
+    between.
+    """
+
+    def __init__(
+        self,
+        local: InProcessCache,
+        shared: Optional[CacheBackend] = None,
+        pubsub_client=None,
+        channel: str = "cache-invalidate"
+    ):
+        self.local = local
+        self.shared = shared
+        self.pubsub_client = pubsub_client
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self.local.get(key)
+        if value is not None or self.shared is None:
+            return value
+        try:
+            value = await self.shared.get(key)
+        except Exception as e:
+            logger.error(f"Shared cache read failed: {str(e)}")
+            return None
+        if value is not None:
+            await self.local.set(key, value)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        await self.local.set(key, value, ttl)
+        if self.shared is not None:
+            try:
+                await self.shared.set(key, value, ttl)
+            except Exception as e:
+                logger.error(f"Shared cache write failed: {str(e)}")
+
+    async def invalidate(self, *keys: str) -> None:
+        await self.local.delete(*keys)
+        if self.shared is not None:
+            try:
+                await self.shared.delete(*keys)
+            except Exception as e:
+                logger.error(f"Shared cache delete failed: {str(e)}")
+        if self.pubsub_client is not None:
+            try:
+                await self.pubsub_client.publish(
+                    self.channel, json.dumps({"origin": self.origin, "keys": list(keys)})
+                )
+            except Exception as e:
+                logger.error(f"Cache invalidation publish failed: {str(e)}")
+
+    async def start(self) -> None:
+        if self.pubsub_client is not None and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen(self) -> None:
+        backoff = 1.0
+        while True:
+            pubsub = self.pubsub_client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                await self.local.clear()
+                backoff = 1.0
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    payload = json.loads(message["data"])
+                    if payload.get("origin") != self.origin:
+                        await self.local.delete(*payload.get("keys", []))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cache invalidation listener error: {str(e)}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
+
+def build_cache() -> Cache:
+    if settings.CACHE_BACKEND == "redis":
+        from core.redis_client import get_redis
+        client = get_redis()
+        return Cache(
+            # Local copies only live briefly; the shared tier is authoritative
+            local=InProcessCache(settings.CACHE_MAX_ENTRIES, settings.CACHE_LOCAL_TTL),
+            shared=RedisCache(client, default_ttl=settings.CACHE_DEFAULT_TTL),
+            pubsub_client=client,
+            channel=settings.CACHE_INVALIDATION_CHANNEL
+        )
+    return Cache(local=InProcessCache(settings.CACHE_MAX_ENTRIES, settings.CACHE_DEFAULT_TTL))
+
+_cache: Optional[Cache] = None
+
+def get_cache() -> Cache:
+    global _cache
+    if _cache is None:
+        _cache = build_cache()
+    return _cache
+
+def set_cache(cache: Cache) -> None:
+    global _cache
+    _cache = cache
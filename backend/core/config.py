@@ -1,6 +1,26 @@
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings
+from typing import Dict
 import os
 
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+AI_MODEL = os.getenv("AI_MODEL", "mixtral-8x7b-32768")
+
+class GenerationProfile(BaseModel):
+    """How the provider is called for one kind of AI task."""
+    model: str = AI_MODEL
+    max_tokens: int = 1024
+    temperature: float = 0.7
+    json_mode: bool = False  # Ask the provider for a single JSON object
+
+# Short answers get small token caps; a cap is also the latency ceiling
+DEFAULT_AI_PROFILES: Dict[str, GenerationProfile] = {
+    "suggestions": GenerationProfile(max_tokens=400, temperature=0.7),
+    "progress_analysis": GenerationProfile(max_tokens=150, temperature=0.2, json_mode=True),
+    "data_analysis": GenerationProfile(max_tokens=1000, temperature=0.7),
+}
+
 class Settings(BaseSettings):
     PROJECT_NAME: str = "AI-Powered Goal Tracker"
     VERSION: str = "1.0.0"
@@ -12,6 +32,21 @@ class Settings(BaseSettings):
     if DATABASE_URL.startswith("postgres://"):
         DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql+asyncpg://", 1)
     
+    # TLS to Postgres; turn off only for a local server without SSL
+    DB_SSL: bool = os.getenv("DB_SSL", "true").lower() == "true"
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 20))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    # Connections all workers together may open (keep below Postgres max_connections)
+    DB_MAX_CONNECTIONS: int = int(os.getenv("DB_MAX_CONNECTIONS", 90))
+
+    # Production server settings (see serve.py)
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", 0))  # 0 = size automatically
+    GUNICORN_MAX_REQUESTS: int = int(os.getenv("GUNICORN_MAX_REQUESTS", 10000))
+    GUNICORN_MAX_REQUESTS_JITTER: int = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 1000))
+    GUNICORN_TIMEOUT: int = int(os.getenv("GUNICORN_TIMEOUT", 60))
+    GUNICORN_GRACEFUL_TIMEOUT: int = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+    GUNICORN_KEEPALIVE: int = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+
     # Security settings
     SECRET_KEY: str = os.getenv("SECRET_KEY", "")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
@@ -40,6 +75,102 @@ class Settings(BaseSettings):
     
     # AI Service settings
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
+    GROQ_BASE_URL: str = os.getenv("GROQ_BASE_URL", "")  # Empty uses the Groq default
+    AI_SUGGESTIONS_TOKEN_BUDGET: int = int(os.getenv("AI_SUGGESTIONS_TOKEN_BUDGET", 1500))
+    AI_PROGRESS_TOKEN_BUDGET: int = int(os.getenv("AI_PROGRESS_TOKEN_BUDGET", 800))
+    AI_MEMO_MAX_ENTRIES: int = int(os.getenv("AI_MEMO_MAX_ENTRIES", 100000))  # Cached progress analyses
+    # Per-task overrides of DEFAULT_AI_PROFILES, as JSON in the environment,
+    # e.g. AI_PROFILES='{"progress_analysis": {"model": "...", "max_tokens": 200}}';
+    # fields left out keep their default
+    AI_PROFILES: Dict[str, GenerationProfile] = {}
+
+    # GET /dashboard: how long to wait for AI suggestions before reporting them pending
+    DASHBOARD_SUGGESTIONS_TIMEOUT_SECONDS: float = float(os.getenv("DASHBOARD_SUGGESTIONS_TIMEOUT_SECONDS", 3))
+    SUGGESTIONS_CACHE_TTL_SECONDS: float = float(os.getenv("SUGGESTIONS_CACHE_TTL_SECONDS", 3600))
+
+    # Shared state backend (rate limits, caches); empty means in-process only
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
+
+    # Caches: "memory" is per worker, "redis" shares entries and broadcasts invalidations
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_DEFAULT_TTL: float = float(os.getenv("CACHE_DEFAULT_TTL", 300))
+    CACHE_LOCAL_TTL: float = float(os.getenv("CACHE_LOCAL_TTL", 30))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", 10000))
+    CACHE_INVALIDATION_CHANNEL: str = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache-invalidate")
+
+    # Rate limits for AI-backed endpoints (token bucket per user and route)
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")  # "memory" or "redis"
+    RATE_LIMIT_AI_BURST: int = int(os.getenv("RATE_LIMIT_AI_BURST", 5))
+    RATE_LIMIT_AI_PER_MINUTE: float = float(os.getenv("RATE_LIMIT_AI_PER_MINUTE", 6))
+
+    # Live updates over WebSocket; "redis" fans events out to every worker
+    REALTIME_BACKEND: str = os.getenv("REALTIME_BACKEND", "memory")
+    REALTIME_CHANNEL: str = os.getenv("REALTIME_CHANNEL", "realtime-events")
+    WS_HEARTBEAT_SECONDS: float = float(os.getenv("WS_HEARTBEAT_SECONDS", 25))
+    WS_IDLE_TIMEOUT_SECONDS: float = float(os.getenv("WS_IDLE_TIMEOUT_SECONDS", 60))
+    WS_SEND_QUEUE_SIZE: int = int(os.getenv("WS_SEND_QUEUE_SIZE", 100))
+
+    # Deadline reminder emails (services/reminders.py)
+    REMINDERS_ENABLED: bool = os.getenv("REMINDERS_ENABLED", "false").lower() == "true"
+    REMINDER_INTERVAL_SECONDS: float = float(os.getenv("REMINDER_INTERVAL_SECONDS", 900))
+    REMINDER_LOOKAHEAD_DAYS: int = int(os.getenv("REMINDER_LOOKAHEAD_DAYS", 3))
+    REMINDER_OVERDUE_DAYS: int = int(os.getenv("REMINDER_OVERDUE_DAYS", 7))
+    REMINDER_BATCH_SIZE: int = int(os.getenv("REMINDER_BATCH_SIZE", 1000))
+    REMINDER_LEASE_SECONDS: float = float(os.getenv("REMINDER_LEASE_SECONDS", 300))
+    REMINDER_MAX_ATTEMPTS: int = int(os.getenv("REMINDER_MAX_ATTEMPTS", 3))
+
+    # Account purge after deletion (services/purge.py)
+    PURGE_BATCH_SIZE: int = int(os.getenv("PURGE_BATCH_SIZE", 1000))
+    PURGE_BATCH_PAUSE_SECONDS: float = float(os.getenv("PURGE_BATCH_PAUSE_SECONDS", 0.05))
+    # Held by the worker sweeping pending purges at startup (services/leases.py)
+    PURGE_LEASE_SECONDS: float = float(os.getenv("PURGE_LEASE_SECONDS", 300))
+
+    # Progress update archival into compressed cold storage (services/archive.py)
+    PROGRESS_ARCHIVE_AFTER_DAYS: int = int(os.getenv("PROGRESS_ARCHIVE_AFTER_DAYS", 180))
+    PROGRESS_ARCHIVE_CHUNK_SIZE: int = int(os.getenv("PROGRESS_ARCHIVE_CHUNK_SIZE", 500))
+    PROGRESS_ARCHIVE_PAUSE_SECONDS: float = float(os.getenv("PROGRESS_ARCHIVE_PAUSE_SECONDS", 0.05))
+
+    # Monthly range partitions of progress_updates, Postgres only (services/partitions.py)
+    PROGRESS_PARTITIONING: bool = os.getenv("PROGRESS_PARTITIONING", "false").lower() == "true"
+    PROGRESS_PARTITIONS_AHEAD: int = int(os.getenv("PROGRESS_PARTITIONS_AHEAD", 3))  # Future months kept ready
+    PROGRESS_PARTITION_LOCK_TIMEOUT_SECONDS: float = float(os.getenv("PROGRESS_PARTITION_LOCK_TIMEOUT_SECONDS", 5))
+
+    # GET /progress/{goal_id}/series: points returned when the client does not ask, and the cap
+    PROGRESS_SERIES_DEFAULT_POINTS: int = int(os.getenv("PROGRESS_SERIES_DEFAULT_POINTS", 200))
+    PROGRESS_SERIES_MAX_POINTS: int = int(os.getenv("PROGRESS_SERIES_MAX_POINTS", 2000))
+
+    # Idempotency-Key handling for retried POSTs (core/idempotency.py)
+    IDEMPOTENCY_TTL_SECONDS: float = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", 86400))
+    IDEMPOTENCY_WAIT_SECONDS: float = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", 30))
+    IDEMPOTENCY_LOCK_SECONDS: float = float(os.getenv("IDEMPOTENCY_LOCK_SECONDS", 120))
+
+    # Static assets (build_assets.py fingerprints and precompresses them)
+    STATIC_SOURCE_DIR: str = os.getenv("STATIC_SOURCE_DIR", os.path.join(BACKEND_DIR, "static"))
+    STATIC_BUILD_DIR: str = os.getenv("STATIC_BUILD_DIR", os.path.join(BACKEND_DIR, "static_build"))
+    STATIC_MAX_AGE_SECONDS: int = int(os.getenv("STATIC_MAX_AGE_SECONDS", 31536000))
+
+    # Event loop stall detection (core/loop_monitor.py)
+    LOOP_MONITOR_ENABLED: bool = os.getenv("LOOP_MONITOR_ENABLED", "false").lower() == "true"
+    LOOP_STALL_THRESHOLD_MS: float = float(os.getenv("LOOP_STALL_THRESHOLD_MS", 100))
+    LOOP_MONITOR_INTERVAL_MS: float = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", 50))
+
+    # Readiness checks run in the background; probes read the cached results (core/health.py)
+    HEALTH_CHECK_INTERVAL_SECONDS: float = float(os.getenv("HEALTH_CHECK_INTERVAL_SECONDS", 15))
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = float(os.getenv("HEALTH_CHECK_TIMEOUT_SECONDS", 3))
+    HEALTH_AI_CHECK_INTERVAL_SECONDS: float = float(os.getenv("HEALTH_AI_CHECK_INTERVAL_SECONDS", 300))  # 0 disables
+    HEALTH_POOL_SATURATION: float = float(os.getenv("HEALTH_POOL_SATURATION", 0.95))
+
+    # Startup warm-up settings
+    DB_WARMUP_CONNECTIONS: int = int(os.getenv("DB_WARMUP_CONNECTIONS", 5))
+    WARMUP_TIMEOUT_SECONDS: float = float(os.getenv("WARMUP_TIMEOUT_SECONDS", 30))
+
+    def ai_profile(self, task: str) -> GenerationProfile:
+        """Generation profile for ``task``: fields set in AI_PROFILES over the default."""
+        default = DEFAULT_AI_PROFILES.get(task) or GenerationProfile()
+        override = self.AI_PROFILES.get(task)
+        if override is None:
+            return default
+        return default.model_copy(update=override.model_dump(exclude_unset=True))
 
     class Config:
         env_file = ".env"
@@ -45,3 +45,11 @@ class ForbiddenException(AppException):
             status_code=status.HTTP_403_FORBIDDEN,
             detail=detail
         )
+
+class RateLimitException(AppException):
+    def __init__(self, retry_after: int, detail: str = "Too many requests"):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)}
+        )
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from core.config import settings
+from core import warmup
+from database import engine
+
+logger = logging.getLogger(__name__)
+
+class HealthMonitor:
+    """Runs the deep health checks on a timer and keeps the last results.
+
+    Probes only read the cached results, so a load balancer polling
+    readiness never opens a database connection or calls the provider,
+    however often it polls. The database check skips itself when the
+    pool has no idle connection rather than queue behind user requests;
+    a full pool is reported as saturation instead.
+
+    ``database`` and ``pool`` decide readiness. The AI provider is
+    reported but does not: the API answers with fallbacks without it.
+    """
+
+    CRITICAL = ("database", "pool")
+
+    def __init__(self, interval: float, timeout: float, ai_interval: float):
+        self.interval = interval
+        self.timeout = timeout
+        self.ai_interval = ai_interval
+        self.checks: Dict[str, Dict[str, Any]] = {}
+        self.last_run: Optional[float] = None
+        self._ai_checked_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_checks()
+            except Exception as e:
+                logger.error(f"Health checks failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    async def _timed(self, name: str, check) -> None:
+        started = time.monotonic()
+        try:
+            details = await asyncio.wait_for(check(), timeout=self.timeout)
+            result = {"status": "ok", **(details or {})}
+        except asyncio.TimeoutError:
+            result = {"status": "fail", "error": f"timed out after {self.timeout}s"}
+        except Exception as e:
+            result = {"status": "fail", "error": str(e)}
+        result["latency_ms"] = round((time.monotonic() - started) * 1000, 1)
+        result["checked_at"] = time.time()
+        if result["status"] != "ok" and self.checks.get(name, {}).get("status") == "ok":
+            logger.warning(f"Health check {name} failing: {result.get('error')}")
+        self.checks[name] = result
+
+    def pool_usage(self) -> Optional[Dict[str, Any]]:
+        pool = engine.pool
+        if not hasattr(pool, "size"):
+            # NullPool (SQLite) opens a connection per use and has no limit
+            return None
+        capacity = pool.size() + max(0, settings.DB_MAX_OVERFLOW)
+        checked_out = pool.checkedout()
+        return {
+            "checked_out": checked_out,
+            "idle": pool.checkedin(),
+            "capacity": capacity,
+            "saturation": round(checked_out / capacity, 3) if capacity else 0.0
+        }
+
+    async def _check_pool(self) -> Dict[str, Any]:
+        usage = self.pool_usage()
+        if usage is None:
+            return {"pooled": False}
+        if usage["saturation"] >= settings.HEALTH_POOL_SATURATION:
+            raise RuntimeError(f"{usage['checked_out']} of {usage['capacity']} connections in use")
+        return usage
+
+    async def _check_database(self) -> Dict[str, Any]:
+        usage = self.pool_usage()
+        if usage is not None and usage["idle"] == 0 and usage["checked_out"] >= usage["capacity"]:
+            # Checking out a connection now would mean waiting in line with
+            # user requests; the pool check already reports the saturation
+            return {"skipped": "pool exhausted"}
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return {}
+
+    async def _check_ai(self) -> Dict[str, Any]:
+        from services.ai import get_ai_client
+        await get_ai_client().models.list()
+        return {}
+
+    async def run_checks(self) -> None:
+        await self._timed("pool", self._check_pool)
+        await self._timed("database", self._check_database)
+
+        # The provider bills and rate-limits by request, so it is checked less often
+        now = time.monotonic()
+        if settings.GROQ_API_KEY and self.ai_interval > 0 and (
+            self._ai_checked_at is None or now - self._ai_checked_at >= self.ai_interval
+        ):
+            self._ai_checked_at = now
+            await self._timed("ai", self._check_ai)
+        self.last_run = time.monotonic()
+
+    def readiness(self) -> Dict[str, Any]:
+        """Cached verdict for probes; never performs I/O."""
+        reasons = []
+        if not warmup.state.ready:
+            reasons.append("warming up")
+        if self.last_run is None:
+            reasons.append("checks pending")
+        elif time.monotonic() - self.last_run > max(3 * self.interval, self.timeout * 3):
+            reasons.append("checks stale")
+        for name in self.CRITICAL:
+            if self.checks.get(name, {}).get("status") == "fail":
+                reasons.append(f"{name} failing")
+
+        return {
+            "ready": not reasons,
+            "reasons": reasons,
+            "checks": self.checks,
+            "warmup": warmup.state.as_dict()
+        }
+
+_monitor: Optional[HealthMonitor] = None
+
+def get_health_monitor() -> HealthMonitor:
+    global _monitor
+    if _monitor is None:
+        _monitor = HealthMonitor(
+            interval=settings.HEALTH_CHECK_INTERVAL_SECONDS,
+            timeout=settings.HEALTH_CHECK_TIMEOUT_SECONDS,
+            ai_interval=settings.HEALTH_AI_CHECK_INTERVAL_SECONDS
+        )
+    return _monitor
+
+def set_health_monitor(monitor: HealthMonitor) -> None:
+    global _monitor
+    _monitor = monitor
@@ -0,0 +1,190 @@
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, update, delete, event
+from sqlalchemy.dialects import postgresql, sqlite
+from database import AsyncSessionLocal
+from models import IdempotencyRecord
+from core.config import settings
+from datetime import datetime, timedelta
+from typing import Any, Optional
+import asyncio
+import hashlib
+import json
+import random
+import logging
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+# Expired keys are swept by a small share of requests instead of a job
+CLEANUP_PROBABILITY = 0.01
+
+def _insert(session):
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(IdempotencyRecord)
+    if dialect == "sqlite":
+        return sqlite.insert(IdempotencyRecord)
+    raise NotImplementedError(f"Idempotency keys are not supported on {dialect}")
+
+def request_fingerprint(scope: str, payload: Any) -> str:
+    canonical = json.dumps({"scope": scope, "payload": payload}, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+def _error(status_code: int, detail: str) -> JSONResponse:
+    return JSONResponse(status_code=status_code, content={"success": False, "detail": detail})
+
+class IdempotentRequest:
+    """Makes a POST safe to retry with the same ``Idempotency-Key`` header.
+
+    ``claim`` records the key before any work is done. A retry of a
+    finished request gets the stored response back; a retry that arrives
+    while the original is still running waits for it and then gets its
+    response. Claims live in the database in their own short
+    transactions, so every worker sees them and they survive restarts;
+    a claim whose worker died is taken over after IDEMPOTENCY_LOCK_SECONDS.
+    Requests without the header are not affected.
+    """
+
+    def __init__(self, request: Request, scope: str, user_id: int, payload: Any):
+        self.key = request.headers.get(IDEMPOTENCY_HEADER)
+        self.scope = scope
+        self.user_id = user_id
+        self.fingerprint = request_fingerprint(scope, payload)
+        self.owned = False
+
+    def _where(self):
+        return (
+            (IdempotencyRecord.user_id == self.user_id)
+            & (IdempotencyRecord.scope == self.scope)
+            & (IdempotencyRecord.key == self.key)
+        )
+
+    async def _try_insert(self, session, now: datetime) -> bool:
+        result = await session.execute(
+            _insert(session).values(
+                user_id=self.user_id,
+                scope=self.scope,
+                key=self.key,
+                request_hash=self.fingerprint,
+                status="in_progress",
+                locked_at=now,
+                expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+            ).on_conflict_do_nothing()
+        )
+        await session.commit()
+        return result.rowcount == 1
+
+    async def _take_over(self, session, record: IdempotencyRecord, now: datetime) -> bool:
+        # Compare-and-swap on locked_at so only one waiter inherits the claim
+        result = await session.execute(
+            update(IdempotencyRecord).where(
+                self._where(), IdempotencyRecord.locked_at == record.locked_at
+            ).values(
+                status="in_progress",
+                request_hash=self.fingerprint,
+                locked_at=now,
+                expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+            )
+        )
+        await session.commit()
+        return result.rowcount == 1
+
+    async def claim(self) -> Optional[JSONResponse]:
+        """Claim the key; returns the response to send instead of running the request."""
+        if not self.key:
+            return None
+        if len(self.key) > MAX_KEY_LENGTH:
+            return _error(400, f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters")
+
+        deadline = asyncio.get_running_loop().time() + settings.IDEMPOTENCY_WAIT_SECONDS
+        delay = 0.05
+        async with AsyncSessionLocal() as session:
+            if random.random() < CLEANUP_PROBABILITY:
+                await session.execute(
+                    delete(IdempotencyRecord).where(IdempotencyRecord.expires_at < datetime.utcnow())
+                )
+                await session.commit()
+
+            while True:
+                now = datetime.utcnow()
+                if await self._try_insert(session, now):
+                    self.owned = True
+                    return None
+
+                record = await session.scalar(
+                    select(IdempotencyRecord).where(self._where()).execution_options(populate_existing=True)
+                )
+                if record is None:
+                    continue  # Released between our insert and read; try again
+
+                expired = record.expires_at < now
+                abandoned = (
+                    record.status == "in_progress"
+                    and record.locked_at < now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS)
+                )
+                if expired or abandoned:
+                    if await self._take_over(session, record, now):
+                        self.owned = True
+                        return None
+                    continue
+
+                if record.request_hash != self.fingerprint:
+                    return _error(422, f"{IDEMPOTENCY_HEADER} was already used for a different request")
+
+                if record.status == "completed":
+                    response = JSONResponse(
+                        status_code=record.response_status,
+                        content=json.loads(record.response_body)
+                    )
+                    response.headers["Idempotent-Replayed"] = "true"
+                    return response
+
+                if asyncio.get_running_loop().time() >= deadline:
+                    return _error(409, "A request with this Idempotency-Key is still in progress")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 1.0)
+
+    async def complete(self, status_code: int, body: Any, session=None) -> None:
+        """Store the response for replay; server errors release the key instead.
+
+        Pass the request's session to store the response in the same
+        transaction as the writes it reports, so a crash cannot leave the
+        writes committed while the key still looks unfinished.
+        """
+        if not self.owned:
+            return
+        if status_code >= 500:
+            await self.release()
+            return
+        statement = update(IdempotencyRecord).where(self._where()).values(
+            status="completed",
+            response_status=status_code,
+            response_body=json.dumps(body)
+        )
+        if session is not None:
+            await session.execute(statement)
+            # Still releasable until the caller's transaction commits
+            event.listen(session.sync_session, "after_commit", self._committed, once=True)
+            return
+        async with AsyncSessionLocal() as own_session:
+            await own_session.execute(statement)
+            await own_session.commit()
+        self.owned = False
+
+    def _committed(self, session) -> None:
+        self.owned = False
+
+    async def release(self) -> None:
+        """Drop the claim so a retry runs the request again."""
+        if not self.owned:
+            return
+        self.owned = False
+        try:
+            async with AsyncSessionLocal() as session:
+                await session.execute(delete(IdempotencyRecord).where(self._where()))
+                await session.commit()
+        except Exception as e:
+            # The lock timeout frees the key eventually
+            logger.error(f"Releasing idempotency key failed: {str(e)}")
@@ -0,0 +1,200 @@
+import asyncio
+import collections
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Deque, Dict, Optional
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Frames kept from the innermost end of a captured stack
+STACK_DEPTH = 30
+RECENT_STALLS = 20
+
+class LoopMonitor:
+    """Detects callbacks that block the event loop and reports what was running.
+
+    A heartbeat task sleeps for LOOP_MONITOR_INTERVAL_MS and records how
+    late it wakes up; that lateness is the event-loop lag every request
+    sees. A watchdog thread checks the heartbeat and, once it is more than
+    LOOP_STALL_THRESHOLD_MS overdue, captures the loop thread's stack while
+    the blocking call is still on it, together with the route being served.
+    Both sides are cheap enough to leave running in production.
+    """
+
+    def __init__(self, threshold: float, interval: float):
+        self.threshold = threshold
+        self.interval = interval
+        self._loop_thread_id: Optional[int] = None
+        self._beat = time.monotonic()
+        self._captured_beat: Optional[float] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        # Frame of each in-flight request's middleware call -> its ASGI scope
+        self._requests: Dict[Any, Dict[str, Any]] = {}
+
+        self.samples = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.slow_ticks = 0
+        self.stalls = 0
+        self.stalls_by_route: Dict[str, int] = collections.Counter()
+        self.recent: Deque[Dict[str, Any]] = collections.deque(maxlen=RECENT_STALLS)
+
+    async def start(self) -> None:
+        if self._heartbeat_task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stopping.clear()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+        logger.info(
+            f"Event loop monitor started ({self.threshold * 1000:.0f} ms threshold)"
+        )
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat_task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1.0)
+            self._watchdog = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            self._beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - self._beat - self.interval)
+            self.samples += 1
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.threshold:
+                self.slow_ticks += 1
+
+    def _watch(self) -> None:
+        while not self._stopping.wait(self.interval / 2):
+            beat = self._beat
+            overdue = time.monotonic() - beat - self.interval
+            # One report per stall, taken while the blocking call is still running
+            if overdue >= self.threshold and self._captured_beat != beat:
+                self._captured_beat = beat
+                try:
+                    self._capture(overdue)
+                except Exception as e:
+                    logger.error(f"Capturing event loop stack failed: {str(e)}")
+
+    def _capture(self, overdue: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        route = self._route_for(frame)
+        stack = "".join(traceback.format_list(traceback.extract_stack(frame)[-STACK_DEPTH:]))
+        del frame
+
+        self.stalls += 1
+        self.stalls_by_route[route] += 1
+        self.recent.append({
+            "at": time.time(),
+            "blocked_ms": round(overdue * 1000),
+            "route": route,
+            "stack": stack
+        })
+        logger.warning(
+            f"Event loop blocked for {overdue * 1000:.0f} ms+ in {route}:\n{stack}"
+        )
+
+    def track_request(self, frame, scope: Dict[str, Any]) -> None:
+        """Attribute stalls below ``frame`` to the request in ``scope``."""
+        self._requests[frame] = scope
+
+    def untrack_request(self, frame) -> None:
+        self._requests.pop(frame, None)
+
+    def _route_for(self, frame) -> str:
+        # Coroutines awaiting each other sit on the stack together, so the
+        # request's middleware frame is an ancestor of the blocking call
+        while frame is not None:
+            scope = self._requests.get(frame)
+            if scope is not None:
+                return route_label(scope)
+            frame = frame.f_back
+        return "background"
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and recent stalls without their stacks, which only go to the log."""
+        return {
+            "enabled": True,
+            "threshold_ms": self.threshold * 1000,
+            "samples": self.samples,
+            "last_lag_ms": round(self.last_lag * 1000, 2),
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "slow_ticks": self.slow_ticks,
+            "stalls": self.stalls,
+            "stalls_by_route": dict(self.stalls_by_route),
+            "recent": [
+                {key: value for key, value in stall.items() if key != "stack"} for stall in self.recent
+            ]
+        }
+
+def route_label(scope: Dict[str, Any]) -> str:
+    """``METHOD /path/{template}`` once routing has matched, the raw path before."""
+    method = scope.get("method", scope.get("type", "").upper())
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is not None and app is not None:
+        for route in getattr(app, "routes", []):
+            if getattr(route, "endpoint", None) is endpoint:
+                return f"{method} {route.path}"
+    return f"{method} {scope.get('path', '')}"
+
+class LoopMonitorMiddleware:
+    """Lets the monitor tell which request a blocked stack belongs to.
+
+    Added innermost so its frame sits right above the endpoint. Plain ASGI
+    rather than BaseHTTPMiddleware, which would run the endpoint in a
+    separate task and cut it off from this frame.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        monitor = get_loop_monitor()
+        if monitor is None or scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        frame = sys._getframe()
+        monitor.track_request(frame, scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            monitor.untrack_request(frame)
+            del frame
+
+_monitor: Optional[LoopMonitor] = None
+
+def get_loop_monitor() -> Optional[LoopMonitor]:
+    """The process monitor, or None when LOOP_MONITOR_ENABLED is off."""
+    global _monitor
+    if _monitor is None and settings.LOOP_MONITOR_ENABLED:
+        _monitor = LoopMonitor(
+            threshold=settings.LOOP_STALL_THRESHOLD_MS / 1000,
+            interval=settings.LOOP_MONITOR_INTERVAL_MS / 1000
+        )
+    return _monitor
+
+def set_loop_monitor(monitor: Optional[LoopMonitor]) -> None:
+    global _monitor
+    _monitor = monitor
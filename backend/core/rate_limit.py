@@ -0,0 +1,152 @@
+from fastapi import Request
+from collections import OrderedDict
+from typing import Optional, Tuple
+from core.config import settings
+from core.exceptions import RateLimitException
+from core.security import decode_token
+import asyncio
+import math
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class RateLimitBackend:
+    """Stores token buckets. Implementations must take tokens atomically."""
+
+    async def acquire(self, key: str, capacity: float, refill_per_second: float) -> float:
+        """Take one token from ``key``'s bucket.
+
+        Returns:
+            float: 0 when the token was granted, otherwise seconds until one
+            will be available
+        """
+        raise NotImplementedError
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Per-process buckets; limits are per worker when running several."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, key: str, capacity: float, refill_per_second: float) -> float:
+        async with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+
+            retry_after = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                retry_after = (1 - tokens) / refill_per_second
+
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            # The least recently used bucket has had the longest to refill
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return retry_after
+
+# Runs atomically inside Redis and uses the server clock, so every worker
+# shares one bucket per key regardless of local clock skew.
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(retry_after)
+"""
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Buckets shared by all workers through Redis."""
+
+    def __init__(self, client=None, prefix: str = "ratelimit:"):
+        if client is None:
+            from core.redis_client import get_redis
+            client = get_redis()
+        self.prefix = prefix
+        self._script = client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(self, key: str, capacity: float, refill_per_second: float) -> float:
+        result = await self._script(keys=[self.prefix + key], args=[capacity, refill_per_second])
+        return float(result)
+
+_backend: Optional[RateLimitBackend] = None
+
+def get_rate_limit_backend() -> RateLimitBackend:
+    global _backend
+    if _backend is None:
+        if settings.RATE_LIMIT_BACKEND == "redis":
+            _backend = RedisRateLimitBackend()
+        else:
+            _backend = InMemoryRateLimitBackend()
+    return _backend
+
+def set_rate_limit_backend(backend: RateLimitBackend) -> None:
+    global _backend
+    _backend = backend
+
+def _client_identity(request: Request) -> str:
+    """Identify the caller without a database round trip."""
+    auth_header = request.headers.get('Authorization')
+    if auth_header and auth_header.startswith('Bearer '):
+        try:
+            username = decode_token(auth_header.split(' ')[1]).get("sub")
+            if username:
+                return f"user:{username}"
+        except Exception:
+            pass
+
+    user_id = request.session.get('user_id') if "session" in request.scope else None
+    if user_id:
+        return f"user-id:{user_id}"
+
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+class RateLimit:
+    """FastAPI dependency enforcing a token bucket per caller and route.
+
+    Usage:
+        @router.post("/...", dependencies=[Depends(RateLimit("progress"))])
+    """
+
+    def __init__(
+        self,
+        scope: str,
+        burst: Optional[int] = None,
+        per_minute: Optional[float] = None
+    ):
+        self.scope = scope
+        self.burst = burst
+        self.per_minute = per_minute
+
+    async def __call__(self, request: Request) -> None:
+        capacity = self.burst or settings.RATE_LIMIT_AI_BURST
+        refill_per_second = (self.per_minute or settings.RATE_LIMIT_AI_PER_MINUTE) / 60.0
+        key = f"{self.scope}:{_client_identity(request)}"
+
+        try:
+            retry_after = await get_rate_limit_backend().acquire(key, capacity, refill_per_second)
+        except Exception as e:
+            # A broken shared backend must not take the endpoints down with it
+            logger.error(f"Rate limit backend error: {str(e)}")
+            return
+
+        if retry_after > 0:
+            logger.warning(f"Rate limit exceeded for {key}")
+            raise RateLimitException(retry_after=max(1, math.ceil(retry_after)))
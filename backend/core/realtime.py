@@ -0,0 +1,200 @@
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+from starlette.websockets import WebSocket, WebSocketDisconnect
+from core.config import settings
+import asyncio
+import json
+import time
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Close code for clients that cannot keep up (RFC 6455 "try again later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+class Connection:
+    """One WebSocket with a bounded outgoing queue.
+
+    Events are queued without blocking the publisher. A client whose queue
+    fills up is disconnected instead of buffering without limit; it
+    reconnects and refetches, which is cheaper than replaying a backlog.
+    """
+
+    def __init__(self, websocket: WebSocket, user_id: int, max_queue: int):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_queue)
+        self.last_seen = time.monotonic()
+        self.overflowed = asyncio.Event()
+
+    def offer(self, message: Dict[str, Any]) -> bool:
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.overflowed.set()
+            return False
+
+class ConnectionManager:
+    """Tracks each user's open sockets and delivers events to them.
+
+    Without a pub/sub client events only reach sockets held by this worker.
+    With one, every event is also published on a Redis channel and each
+    worker delivers what other workers published to its own sockets.
+    """
+
+    def __init__(
+        self,
+        pubsub_client=None,
+        channel: str = "realtime-events",
+        heartbeat: float = 25.0,
+        idle_timeout: float = 60.0,
+        max_queue: int = 100
+    ):
+        self.pubsub_client = pubsub_client
+        self.channel = channel
+        self.heartbeat = heartbeat
+        self.idle_timeout = idle_timeout
+        self.max_queue = max_queue
+        self.origin = uuid.uuid4().hex
+        self._connections: Dict[int, Set[Connection]] = defaultdict(set)
+        self._listener: Optional[asyncio.Task] = None
+
+    def connection_count(self) -> int:
+        return sum(len(connections) for connections in self._connections.values())
+
+    def _deliver(self, user_id: int, message: Dict[str, Any]) -> None:
+        for connection in list(self._connections.get(user_id, ())):
+            if not connection.offer(message):
+                logger.warning(f"Dropping slow WebSocket client of user {user_id}")
+
+    async def publish(self, user_id: int, event: str, data: Dict[str, Any]) -> None:
+        """Send an event to every client of the user; never raises."""
+        message = {"type": event, "data": data}
+        self._deliver(user_id, message)
+        if self.pubsub_client is not None:
+            try:
+                await self.pubsub_client.publish(self.channel, json.dumps({
+                    "origin": self.origin, "user_id": user_id, "message": message
+                }))
+            except Exception as e:
+                logger.error(f"Realtime publish failed: {str(e)}")
+
+    async def serve(self, websocket: WebSocket, user_id: int) -> None:
+        """Run an accepted socket until the client leaves, idles out or overflows."""
+        connection = Connection(websocket, user_id, self.max_queue)
+        self._connections[user_id].add(connection)
+        tasks = [
+            asyncio.create_task(self._send_loop(connection)),
+            asyncio.create_task(self._receive_loop(connection)),
+            asyncio.create_task(self._heartbeat_loop(connection)),
+            asyncio.create_task(connection.overflowed.wait()),
+        ]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._connections[user_id].discard(connection)
+            if not self._connections[user_id]:
+                del self._connections[user_id]
+
+            code = SLOW_CONSUMER_CLOSE_CODE if connection.overflowed.is_set() else 1000
+            try:
+                await websocket.close(code=code)
+            except Exception:
+                pass
+
+    async def _send_loop(self, connection: Connection) -> None:
+        while True:
+            message = await connection.queue.get()
+            await connection.websocket.send_json(message)
+
+    async def _receive_loop(self, connection: Connection) -> None:
+        # Clients only answer pings; any frame counts as a sign of life
+        try:
+            while True:
+                await connection.websocket.receive_text()
+                connection.last_seen = time.monotonic()
+        except WebSocketDisconnect:
+            return
+        except Exception as e:
+            # Ends serve() like a disconnect, which deregisters the socket
+            logger.warning(f"WebSocket of user {connection.user_id} failed: {str(e)}")
+            return
+
+    async def _heartbeat_loop(self, connection: Connection) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            if time.monotonic() - connection.last_seen > self.idle_timeout:
+                logger.info(f"Closing idle WebSocket of user {connection.user_id}")
+                return
+            connection.offer({"type": "ping", "data": {}})
+
+    async def start(self) -> None:
+        if self.pubsub_client is not None and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen(self) -> None:
+        backoff = 1.0
+        while True:
+            pubsub = self.pubsub_client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                backoff = 1.0
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    payload = json.loads(message["data"])
+                    if payload.get("origin") != self.origin:
+                        self._deliver(int(payload["user_id"]), payload["message"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Realtime listener error: {str(e)}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
+
+def build_connection_manager() -> ConnectionManager:
+    pubsub_client = None
+    if settings.REALTIME_BACKEND == "redis":
+        from core.redis_client import get_redis
+        pubsub_client = get_redis()
+    return ConnectionManager(
+        pubsub_client=pubsub_client,
+        channel=settings.REALTIME_CHANNEL,
+        heartbeat=settings.WS_HEARTBEAT_SECONDS,
+        idle_timeout=settings.WS_IDLE_TIMEOUT_SECONDS,
+        max_queue=settings.WS_SEND_QUEUE_SIZE
+    )
+
+_manager: Optional[ConnectionManager] = None
+
+def get_connection_manager() -> ConnectionManager:
+    global _manager
+    if _manager is None:
+        _manager = build_connection_manager()
+    return _manager
+
+def set_connection_manager(manager: ConnectionManager) -> None:
+    global _manager
+    _manager = manager
+
+async def publish_user_event(user_id: int, event: str, data: Dict[str, Any]) -> None:
+    await get_connection_manager().publish(user_id, event, data)
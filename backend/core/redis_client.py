@@ -0,0 +1,25 @@
+from core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+_client = None
+
+def get_redis():
+    """Return the shared Redis client for ``REDIS_URL``.
+
+    ``redis`` is only imported when a shared backend is actually configured,
+    so single-process deployments never need a Redis server.
+    """
+    global _client
+    if _client is None:
+        if not settings.REDIS_URL:
+            raise RuntimeError("REDIS_URL must be set to use a Redis backend")
+        import redis.asyncio as redis
+        _client = redis.from_url(settings.REDIS_URL)
+    return _client
+
+def set_redis(client) -> None:
+    """Use an existing client, e.g. a local stand-in in development."""
+    global _client
+    _client = client
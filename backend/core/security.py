@@ -1,10 +1,17 @@
 from datetime import datetime, timedelta
 from typing import Any, Union, Optional, Dict
 from jose import jwt
-from passlib.context import CryptContext
 from core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+_pwd_context = None
+
+def get_pwd_context():
+    """Password hashing context, built on first use to keep passlib off the startup path."""
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
 
 def create_access_token(
     subject: Union[str, Any],
@@ -47,11 +54,11 @@ def create_access_token(
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Generate password hash."""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def decode_token(token: str) -> dict:
     """Decode a JWT token."""
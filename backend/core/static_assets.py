@@ -0,0 +1,115 @@
+import json
+import logging
+import mimetypes
+import os
+from typing import Dict, Optional, Set, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+# Preferred first when the client accepts several equally
+ENCODINGS: Tuple[Tuple[str, str], ...] = (("br", ".br"), ("gzip", ".gz"))
+
+def negotiate_encoding(accept_encoding: str, available: Set[str]) -> Optional[str]:
+    """Best of ``available`` for an Accept-Encoding header, or None for identity."""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding, _ in ENCODINGS:
+        if encoding not in available:
+            continue
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+def load_manifest(directory: str) -> Dict[str, str]:
+    """Logical asset path -> fingerprinted path, as written by build_assets.py."""
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+class PrecompressedStaticFiles(StaticFiles):
+    """Serves the output of build_assets.py.
+
+    Fingerprinted files never change under the same name, so they are
+    sent with a year-long ``immutable`` Cache-Control and browsers do not
+    even revalidate them. Each file has ``.br``/``.gz`` siblings made at
+    build time; the best one the client accepts is sent as is, so nothing
+    is compressed per request. Everything else (the manifest, unhashed
+    files) is revalidated on every use, so clients read the current
+    hashed names from /static/manifest.json.
+    """
+
+    def __init__(self, *, directory: str, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self.directory_root = os.path.realpath(directory)
+        self.immutable = set(load_manifest(directory).values())
+        # Built once: the directory does not change while the app runs
+        self.variants: Dict[str, Dict[str, Tuple[str, os.stat_result]]] = {}
+        for root, _, files in os.walk(self.directory_root):
+            for name in files:
+                for encoding, suffix in ENCODINGS:
+                    if name.endswith(suffix):
+                        path = os.path.join(root, name)
+                        original = os.path.relpath(path[:-len(suffix)], self.directory_root)
+                        self.variants.setdefault(original, {})[encoding] = (path, os.stat(path))
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        relative = os.path.relpath(os.path.realpath(full_path), self.directory_root)
+        variants = self.variants.get(relative, {})
+
+        headers = {
+            "Cache-Control": (
+                f"public, max-age={settings.STATIC_MAX_AGE_SECONDS}, immutable"
+                if relative in self.immutable else "no-cache"
+            )
+        }
+        if variants:
+            headers["Vary"] = "Accept-Encoding"
+
+        media_type = mimetypes.guess_type(str(full_path))[0] or "text/plain"
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""), set(variants))
+        if encoding is not None:
+            full_path, stat_result = variants[encoding]
+            headers["Content-Encoding"] = encoding
+
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            stat_result=stat_result,
+            media_type=media_type,
+            headers=headers
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
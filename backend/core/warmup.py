@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from database import engine
+from models import Goal, ProgressUpdate, User
+
+logger = logging.getLogger(__name__)
+
+# Ids and names that never match a row; only the statement shape matters
+# for the compiled cache and asyncpg's per-connection prepared statements.
+_NO_ID = -1
+_NO_NAME = ""
+
+class WarmupState:
+    def __init__(self):
+        self.ready = False
+        self.started_at = None
+        self.duration = None
+        self.connections = 0
+        self.errors: List[str] = []
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "duration_seconds": self.duration,
+            "connections": self.connections,
+            "errors": self.errors
+        }
+
+state = WarmupState()
+
+async def _run_hot_queries(session: AsyncSession) -> None:
+    """Execute the statements used on the request hot path."""
+    await session.execute(select(User).filter(User.username == _NO_NAME))
+    await session.execute(select(User).filter(User.id == _NO_ID))
+    await session.execute(select(Goal).filter(Goal.user_id == _NO_ID))
+    await session.execute(
+        select(ProgressUpdate).filter(
+            ProgressUpdate.goal_id == _NO_ID
+        ).order_by(ProgressUpdate.created_at.desc())
+    )
+    await session.get(Goal, _NO_ID)
+
+async def _warm_connection(conn) -> None:
+    await conn.start()
+    async with AsyncSession(bind=conn) as session:
+        await _run_hot_queries(session)
+    await conn.rollback()
+
+async def warm_database_pool(count: int) -> int:
+    """Open ``count`` pooled connections and prime them with the hot queries.
+
+    All connections are checked out at the same time so the pool really
+    opens ``count`` distinct sockets, then they are returned to the pool.
+    """
+    pool_size = getattr(engine.pool, "size", None)
+    if pool_size is None:
+        # NullPool (SQLite) keeps nothing open, so there is nothing to warm
+        return 0
+    count = max(0, min(count, pool_size()))
+    connections = [engine.connect() for _ in range(count)]
+    try:
+        results = await asyncio.gather(
+            *(_warm_connection(conn) for conn in connections),
+            return_exceptions=True
+        )
+    finally:
+        await asyncio.gather(
+            *(conn.close() for conn in connections),
+            return_exceptions=True
+        )
+
+    warmed = 0
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"Connection warm-up failed: {str(result)}")
+            state.errors.append(f"database: {str(result)}")
+        else:
+            warmed += 1
+    return warmed
+
+def warm_ai_client() -> None:
+    from services.ai import get_ai_client
+    get_ai_client()
+
+def preload_modules() -> None:
+    """Import what startup deliberately skipped, so requests do not pay for it."""
+    import services.analytics  # noqa: F401  (NumPy)
+    import services.similarity  # noqa: F401
+    from core.security import get_pwd_context
+    get_pwd_context()
+
+async def run_warmup() -> None:
+    """Prime connections, compiled statements, clients and lazy imports.
+
+    Failures are logged and recorded but never abort startup; the app
+    still serves, it just pays the cold costs on the first requests.
+    """
+    state.started_at = time.monotonic()
+    try:
+        try:
+            state.connections = await asyncio.wait_for(
+                warm_database_pool(settings.DB_WARMUP_CONNECTIONS),
+                timeout=settings.WARMUP_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            logger.error("Database warm-up timed out")
+            state.errors.append("database: timed out")
+
+        # Imports hold the GIL but not the event loop when run in a thread
+        try:
+            await asyncio.to_thread(warm_ai_client)
+        except Exception as e:
+            state.errors.append(f"ai: {str(e)}")
+        try:
+            await asyncio.to_thread(preload_modules)
+        except Exception as e:
+            state.errors.append(f"preload: {str(e)}")
+    finally:
+        state.duration = round(time.monotonic() - state.started_at, 3)
+        state.ready = True
+        logger.info(
+            f"Warm-up finished in {state.duration}s "
+            f"({state.connections} connections, {len(state.errors)} errors)"
+        )
+
+_task: Optional[asyncio.Task] = None
+
+def start_warmup() -> None:
+    """Run the warm-up in the background so the server accepts requests at once.
+
+    /ready reports 503 until it finishes, which keeps deploys from
+    routing traffic early, while /health (liveness) answers at once; a
+    woken free-tier instance serves its first request without waiting
+    for the warm-up.
+    """
+    global _task
+    if _task is None:
+        _task = asyncio.create_task(run_warmup())
+
+async def stop_warmup() -> None:
+    global _task
+    if _task is not None and not _task.done():
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+    _task = None
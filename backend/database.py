@@ -1,11 +1,14 @@
 # database.py
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy import event
 from sqlalchemy.orm import sessionmaker, declarative_base
 from core.config import settings
 import ssl
 
-# Create SSL context
-ssl_context = ssl.create_default_context()
+# Encrypted but unverified connections. A bare context is built directly:
+# create_default_context() would load the system CA bundle at import only
+# for CERT_NONE to ignore it.
+ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
 ssl_context.check_hostname = False
 ssl_context.verify_mode = ssl.CERT_NONE
 
@@ -15,22 +18,38 @@ SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 if SQLALCHEMY_DATABASE_URL.startswith("postgres://"):
     SQLALCHEMY_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace("postgres://", "postgresql+asyncpg://", 1)
 
-# Configure connect arguments based on environment
-connect_args = {
-    "ssl": ssl_context,
-    "server_settings": {"jit": "off"},  # Disable JIT for compatibility
-    "command_timeout": 60  # Increase command timeout
-}
+# Configure connect arguments based on environment; SQLite is only used
+# for local testing and takes none of the asyncpg options
+connect_args = {}
+if SQLALCHEMY_DATABASE_URL.startswith("postgresql"):
+    connect_args = {
+        "server_settings": {"jit": "off"},  # Disable JIT for compatibility
+        "command_timeout": 60  # Increase command timeout
+    }
+    if settings.DB_SSL:
+        connect_args["ssl"] = ssl_context
+
+# aiosqlite engines use NullPool, which takes no sizing options
+pool_args = {}
+if not SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+    pool_args = {"pool_size": settings.DB_POOL_SIZE, "max_overflow": settings.DB_MAX_OVERFLOW}
 
 engine = create_async_engine(
     SQLALCHEMY_DATABASE_URL,
     echo=True,
     pool_pre_ping=True,
-    pool_size=20,
-    max_overflow=10,
-    connect_args=connect_args
+    connect_args=connect_args,
+    **pool_args
 )
 
+if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+    # SQLite ignores foreign keys, and so ON DELETE CASCADE, unless asked per connection
+    @event.listens_for(engine.sync_engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 Base = declarative_base()
 
@@ -4,8 +4,18 @@ from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from fastapi.responses import JSONResponse
+from fastapi.staticfiles import StaticFiles
 from core.config import settings
+from core import warmup
+from core.cache import get_cache
+from core.realtime import get_connection_manager
+from core.loop_monitor import LoopMonitorMiddleware, get_loop_monitor
+from core.static_assets import PrecompressedStaticFiles
+from core.health import get_health_monitor
+from services.reminders import start_reminder_scheduler, stop_reminder_scheduler
+from services.purge import schedule_purge
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +35,9 @@ def create_application() -> FastAPI:
         "http://ai-powered-goal-tracker.onrender.com"
     ]
 
+    # Stall reports name the route; must stay innermost (added first)
+    app.add_middleware(LoopMonitorMiddleware)
+
     # Session middleware (must be added before CORS)
     app.add_middleware(
         SessionMiddleware,
@@ -57,15 +70,17 @@ def create_application() -> FastAPI:
 
     @app.get("/health")
     async def health_check():
-        """Health check endpoint"""
-        return JSONResponse({
-            "status": "ok",
-            "uptime": "available",
-            "services": {
-                "api": "healthy",
-                "database": "connected"
-            }
-        })
+        """Liveness: the process is up and serving. Constant time, no I/O"""
+        return JSONResponse({"status": "ok", "version": settings.VERSION})
+
+    @app.get("/ready")
+    async def readiness_check():
+        """Readiness from the cached background checks; 503 until warm-up and checks pass"""
+        readiness = get_health_monitor().readiness()
+        return JSONResponse(
+            status_code=200 if readiness["ready"] else 503,
+            content={"status": "ready" if readiness["ready"] else "unavailable", **readiness}
+        )
 
     @app.middleware("http")
     async def log_requests(request: Request, call_next):
@@ -86,7 +101,16 @@ def create_application() -> FastAPI:
     async def startup_event():
         logger.info("Starting application...")
         try:
-            # Add any startup tasks here
+            if get_loop_monitor() is not None:
+                await get_loop_monitor().start()
+            await get_cache().start()
+            await get_connection_manager().start()
+            warmup.start_warmup()
+            await get_health_monitor().start()
+            start_reminder_scheduler()
+            # Finish account purges interrupted by a restart (one worker
+            # at a time, under a lease)
+            schedule_purge()
             logger.info("Application started successfully")
         except Exception as e:
             logger.error(f"Startup error: {str(e)}")
@@ -96,12 +120,25 @@ def create_application() -> FastAPI:
     async def shutdown_event():
         logger.info("Shutting down application...")
         try:
-            # Add any cleanup tasks here
+            await warmup.stop_warmup()
+            await get_health_monitor().stop()
+            await get_cache().stop()
+            await get_connection_manager().stop()
+            await stop_reminder_scheduler()
+            if get_loop_monitor() is not None:
+                await get_loop_monitor().stop()
             logger.info("Application shutdown completed")
         except Exception as e:
             logger.error(f"Shutdown error: {str(e)}")
             raise
 
+    # Built assets are fingerprinted and cached for good; without a build
+    # (local development) the sources are served as they are
+    if os.path.isdir(settings.STATIC_BUILD_DIR):
+        app.mount("/static", PrecompressedStaticFiles(directory=settings.STATIC_BUILD_DIR), name="static")
+    elif os.path.isdir(settings.STATIC_SOURCE_DIR):
+        app.mount("/static", StaticFiles(directory=settings.STATIC_SOURCE_DIR), name="static")
+
     # Include API router
     from api.v1.router import api_router
     app.include_router(api_router, prefix=settings.API_V1_STR)
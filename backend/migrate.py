@@ -0,0 +1,150 @@
+# backend/migrate.py
+"""Bring an existing database up to date with models.py.
+
+    python migrate.py
+
+create_all adds missing tables but never changes existing ones, so
+changes to tables that already hold data are listed in MIGRATIONS and
+applied once each, in order, with progress recorded in
+schema_migrations. Each runs in one transaction, except those in
+NON_TRANSACTIONAL (concurrent index builds). Statements are written
+for PostgreSQL; SQLite
+databases are local throwaways and are recreated from the models.
+With PROGRESS_PARTITIONING on, progress_updates is also converted to
+monthly partitions (services/partitions.py).
+"""
+import asyncio
+import logging
+import re
+from typing import List, Tuple
+
+from sqlalchemy import text
+
+from core.config import settings
+from database import engine, Base
+import models  # noqa: F401  (registers the tables on Base.metadata)
+from models import GOAL_SEARCH_COLUMNS, PROGRESS_SEARCH_COLUMNS, search_document
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS: List[Tuple[str, List[str]]] = [
+    ("0001_cascading_deletes", [
+        "ALTER TABLE goals DROP CONSTRAINT IF EXISTS goals_user_id_fkey",
+        "ALTER TABLE goals ADD CONSTRAINT goals_user_id_fkey "
+        "FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE",
+        "ALTER TABLE progress_updates DROP CONSTRAINT IF EXISTS progress_updates_goal_id_fkey",
+        "ALTER TABLE progress_updates ADD CONSTRAINT progress_updates_goal_id_fkey "
+        "FOREIGN KEY (goal_id) REFERENCES goals (id) ON DELETE CASCADE",
+        # Cascades and purges look children up by their parent
+        "CREATE INDEX IF NOT EXISTS ix_goals_user_id ON goals (user_id)",
+        "CREATE INDEX IF NOT EXISTS ix_progress_updates_goal_id ON progress_updates (goal_id)",
+    ]),
+    ("0002_users_deleted_at", [
+        "ALTER TABLE users ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP WITHOUT TIME ZONE",
+        "CREATE INDEX IF NOT EXISTS ix_users_deleted_at ON users (deleted_at)",
+    ]),
+    ("0003_goals_target_date_index", [
+        "CREATE INDEX IF NOT EXISTS ix_goals_target_date_id ON goals (target_date, id)",
+    ]),
+    ("0004_progress_updates_goal_created_at_index", [
+        "CREATE INDEX IF NOT EXISTS ix_progress_updates_goal_id_created_at "
+        "ON progress_updates (goal_id, created_at)",
+    ]),
+    ("0005_analysis_memo_drop_hit_count", [
+        # Only counted hits that refreshed last_used_at, and nothing read it
+        "ALTER TABLE analysis_memo DROP COLUMN IF EXISTS hit_count",
+    ]),
+    # The after_create hooks in models.py only index tables created after
+    # search was added; the expressions must match search_document()
+    ("0006_full_text_search_indexes", [
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_goals_fts ON goals "
+        f"USING gin ({search_document(GOAL_SEARCH_COLUMNS)})",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_progress_updates_fts ON progress_updates "
+        f"USING gin ({search_document(PROGRESS_SEARCH_COLUMNS)})",
+    ]),
+]
+
+# Run outside a transaction, one statement at a time: CREATE INDEX
+# CONCURRENTLY builds without blocking writes but cannot run in one.
+# Their statements must be safe to repeat after a partial run.
+NON_TRANSACTIONAL = {"0006_full_text_search_indexes"}
+
+_CONCURRENT_INDEX = re.compile(r"CREATE INDEX CONCURRENTLY IF NOT EXISTS (\w+) ON (\w+)")
+
+async def _apply_non_transactional(name: str, statements: List[str]) -> None:
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for statement in statements:
+            match = _CONCURRENT_INDEX.match(statement)
+            if match:
+                index, table = match.groups()
+                valid = await conn.scalar(text(
+                    "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:index)"
+                ), {"index": index})
+                if valid:
+                    continue
+                if valid is not None:
+                    # A failed concurrent build leaves an invalid index behind,
+                    # which IF NOT EXISTS would then keep forever
+                    await conn.execute(text(f"DROP INDEX CONCURRENTLY {index}"))
+                partitioned = await conn.scalar(text(
+                    "SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:table)"
+                ), {"table": table})
+                if partitioned:
+                    # Not supported on a partitioned parent; services/partitions.py
+                    # builds this index itself when it converts the table
+                    statement = statement.replace(" CONCURRENTLY", "", 1)
+            await conn.execute(text(statement))
+        await conn.execute(text("INSERT INTO schema_migrations (name) VALUES (:name)"), {"name": name})
+
+async def migrate() -> List[str]:
+    """Create missing tables, then apply pending migrations; returns their names."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    if engine.dialect.name != "postgresql":
+        logger.info(f"Skipping migrations on {engine.dialect.name}")
+        return []
+
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "name VARCHAR(100) PRIMARY KEY, applied_at TIMESTAMP NOT NULL DEFAULT now())"
+        ))
+        result = await conn.execute(text("SELECT name FROM schema_migrations"))
+        applied = {row[0] for row in result}
+
+    newly_applied = []
+    for name, statements in MIGRATIONS:
+        if name in applied:
+            continue
+        if name in NON_TRANSACTIONAL:
+            await _apply_non_transactional(name, statements)
+            logger.info(f"Applied migration {name}")
+            newly_applied.append(name)
+            continue
+        # One transaction per migration: it applies completely or not at all
+        async with engine.begin() as conn:
+            for statement in statements:
+                await conn.execute(text(statement))
+            await conn.execute(text("INSERT INTO schema_migrations (name) VALUES (:name)"), {"name": name})
+        logger.info(f"Applied migration {name}")
+        newly_applied.append(name)
+
+    # Opt-in, so it is not a numbered migration: converts progress_updates
+    # the first time the setting is on, then keeps future partitions ready
+    if settings.PROGRESS_PARTITIONING:
+        from services.partitions import run_maintenance
+        await run_maintenance()
+    return newly_applied
+
+async def main() -> None:
+    try:
+        applied = await migrate()
+        print(f"Applied migrations: {applied or 'none'}")
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
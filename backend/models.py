@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Text, Float, Boolean
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Text, Float, Boolean, Index, DDL, event, LargeBinary, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
+from core.config import settings
 from core.security import get_password_hash, verify_password
 
+# Range-partitioned by month on created_at (services/partitions.py)
+PROGRESS_PARTITIONED = settings.PROGRESS_PARTITIONING and settings.DATABASE_URL.startswith("postgresql")
+
 class User(Base):
     __tablename__ = "users"
 
@@ -13,8 +17,11 @@ class User(Base):
     hashed_password = Column(String)
     is_verified = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    deleted_at = Column(DateTime, index=True)  # Set while services/purge.py removes the account
     
-    goals = relationship("Goal", back_populates="user", cascade="all, delete-orphan")
+    # passive_deletes leaves child rows to the database's ON DELETE CASCADE
+    # instead of loading every one of them into the session first
+    goals = relationship("Goal", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
 
     def verify_password(self, password: str) -> bool:
         return verify_password(password, self.hashed_password)
@@ -38,10 +45,23 @@ class Goal(Base):
     description = Column(String(200), nullable=False)
     target_date = Column(Date, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
 
     user = relationship("User", back_populates="goals")
-    progress_updates = relationship("ProgressUpdate", back_populates="goal", cascade="all, delete-orphan")
+    progress_updates = relationship(
+        "ProgressUpdate", back_populates="goal", cascade="all, delete-orphan", passive_deletes=True
+    )
+    daily_rollups = relationship(
+        "ProgressDailyRollup", back_populates="goal", cascade="all, delete-orphan", passive_deletes=True
+    )
+    text_vector = relationship(
+        "GoalVector", back_populates="goal", uselist=False, cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    __table_args__ = (
+        # Keyset scans over upcoming deadlines (services/reminders.py)
+        Index("ix_goals_target_date_id", "target_date", "id"),
+    )
 
     # Add type conversion for user_id
     @property
@@ -51,12 +71,189 @@ class Goal(Base):
 class ProgressUpdate(Base):
     __tablename__ = "progress_updates"
 
-    id = Column(Integer, primary_key=True, index=True)
-    goal_id = Column(Integer, ForeignKey("goals.id", ondelete="CASCADE"), nullable=False)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    goal_id = Column(Integer, ForeignKey("goals.id", ondelete="CASCADE"), nullable=False, index=True)
     update_text = Column(Text, nullable=False)
     progress_value = Column(Float, default=0)  # Stores percentage (0-100)
     analysis = Column(Text)  # Stores AI analysis of the progress
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # A partitioned table's primary key must include the partition key
+    created_at = Column(
+        DateTime, default=datetime.utcnow, primary_key=PROGRESS_PARTITIONED, nullable=not PROGRESS_PARTITIONED
+    )
 
     # Relationship with Goal
     goal = relationship("Goal", back_populates="progress_updates")
+
+    __table_args__ = (
+        # Per-goal history reads and archival scans (services/archive.py)
+        Index("ix_progress_updates_goal_id_created_at", "goal_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"} if PROGRESS_PARTITIONED else {},
+    )
+    # Rows are still identified by id alone, whatever the table's key
+    __mapper_args__ = {"primary_key": [id]}
+
+class ProgressArchive(Base):
+    """Progress updates moved out of progress_updates by services/archive.py, packed per goal."""
+    __tablename__ = "progress_update_archive"
+
+    id = Column(Integer, primary_key=True)
+    goal_id = Column(Integer, ForeignKey("goals.id", ondelete="CASCADE"), nullable=False)
+    first_at = Column(DateTime, nullable=False)
+    last_at = Column(DateTime, nullable=False)
+    update_count = Column(Integer, nullable=False)
+    series = Column(LargeBinary, nullable=False)  # (epoch seconds <f8, progress <f4) per update
+    payload = Column(LargeBinary, nullable=False)  # zlib-compressed JSON of the full updates
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_progress_update_archive_goal_last_at", "goal_id", "last_at"),
+    )
+
+class ProgressDailyRollup(Base):
+    """One row per goal and day, maintained on every progress write."""
+    __tablename__ = "progress_daily_rollup"
+
+    goal_id = Column(Integer, ForeignKey("goals.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    category = Column(String(50), nullable=False)
+    last_value = Column(Float, default=0)  # Latest progress_value of the day
+    update_count = Column(Integer, nullable=False, default=0)
+    last_update_at = Column(DateTime, nullable=False)
+
+    goal = relationship("Goal", back_populates="daily_rollups")
+
+    __table_args__ = (
+        Index("ix_progress_daily_rollup_user_day", "user_id", "day"),
+        Index("ix_progress_daily_rollup_user_category_day", "user_id", "category", "day"),
+    )
+
+class GoalVector(Base):
+    """Hashed term-frequency vector of a goal description (see services/similarity.py)."""
+    __tablename__ = "goal_vectors"
+
+    goal_id = Column(Integer, ForeignKey("goals.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    vector = Column(LargeBinary, nullable=False)  # float16, little-endian
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    goal = relationship("Goal", back_populates="text_vector")
+
+class ReminderOutbox(Base):
+    """One deadline reminder email per user and scheduler run day."""
+    __tablename__ = "reminder_outbox"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    run_date = Column(Date, nullable=False)
+    status = Column(String(20), nullable=False, default="pending")  # pending, sent, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "run_date", name="uq_reminder_outbox_user_run"),
+        Index("ix_reminder_outbox_status_id", "status", "id"),
+    )
+
+class SchedulerCheckpoint(Base):
+    """Progress and lease of a background job, so it resumes after restarts."""
+    __tablename__ = "scheduler_checkpoints"
+
+    name = Column(String(50), primary_key=True)
+    run_date = Column(Date)
+    cursor_date = Column(Date)  # Keyset position (target_date, goal id) of the last batch
+    cursor_id = Column(Integer)
+    completed_at = Column(DateTime)
+    lease_owner = Column(String(64))
+    lease_expires_at = Column(DateTime)
+
+class IdempotencyRecord(Base):
+    """Claim and stored response of a request sent with an Idempotency-Key header."""
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    scope = Column(String(50), primary_key=True)  # Endpoint the key was used on
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status = Column(String(20), nullable=False, default="in_progress")  # in_progress, completed
+    response_status = Column(Integer)
+    response_body = Column(Text)  # JSON
+    locked_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+class AnalysisMemo(Base):
+    """Provider analysis of a progress update, keyed by a hash of its inputs."""
+    __tablename__ = "analysis_memo"
+
+    key = Column(String(64), primary_key=True)  # sha256 of model, prompt and normalized texts
+    model = Column(String(100), nullable=False)
+    percentage = Column(Float, nullable=False)
+    analysis = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+# Full-text search documents. The Postgres queries in services/search.py
+# build their tsvector with search_document() so it matches the GIN index
+# expression exactly; otherwise the planner falls back to a full scan.
+SEARCH_LANGUAGE = "english"
+GOAL_SEARCH_COLUMNS = ("description", "category")
+PROGRESS_SEARCH_COLUMNS = ("update_text", "analysis")
+
+def search_document(columns, table: str = "") -> str:
+    prefix = f"{table}." if table else ""
+    parts = " || ' ' || ".join(f"coalesce({prefix}{column}, '')" for column in columns)
+    return f"to_tsvector('{SEARCH_LANGUAGE}', {parts})"
+
+def _search_ddl(table, postgres, sqlite):
+    for statement in postgres:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+    for statement in sqlite:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+_search_ddl(
+    Goal.__table__,
+    postgres=[
+        "CREATE INDEX IF NOT EXISTS ix_goals_fts ON goals "
+        f"USING gin ({search_document(GOAL_SEARCH_COLUMNS)})"
+    ],
+    sqlite=[
+        "CREATE VIRTUAL TABLE IF NOT EXISTS goals_fts USING fts5("
+        "description, category, content='goals', content_rowid='id')",
+        "CREATE TRIGGER IF NOT EXISTS goals_fts_insert AFTER INSERT ON goals BEGIN "
+        "INSERT INTO goals_fts(rowid, description, category) "
+        "VALUES (new.id, new.description, new.category); END",
+        "CREATE TRIGGER IF NOT EXISTS goals_fts_delete AFTER DELETE ON goals BEGIN "
+        "INSERT INTO goals_fts(goals_fts, rowid, description, category) "
+        "VALUES ('delete', old.id, old.description, old.category); END",
+        "CREATE TRIGGER IF NOT EXISTS goals_fts_update AFTER UPDATE ON goals BEGIN "
+        "INSERT INTO goals_fts(goals_fts, rowid, description, category) "
+        "VALUES ('delete', old.id, old.description, old.category); "
+        "INSERT INTO goals_fts(rowid, description, category) "
+        "VALUES (new.id, new.description, new.category); END",
+    ]
+)
+
+_search_ddl(
+    ProgressUpdate.__table__,
+    postgres=[
+        "CREATE INDEX IF NOT EXISTS ix_progress_updates_fts ON progress_updates "
+        f"USING gin ({search_document(PROGRESS_SEARCH_COLUMNS)})"
+    ],
+    sqlite=[
+        "CREATE VIRTUAL TABLE IF NOT EXISTS progress_updates_fts USING fts5("
+        "update_text, analysis, content='progress_updates', content_rowid='id')",
+        "CREATE TRIGGER IF NOT EXISTS progress_updates_fts_insert AFTER INSERT ON progress_updates BEGIN "
+        "INSERT INTO progress_updates_fts(rowid, update_text, analysis) "
+        "VALUES (new.id, new.update_text, new.analysis); END",
+        "CREATE TRIGGER IF NOT EXISTS progress_updates_fts_delete AFTER DELETE ON progress_updates BEGIN "
+        "INSERT INTO progress_updates_fts(progress_updates_fts, rowid, update_text, analysis) "
+        "VALUES ('delete', old.id, old.update_text, old.analysis); END",
+        "CREATE TRIGGER IF NOT EXISTS progress_updates_fts_update AFTER UPDATE ON progress_updates BEGIN "
+        "INSERT INTO progress_updates_fts(progress_updates_fts, rowid, update_text, analysis) "
+        "VALUES ('delete', old.id, old.update_text, old.analysis); "
+        "INSERT INTO progress_updates_fts(rowid, update_text, analysis) "
+        "VALUES (new.id, new.update_text, new.analysis); END",
+    ]
+)
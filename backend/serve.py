@@ -0,0 +1,88 @@
+# backend/serve.py
+"""Production entrypoint: gunicorn managing uvicorn workers.
+
+    python serve.py
+
+Workers are sized from the CPUs available to the process, capped so that
+all worker pools together stay within DB_MAX_CONNECTIONS. Send SIGHUP to
+the master for a graceful reload (new workers start before old ones
+drain); workers are also recycled after GUNICORN_MAX_REQUESTS requests.
+"""
+import logging
+import os
+
+from gunicorn.app.base import BaseApplication
+from uvicorn.workers import UvicornWorker
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class ProductionWorker(UvicornWorker):
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "lifespan": "on"}
+
+def available_cpus() -> int:
+    """CPUs this process may run on (respects affinity masks and cpusets)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def compute_workers(
+    cpus: int,
+    db_max_connections: int,
+    connections_per_worker: int,
+    override: int = 0
+) -> int:
+    """One async worker per CPU, but never more than the database can serve."""
+    if override > 0:
+        return override
+    workers = max(1, cpus)
+    if connections_per_worker > 0:
+        workers = min(workers, max(1, db_max_connections // connections_per_worker))
+    return workers
+
+class ProductionServer(BaseApplication):
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from main import app
+        return app
+
+def build_options() -> dict:
+    connections_per_worker = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    workers = compute_workers(
+        available_cpus(),
+        settings.DB_MAX_CONNECTIONS,
+        connections_per_worker,
+        settings.WEB_CONCURRENCY
+    )
+    logger.info(
+        f"Starting {workers} workers ({available_cpus()} CPUs, "
+        f"{connections_per_worker} DB connections per worker, "
+        f"budget {settings.DB_MAX_CONNECTIONS})"
+    )
+    return {
+        "bind": f"0.0.0.0:{os.getenv('PORT', '8000')}",
+        "workers": workers,
+        "worker_class": "serve.ProductionWorker",
+        "max_requests": settings.GUNICORN_MAX_REQUESTS,
+        "max_requests_jitter": settings.GUNICORN_MAX_REQUESTS_JITTER,
+        "timeout": settings.GUNICORN_TIMEOUT,
+        "graceful_timeout": settings.GUNICORN_GRACEFUL_TIMEOUT,
+        "keepalive": settings.GUNICORN_KEEPALIVE,
+        # Each worker builds its own engine and event loop after fork
+        "preload_app": False,
+        "accesslog": "-",
+        "errorlog": "-",
+    }
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    ProductionServer(build_options()).run()
@@ -1,57 +1,52 @@
-from groq import AsyncGroq
-from core.config import settings
+from pydantic import BaseModel, ValidationError, field_validator
+from core.config import settings, GenerationProfile
 import logging
 from datetime import datetime
-from typing import List, Dict, Any
-import json
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from groq import AsyncGroq
 
 logger = logging.getLogger(__name__)
 
-class AIService:
-    def __init__(self):
+# Generic advice shown when the provider fails
+FALLBACK_SUGGESTIONS = [
+    "Break down your goals into smaller, manageable tasks",
+    "Track your progress regularly",
+    "Stay consistent with your efforts"
+]
+
+_client = None
+
+def get_ai_client() -> "AsyncGroq":
+    """Return the process-wide Groq client, creating it on first use.
+
+    The client owns an HTTP connection pool, so sharing it lets requests
+    reuse warm provider connections instead of opening new ones. The SDK
+    is imported here rather than at module load: it is the slowest import
+    in the app and only AI requests need it.
+    """
+    global _client
+    if _client is None:
         try:
-            self.client = AsyncGroq(
+            from groq import AsyncGroq
+            _client = AsyncGroq(
                 api_key=settings.GROQ_API_KEY,
+                base_url=settings.GROQ_BASE_URL or None,
                 timeout=30.0
             )
         except Exception as e:
             logger.error(f"Failed to initialize Groq client: {str(e)}")
             raise
+    return _client
 
-    def _calculate_days_remaining(self, target_date: str) -> str:
-        """Helper method to safely calculate days remaining until target date."""
-        try:
-            if not target_date:
-                return "unknown"
-            target = datetime.fromisoformat(target_date.rstrip('Z'))
-            current = datetime.now()
-            days = (target - current).days
-            return str(days) if days >= 0 else "overdue"
-        except Exception as e:
-            logger.error(f"Error calculating days remaining: {str(e)}")
-            return "unknown"
-
-    async def get_personalized_suggestions(self, goals: List[Dict[str, Any]]) -> List[str]:
-        """Generate personalized AI suggestions based on user's goals and context."""
-        try:
-            if not goals:
-                return [
-                    "Start by creating your first SMART goal - make it Specific, Measurable, Achievable, Relevant, and Time-bound",
-                    "Think about what you want to achieve in different areas of your life: Health, Career, Personal Development",
-                    "Consider breaking down your future goals into smaller, manageable milestones"
-                ]
+# A reply that fails validation gets this many corrective follow-ups
+MAX_REPAIR_ATTEMPTS = 1
 
-            # Format goals for the prompt
-            goals_text = "\n\n".join([
-                f"Goal {i+1}:\n"
-                f"Category: {goal.get('category', 'Unknown')}\n"
-                f"Description: {goal.get('description', 'No description')}\n"
-                f"Progress: {goal.get('progress', 0)}%\n"
-                f"Target Date: {goal.get('target_date', 'No date')}"
-                for i, goal in enumerate(goals)
-            ])
+CHARS_PER_TOKEN = 4
+MAX_GOAL_DESCRIPTION_TOKENS = 60
 
-            prompt = f"""As an AI goal coach, analyze these goals and provide 3 specific, actionable suggestions:
+SUGGESTIONS_PROMPT = """As an AI goal coach, analyze these goals and provide 3 specific, actionable suggestions:
 
 {goals_text}
 
@@ -74,21 +69,221 @@ Example format:
 
 Avoid generic advice. Make sure each suggestion references specific goals and details."""
 
+PROGRESS_PROMPT = """Analyze this progress update for the goal:
+            Goal: {goal_description}
+            Update: {update_text}
+
+            Provide:
+            1. A percentage (0-100) estimating goal completion
+            2. A brief analysis of the progress
+
+            Return as JSON:
+            {{
+                "percentage": <number 0-100>,
+                "analysis": "<brief explanation>"
+            }}
+            """
+
+REPAIR_PROMPT = """Your reply could not be used: {error}
+Reply with only the JSON object, no other text:
+{{"percentage": <number 0-100>, "analysis": "<brief explanation>"}}"""
+
+class ProgressAnalysis(BaseModel):
+    """Shape a progress analysis reply must have."""
+    percentage: float
+    analysis: str
+
+    @field_validator("percentage")
+    @classmethod
+    def clamp_percentage(cls, value: float) -> float:
+        return max(0.0, min(100.0, value))
+
+    @field_validator("analysis")
+    @classmethod
+    def analysis_not_empty(cls, value: str) -> str:
+        if not value.strip():
+            raise ValueError("analysis is empty")
+        return value.strip()
+
+def _json_object(text: str) -> str:
+    """The outermost {...} of a reply, dropping code fences or chatter around it."""
+    start, end = text.find("{"), text.rfind("}")
+    return text[start:end + 1] if 0 <= start < end else text
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (about 4 characters per token for English)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Shorten text to roughly ``max_tokens``, keeping its start and end."""
+    max_chars = max(0, max_tokens) * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    marker = " [...] "
+    if max_chars <= len(marker):
+        return text[:max_chars]
+    head = (max_chars - len(marker)) * 2 // 3
+    tail = max_chars - len(marker) - head
+    return text[:head] + marker + (text[-tail:] if tail else "")
+
+def _days_until(value: Any) -> Optional[int]:
+    try:
+        if not value:
+            return None
+        return (datetime.fromisoformat(str(value).rstrip('Z')) - datetime.now()).days
+    except ValueError:
+        return None
+
+class PromptBuilder:
+    """Builds provider prompts that fit a token budget.
+
+    Prompt size, and with it provider latency, stays bounded however many
+    goals or how much update text an account has.
+    """
+
+    def __init__(self, budget: int):
+        self.budget = budget
+
+    def urgency(self, goal: Dict[str, Any]) -> float:
+        """Higher for goals that are due soon, far from done or recently active."""
+        days_left = _days_until(goal.get('target_date'))
+        if days_left is None:
+            time_pressure = 0.0
+        elif days_left < 0:
+            time_pressure = 1.5
+        else:
+            time_pressure = 1.0 / (1.0 + days_left / 7.0)
+
+        try:
+            progress = min(100.0, max(0.0, float(goal.get('progress') or 0)))
+        except (TypeError, ValueError):
+            progress = 0.0
+        if progress >= 100:
+            return 0.0
+
+        days_idle = _days_until(goal.get('last_update_at'))
+        recency = 0.0 if days_idle is None else 1.0 / (1.0 + abs(days_idle) / 7.0)
+
+        return 2.0 * time_pressure + (100.0 - progress) / 100.0 + 0.5 * recency
+
+    def _format_goal(self, number: int, goal: Dict[str, Any]) -> str:
+        description = truncate_to_tokens(
+            str(goal.get('description', 'No description')), MAX_GOAL_DESCRIPTION_TOKENS
+        )
+        return (
+            f"Goal {number}:\n"
+            f"Category: {goal.get('category', 'Unknown')}\n"
+            f"Description: {description}\n"
+            f"Progress: {goal.get('progress', 0)}%\n"
+            f"Target Date: {goal.get('target_date', 'No date')}"
+        )
+
+    def build_suggestions_prompt(self, goals: List[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+        """Include the most urgent goals that fit; summarize the rest in one line."""
+        ranked = sorted(goals, key=self.urgency, reverse=True)
+        available = self.budget - estimate_tokens(SUGGESTIONS_PROMPT.format(goals_text=""))
+
+        sections: List[str] = []
+        for goal in ranked:
+            section = self._format_goal(len(sections) + 1, goal)
+            # Always keep at least one goal, even on a very small budget
+            if sections and estimate_tokens(section) + 1 > available:
+                break
+            sections.append(section)
+            available -= estimate_tokens(section) + 1
+
+        omitted = ranked[len(sections):]
+        if omitted:
+            categories: Dict[str, int] = {}
+            for goal in omitted:
+                category = str(goal.get('category', 'Unknown'))
+                categories[category] = categories.get(category, 0) + 1
+            summary = ", ".join(f"{name} x{count}" for name, count in categories.items())
+            sections.append(truncate_to_tokens(
+                f"Plus {len(omitted)} less urgent goals ({summary}).", max(available, 16)
+            ))
+
+        prompt = SUGGESTIONS_PROMPT.format(goals_text="\n\n".join(sections))
+        return prompt, {
+            "prompt_tokens": estimate_tokens(prompt),
+            "goals_total": len(goals),
+            "goals_included": len(goals) - len(omitted),
+            "truncated": bool(omitted)
+        }
+
+    def build_progress_prompt(self, update_text: str, goal_description: str) -> Tuple[str, Dict[str, Any]]:
+        """Truncate the goal and update text so the whole prompt fits the budget."""
+        goal_description = truncate_to_tokens(goal_description, MAX_GOAL_DESCRIPTION_TOKENS)
+        available = self.budget - estimate_tokens(
+            PROGRESS_PROMPT.format(goal_description=goal_description, update_text="")
+        )
+        truncated = truncate_to_tokens(update_text, available)
+
+        prompt = PROGRESS_PROMPT.format(goal_description=goal_description, update_text=truncated)
+        return prompt, {
+            "prompt_tokens": estimate_tokens(prompt),
+            "truncated": truncated != update_text
+        }
+
+class AIService:
+    def __init__(self):
+        self.client = get_ai_client()
+
+    def _calculate_days_remaining(self, target_date: str) -> str:
+        """Helper method to safely calculate days remaining until target date."""
+        try:
+            if not target_date:
+                return "unknown"
+            target = datetime.fromisoformat(target_date.rstrip('Z'))
+            current = datetime.now()
+            days = (target - current).days
+            return str(days) if days >= 0 else "overdue"
+        except Exception as e:
+            logger.error(f"Error calculating days remaining: {str(e)}")
+            return "unknown"
+
+    async def _complete(self, profile: GenerationProfile, messages: List[Dict[str, str]]) -> str:
+        """Run one chat completion with the task's model, token cap and temperature."""
+        options: Dict[str, Any] = {}
+        if profile.json_mode:
+            options["response_format"] = {"type": "json_object"}
+        chat_completion = await self.client.chat.completions.create(
+            model=profile.model,
+            messages=messages,
+            temperature=profile.temperature,
+            max_tokens=profile.max_tokens,
+            top_p=1,
+            stream=False,
+            **options
+        )
+        return (chat_completion.choices[0].message.content or "").strip()
+
+    async def get_personalized_suggestions(self, goals: List[Dict[str, Any]], fallback: bool = True) -> List[str]:
+        """Generate personalized AI suggestions based on user's goals and context.
+
+        Provider errors return FALLBACK_SUGGESTIONS, or raise when
+        ``fallback`` is off so callers can tell them from real suggestions.
+        """
+        try:
+            if not goals:
+                return [
+                    "Start by creating your first SMART goal - make it Specific, Measurable, Achievable, Relevant, and Time-bound",
+                    "Think about what you want to achieve in different areas of your life: Health, Career, Personal Development",
+                    "Consider breaking down your future goals into smaller, manageable milestones"
+                ]
+
+            prompt, stats = PromptBuilder(settings.AI_SUGGESTIONS_TOKEN_BUDGET).build_suggestions_prompt(goals)
+            logger.info(
+                f"Suggestions prompt: ~{stats['prompt_tokens']} tokens, "
+                f"{stats['goals_included']} of {stats['goals_total']} goals"
+            )
+
             # Get AI response
-            chat_completion = await self.client.chat.completions.create(
-                model="mixtral-8x7b-32768",
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }],
-                temperature=0.7,
-                max_tokens=1024,
-                top_p=1,
-                stream=False
+            response_text = await self._complete(
+                settings.ai_profile("suggestions"),
+                [{"role": "user", "content": prompt}]
             )
             
-            response_text = chat_completion.choices[0].message.content.strip()
-            
             # Process the response into separate suggestions
             raw_suggestions = [
                 line.strip()
@@ -116,87 +311,92 @@ Avoid generic advice. Make sure each suggestion references specific goals and de
         except Exception as e:
             logger.error(f"Error in get_personalized_suggestions: {str(e)}")
             logger.error(f"Goals data: {goals}")  # Add logging
-            return [
-                "Break down your goals into smaller, manageable tasks",
-                "Track your progress regularly",
-                "Stay consistent with your efforts"
-            ]
+            if not fallback:
+                raise
+            return list(FALLBACK_SUGGESTIONS)
 
-    async def analyze_progress(self, update_text: str, goal_description: str) -> dict:
+    async def analyze_progress(self, update_text: str, goal_description: str, memo=None) -> dict:
         """
         Analyzes progress update text and returns progress percentage and analysis.
         
         Args:
             update_text: The update text to analyze
             goal_description: Context about the goal
+            memo: Optional AnalysisMemoService; a stored analysis of the same
+                normalized inputs is returned without calling the provider
             
         Returns:
-            dict: Contains progress percentage and analysis
+            dict: Contains progress percentage and analysis; ``fallback`` is
+            set when the provider failed and the values are placeholders
         """
+        profile = settings.ai_profile("progress_analysis")
+        key = None
+        if memo is not None:
+            from services.analysis_memo import memo_key
+            key = memo_key(
+                profile.model, PROGRESS_PROMPT, settings.AI_PROGRESS_TOKEN_BUDGET, goal_description, update_text
+            )
+            cached = await memo.get(key)
+            if cached is not None:
+                logger.info("Progress analysis served from memo")
+                return cached
+
         try:
-            prompt = f"""Analyze this progress update for the goal:
-            Goal: {goal_description}
-            Update: {update_text}
+            prompt, stats = PromptBuilder(settings.AI_PROGRESS_TOKEN_BUDGET).build_progress_prompt(
+                update_text, goal_description
+            )
+            logger.info(
+                f"Progress analysis prompt: ~{stats['prompt_tokens']} tokens"
+                f"{' (update truncated)' if stats['truncated'] else ''}"
+            )
 
-            Provide:
-            1. A percentage (0-100) estimating goal completion
-            2. A brief analysis of the progress
+            messages = [{"role": "user", "content": prompt}]
+            response_text = await self._complete(profile, messages)
 
-            Return as JSON:
-            {{
-                "percentage": <number 0-100>,
-                "analysis": "<brief explanation>"
-            }}
-            """
+            attempt = 0
+            while True:
+                try:
+                    parsed = ProgressAnalysis.model_validate_json(_json_object(response_text))
+                    result = {"percentage": parsed.percentage, "analysis": parsed.analysis}
+                    break
+                except ValidationError as e:
+                    if attempt >= MAX_REPAIR_ATTEMPTS:
+                        logger.error(f"Error parsing AI response: {str(e)}")
+                        return {
+                            "percentage": 0,
+                            "analysis": "Unable to analyze progress",
+                            "fallback": True
+                        }
+                    attempt += 1
+                    # Show the model its own reply and what was wrong with it
+                    error = e.errors()[0]["msg"] if e.errors() else str(e)
+                    logger.warning(f"Repairing AI response: {error}")
+                    messages = messages + [
+                        {"role": "assistant", "content": response_text},
+                        {"role": "user", "content": REPAIR_PROMPT.format(error=error)}
+                    ]
+                    response_text = await self._complete(profile, messages)
 
-            chat_completion = await self.client.chat.completions.create(
-                model="mixtral-8x7b-32768",
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }],
-                temperature=0.7,
-                max_tokens=1024,
-                top_p=1,
-                stream=False
-            )
-            
-            response_text = chat_completion.choices[0].message.content.strip()
-            
-            try:
-                result = json.loads(response_text)
-                result['percentage'] = max(0, min(100, float(result['percentage'])))
-                return result
-            except (json.JSONDecodeError, KeyError, ValueError) as e:
-                logger.error(f"Error parsing AI response: {str(e)}")
-                return {
-                    "percentage": 0,
-                    "analysis": "Unable to analyze progress"
-                }
-                
         except Exception as e:
             logger.error(f"AI analysis error: {str(e)}")
             return {
                 "percentage": 0,
-                "analysis": "Error analyzing progress"
+                "analysis": "Error analyzing progress",
+                "fallback": True
             }
+
+        # Only real analyses are memoized; a failure is retried next time
+        if key is not None:
+            await memo.put(key, profile.model, result)
+        return result
         
     async def analyze_data(self, prompt: str) -> str:
         try:
-            chat_completion = await self.client.chat.completions.create(
-                model="mixtral-8x7b-32768",
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }],
-                temperature=0.7,
-                max_tokens=1000,
-                top_p=1,
-                stream=False
+            return await self._complete(
+                settings.ai_profile("data_analysis"),
+                [{"role": "user", "content": prompt}]
             )
             
-            return chat_completion.choices[0].message.content.strip()
-            
         except Exception as e:
             logger.error(f"AI service error: {str(e)}")
             raise
\ No newline at end of file
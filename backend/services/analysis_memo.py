@@ -0,0 +1,93 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.dialects import postgresql, sqlite
+from models import AnalysisMemo
+from core.config import settings
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+import hashlib
+import random
+import unicodedata
+import logging
+
+logger = logging.getLogger(__name__)
+
+# last_used_at only needs to be roughly right for eviction, so a hit
+# rewrites it at most this often and usually costs just the lookup
+TOUCH_INTERVAL = timedelta(hours=1)
+# Share of writes that check the table size and evict
+EVICTION_PROBABILITY = 0.02
+EVICTION_BATCH_SIZE = 1000
+
+def normalize_text(text: str) -> str:
+    """Case, Unicode form and whitespace differences do not change an analysis."""
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+def memo_key(model: str, prompt_template: str, token_budget: int, goal_description: str, update_text: str) -> str:
+    """Content address of one analysis.
+
+    The prompt template and the token budget it is truncated to are part
+    of the key, so editing the prompt, changing the budget or switching
+    models starts a fresh memo instead of serving analyses produced from
+    a different prompt.
+    """
+    parts = [
+        model,
+        hashlib.sha256(prompt_template.encode()).hexdigest(),
+        str(token_budget),
+        normalize_text(goal_description),
+        normalize_text(update_text),
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+class AnalysisMemoService:
+    """Database memo of progress analyses shared by every worker and deploy."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def _insert(self):
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            return postgresql.insert(AnalysisMemo)
+        if dialect == "sqlite":
+            return sqlite.insert(AnalysisMemo)
+        raise NotImplementedError(f"Analysis memo is not supported on {dialect}")
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = await self.db.get(AnalysisMemo, key)
+        if entry is None:
+            return None
+
+        now = datetime.utcnow()
+        if entry.last_used_at is None or now - entry.last_used_at > TOUCH_INTERVAL:
+            await self.db.execute(
+                update(AnalysisMemo).where(AnalysisMemo.key == key).values(last_used_at=now)
+            )
+        return {"percentage": entry.percentage, "analysis": entry.analysis}
+
+    async def put(self, key: str, model: str, result: Dict[str, Any]) -> None:
+        await self.db.execute(
+            self._insert().values(
+                key=key,
+                model=model,
+                percentage=result["percentage"],
+                analysis=result["analysis"]
+            ).on_conflict_do_nothing(index_elements=["key"])
+        )
+        if random.random() < EVICTION_PROBABILITY:
+            await self.evict()
+
+    async def evict(self) -> int:
+        """Drop the least recently used entries above AI_MEMO_MAX_ENTRIES, one batch at a time."""
+        size = await self.db.scalar(select(func.count()).select_from(AnalysisMemo))
+        excess = min(size - settings.AI_MEMO_MAX_ENTRIES, EVICTION_BATCH_SIZE)
+        if excess <= 0:
+            return 0
+        oldest = select(AnalysisMemo.key).order_by(AnalysisMemo.last_used_at).limit(excess).scalar_subquery()
+        result = await self.db.execute(
+            delete(AnalysisMemo).where(AnalysisMemo.key.in_(oldest)),
+            execution_options={"synchronize_session": False}
+        )
+        logger.info(f"Evicted {result.rowcount} analysis memo entries")
+        return result.rowcount
@@ -0,0 +1,203 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List
+from models import Goal, ProgressUpdate
+from core.cache import get_cache
+from services.archive import SERIES_DTYPE
+from services.history import ProgressHistoryService
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400.0
+# Projections further out than this are reported as "never": a nearly
+# flat line would otherwise land centuries (or past date.max) away
+PROJECTION_HORIZON_DAYS = 365.0 * 10
+
+def _cache_key(user_id: int) -> str:
+    return f"analytics:{user_id}"
+
+async def invalidate_user_analytics(user_id: int) -> None:
+    """Drop cached analytics; call after every progress or goal write."""
+    await get_cache().invalidate(_cache_key(user_id))
+
+def _normal_cdf(x: np.ndarray) -> np.ndarray:
+    """Logistic approximation of the standard normal CDF (max error < 0.01)."""
+    # Clipped so extreme z-scores saturate at 0/1 instead of overflowing exp
+    return 1.0 / (1.0 + np.exp(-1.702 * np.clip(x, -50.0, 50.0)))
+
+def compute_goal_analytics(
+    goal_index: np.ndarray,
+    days: np.ndarray,
+    values: np.ndarray,
+    n_goals: int,
+    target_days: np.ndarray,
+    now_days: float
+) -> Dict[str, np.ndarray]:
+    """Fit a least-squares progress line per goal in one vectorized pass.
+
+    Args:
+        goal_index: Goal position (0..n_goals-1) of every sample, ascending
+        days: Sample timestamps in days, ascending within each goal
+        values: Progress percentage of every sample
+        n_goals: Number of goals
+        target_days: Target date of every goal in days
+        now_days: Current time in days
+
+    Returns:
+        dict: Per-goal arrays of velocity, latest value, projected completion
+        (days, NaN when never or beyond PROJECTION_HORIZON_DAYS) and
+        on-track probability
+    """
+    n = np.bincount(goal_index, minlength=n_goals).astype(float)
+
+    # Centre time per goal to keep the normal equations well conditioned
+    t_mean = np.bincount(goal_index, weights=days, minlength=n_goals) / n
+    t = days - t_mean[goal_index]
+    v_mean = np.bincount(goal_index, weights=values, minlength=n_goals) / n
+
+    sxx = np.bincount(goal_index, weights=t * t, minlength=n_goals)
+    sxy = np.bincount(goal_index, weights=t * (values - v_mean[goal_index]), minlength=n_goals)
+    has_spread = sxx > 0
+    slope = np.where(has_spread, sxy / np.where(has_spread, sxx, 1.0), 0.0)
+
+    residuals = values - (v_mean[goal_index] + slope[goal_index] * t)
+    ssr = np.bincount(goal_index, weights=residuals * residuals, minlength=n_goals)
+    dof = n - 2
+    slope_se = np.where(
+        has_spread & (dof > 0),
+        np.sqrt(ssr / np.where(dof > 0, dof, 1.0) / np.where(has_spread, sxx, 1.0)),
+        np.nan
+    )
+
+    # Samples are sorted per goal, so the last sample of each goal is the latest
+    last_positions = np.cumsum(n).astype(int) - 1
+    latest = values[last_positions]
+    last_days = days[last_positions]
+
+    remaining = np.clip(100.0 - latest, 0.0, None)
+    done = remaining <= 0
+    moving = slope > 0
+    projected = np.where(
+        done,
+        last_days,
+        np.where(moving, last_days + remaining / np.where(moving, slope, 1.0), np.nan)
+    )
+    # NaN and inf fail the comparison too
+    projected = np.where(projected - now_days <= PROJECTION_HORIZON_DAYS, projected, np.nan)
+
+    days_left = target_days - now_days
+    required = np.where(days_left > 0, remaining / np.where(days_left > 0, days_left, 1.0), np.inf)
+    z = (slope - required) / np.where(slope_se > 0, slope_se, np.nan)
+    # Without enough samples for an error estimate, fall back to a hard decision
+    fallback = np.where(slope >= required, 1.0, 0.0)
+    probability = np.where(np.isfinite(z), _normal_cdf(np.nan_to_num(z)), fallback)
+    probability = np.where(done, 1.0, np.where(days_left > 0, probability, 0.0))
+
+    return {
+        "velocity": slope,
+        "latest": latest,
+        "projected": projected,
+        "probability": probability,
+        "samples": n - 1
+    }
+
+def _to_days(values: np.ndarray) -> np.ndarray:
+    return values.astype("datetime64[s]").astype(np.int64) / SECONDS_PER_DAY
+
+class AnalyticsService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_user_analytics(self, user_id: int) -> List[Dict[str, Any]]:
+        cache = get_cache()
+        cached = await cache.get(_cache_key(user_id))
+        if cached is not None:
+            return cached
+
+        analytics = await self._compute(user_id)
+        await cache.set(_cache_key(user_id), analytics)
+        return analytics
+
+    async def _compute(self, user_id: int) -> List[Dict[str, Any]]:
+        goals_result = await self.db.execute(
+            select(
+                Goal.id, Goal.category, Goal.description, Goal.target_date, Goal.created_at
+            ).filter(Goal.user_id == user_id).order_by(Goal.id)
+        )
+        goals = goals_result.all()
+        if not goals:
+            return []
+
+        updates_result = await self.db.execute(
+            select(
+                ProgressUpdate.goal_id, ProgressUpdate.created_at, ProgressUpdate.progress_value
+            ).join(Goal, Goal.id == ProgressUpdate.goal_id).filter(
+                Goal.user_id == user_id
+            ).order_by(ProgressUpdate.goal_id, ProgressUpdate.created_at)
+        )
+        updates = updates_result.all()
+
+        goal_ids = np.array([goal.id for goal in goals], dtype=np.int64)
+        created = _to_days(np.array([goal.created_at for goal in goals], dtype="datetime64[s]"))
+        targets = _to_days(np.array(
+            [datetime.combine(goal.target_date, datetime.min.time()) for goal in goals],
+            dtype="datetime64[s]"
+        ))
+
+        if updates:
+            update_goal_ids, update_times, update_values = zip(*updates)
+            update_index = np.searchsorted(goal_ids, np.array(update_goal_ids, dtype=np.int64))
+            update_days = _to_days(np.array(update_times, dtype="datetime64[s]"))
+            update_values = np.nan_to_num(np.array(update_values, dtype=float))
+        else:
+            update_index = np.empty(0, dtype=np.int64)
+            update_days = np.empty(0)
+            update_values = np.empty(0)
+
+        # Archived updates arrive as packed series; decode them without
+        # touching their compressed texts
+        archived = await ProgressHistoryService(self.db).archived_series(user_id)
+        if archived:
+            chunks = [np.frombuffer(series, dtype=SERIES_DTYPE) for _, series in archived]
+            archived_goal_ids = np.repeat(
+                np.array([goal_id for goal_id, _ in archived], dtype=np.int64), [len(chunk) for chunk in chunks]
+            )
+            points = np.concatenate(chunks)
+            update_index = np.concatenate([update_index, np.searchsorted(goal_ids, archived_goal_ids)])
+            update_days = np.concatenate([update_days, points["t"] / SECONDS_PER_DAY])
+            update_values = np.concatenate([update_values, points["v"].astype(float)])
+
+        # Every goal starts at 0% when it is created; this also gives goals
+        # without updates a sample. A stable sort keeps the origin first.
+        goal_index = np.concatenate([np.arange(len(goals)), update_index])
+        days = np.concatenate([created, update_days])
+        values = np.concatenate([np.zeros(len(goals)), update_values])
+        order = np.lexsort((days, goal_index))
+
+        now_days = _to_days(np.array([datetime.utcnow()], dtype="datetime64[s]"))[0]
+        result = compute_goal_analytics(
+            goal_index[order], days[order], values[order], len(goals), targets, now_days
+        )
+
+        epoch = date(1970, 1, 1)
+        analytics = []
+        for i, goal in enumerate(goals):
+            projected = result["projected"][i]
+            projected_date = None
+            if np.isfinite(projected):
+                projected_date = (epoch + timedelta(days=int(np.floor(projected)))).isoformat()
+            analytics.append({
+                "goal_id": goal.id,
+                "category": goal.category,
+                "description": goal.description,
+                "target_date": goal.target_date.isoformat(),
+                "current_progress": round(float(result["latest"][i]), 2),
+                "velocity_per_day": round(float(result["velocity"][i]), 4),
+                "projected_completion_date": projected_date,
+                "on_track_probability": round(float(result["probability"][i]), 3),
+                "updates": int(result["samples"][i])
+            })
+        return analytics
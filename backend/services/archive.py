@@ -0,0 +1,150 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete
+from models import ProgressArchive, ProgressUpdate
+from core.config import settings
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import json
+import struct
+import zlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1)
+# One point per archived update: epoch seconds (float64), progress (float32)
+POINT = struct.Struct("<df")
+# The same layout as a NumPy structured dtype, for np.frombuffer
+SERIES_DTYPE = [("t", "<f8"), ("v", "<f4")]
+COMPRESSION_LEVEL = 9
+
+def pack_series(points: Iterable[Tuple[datetime, float]]) -> bytes:
+    return b"".join(
+        POINT.pack((created_at - EPOCH).total_seconds(), float(value or 0))
+        for created_at, value in points
+    )
+
+def unpack_series(blob: bytes) -> List[Tuple[datetime, float]]:
+    return [(EPOCH + timedelta(seconds=seconds), value) for seconds, value in POINT.iter_unpack(blob)]
+
+def pack_updates(updates: List[ProgressUpdate]) -> bytes:
+    rows = [
+        [update.id, update.update_text, update.progress_value, update.analysis, update.created_at.isoformat()]
+        for update in updates
+    ]
+    return zlib.compress(json.dumps(rows, separators=(",", ":")).encode(), COMPRESSION_LEVEL)
+
+def unpack_updates(blob: bytes) -> List[Dict[str, Any]]:
+    """Archived updates in the shape the progress endpoints return."""
+    return [
+        {"id": update_id, "text": text, "progress": progress, "analysis": analysis, "created_at": created_at}
+        for update_id, text, progress, analysis, created_at in json.loads(zlib.decompress(blob))
+    ]
+
+class ProgressArchiveService:
+    """Moves old progress updates into compressed per-goal archive rows.
+
+    Updates older than the cutoff leave progress_updates, except each
+    goal's latest update, which the goal list and suggestions read on
+    every request. They are stored in chunks of up to
+    PROGRESS_ARCHIVE_CHUNK_SIZE updates: texts and analyses compressed
+    together, plus a packed (time, value) series so charts and analytics
+    never decompress the texts. Each chunk is inserted and its source
+    rows deleted in one transaction, so an interrupted run simply
+    continues on the next one. Daily rollups are left as they are.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _goal_batch(self, cutoff: datetime, after_id: int) -> List[int]:
+        result = await self.db.execute(
+            select(ProgressUpdate.goal_id).filter(
+                ProgressUpdate.created_at < cutoff, ProgressUpdate.goal_id > after_id
+            ).group_by(ProgressUpdate.goal_id).order_by(
+                ProgressUpdate.goal_id
+            ).limit(settings.PROGRESS_ARCHIVE_CHUNK_SIZE)
+        )
+        return list(result.scalars().all())
+
+    async def _archivable(self, goal_id: int, cutoff: datetime) -> List[ProgressUpdate]:
+        latest = select(ProgressUpdate.id).filter(
+            ProgressUpdate.goal_id == goal_id
+        ).order_by(ProgressUpdate.created_at.desc(), ProgressUpdate.id.desc()).limit(1).scalar_subquery()
+        result = await self.db.execute(
+            select(ProgressUpdate).filter(
+                ProgressUpdate.goal_id == goal_id,
+                ProgressUpdate.created_at < cutoff,
+                ProgressUpdate.id != latest
+            ).order_by(ProgressUpdate.created_at, ProgressUpdate.id).limit(settings.PROGRESS_ARCHIVE_CHUNK_SIZE)
+        )
+        return list(result.scalars().all())
+
+    async def archive_goal(self, goal_id: int, cutoff: datetime) -> int:
+        """Archive one goal's updates older than ``cutoff``; returns how many moved."""
+        moved = 0
+        while True:
+            updates = await self._archivable(goal_id, cutoff)
+            if not updates:
+                return moved
+            update_ids = [update.id for update in updates]
+            self.db.add(ProgressArchive(
+                goal_id=goal_id,
+                first_at=updates[0].created_at,
+                last_at=updates[-1].created_at,
+                update_count=len(updates),
+                series=pack_series((update.created_at, update.progress_value) for update in updates),
+                payload=pack_updates(updates)
+            ))
+            result = await self.db.execute(
+                # The time bound lets a partitioned table skip recent partitions
+                delete(ProgressUpdate).where(
+                    ProgressUpdate.id.in_(update_ids), ProgressUpdate.created_at < cutoff
+                ),
+                execution_options={"synchronize_session": False}
+            )
+            if result.rowcount != len(update_ids):
+                # A concurrent run took some of these rows; keep its copy
+                await self.db.rollback()
+                logger.warning(f"Archive of goal {goal_id} raced another run, skipping it")
+                return moved
+            await self.db.commit()
+            self.db.expunge_all()
+            moved += len(updates)
+            if len(updates) < settings.PROGRESS_ARCHIVE_CHUNK_SIZE:
+                return moved
+            await asyncio.sleep(settings.PROGRESS_ARCHIVE_PAUSE_SECONDS)
+
+    async def run(self, cutoff: datetime) -> int:
+        """Archive every goal's updates older than ``cutoff``; returns how many moved."""
+        moved = 0
+        after_id = 0
+        while True:
+            goal_ids = await self._goal_batch(cutoff, after_id)
+            if not goal_ids:
+                break
+            for goal_id in goal_ids:
+                moved += await self.archive_goal(goal_id, cutoff)
+            after_id = goal_ids[-1]
+            await asyncio.sleep(settings.PROGRESS_ARCHIVE_PAUSE_SECONDS)
+        logger.info(f"Archived {moved} progress updates older than {cutoff.isoformat()}")
+        return moved
+
+async def run_archive(older_than_days: Optional[int] = None) -> int:
+    """Archive updates older than ``older_than_days`` (default PROGRESS_ARCHIVE_AFTER_DAYS)."""
+    from database import AsyncSessionLocal
+    days = older_than_days if older_than_days is not None else settings.PROGRESS_ARCHIVE_AFTER_DAYS
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    async with AsyncSessionLocal() as session:
+        return await ProgressArchiveService(session).run(cutoff)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Move old progress updates into the compressed archive")
+    parser.add_argument("--older-than-days", type=int, default=None,
+                        help="Defaults to PROGRESS_ARCHIVE_AFTER_DAYS")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    print(f"Archived {asyncio.run(run_archive(args.older_than_days))} progress updates")
@@ -0,0 +1,180 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Goal, ProgressUpdate, User
+from services.ai import AIService, FALLBACK_SUGGESTIONS
+from services.goals import GoalService
+from core.cache import get_cache
+from core.config import settings
+from core.exceptions import RateLimitException
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+STARTER_SUGGESTIONS = [
+    "Start by creating your first SMART goal - make it Specific, Measurable, Achievable, Relevant, and Time-bound",
+    "Think about what you want to achieve in different areas of your life: Health, Career, Personal Development",
+    "Consider breaking down your future goals into smaller, manageable milestones"
+]
+
+def format_goal(goal: Goal, latest_progress: Optional[ProgressUpdate]) -> Dict[str, Any]:
+    return {
+        "id": goal.id,
+        "category": goal.category,
+        "description": goal.description,
+        "target_date": goal.target_date.isoformat(),
+        "created_at": goal.created_at.isoformat(),
+        "progress": latest_progress.progress_value if latest_progress else 0
+    }
+
+def suggestion_inputs(goals: List[Tuple[Goal, Optional[ProgressUpdate]]]) -> List[Dict[str, Any]]:
+    """The goal fields the suggestions prompt is built from."""
+    formatted = []
+    for goal, latest_progress in goals:
+        try:
+            # Ensure progress_value is a valid number
+            progress_value = 0
+            if latest_progress and hasattr(latest_progress, 'progress_value'):
+                try:
+                    progress_value = float(latest_progress.progress_value)
+                    if not (0 <= progress_value <= 100):
+                        progress_value = 0
+                except (TypeError, ValueError):
+                    progress_value = 0
+
+            formatted.append({
+                "category": goal.category,
+                "description": goal.description,
+                "target_date": goal.target_date.isoformat() if goal.target_date else None,
+                "progress": progress_value,
+                "created_at": goal.created_at.isoformat() if goal.created_at else None,
+                "last_update_at": latest_progress.created_at.isoformat() if latest_progress else None
+            })
+        except Exception as e:
+            logger.error(f"Error formatting goal {goal.id}: {str(e)}")
+            continue  # Skip this goal if there's an error
+    return formatted
+
+def _suggestions_key(user_id: int) -> str:
+    return f"suggestions:{user_id}"
+
+def _fingerprint(inputs: List[Dict[str, Any]]) -> str:
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+async def cached_suggestions(user_id: int) -> Optional[Dict[str, Any]]:
+    """The last suggestions generated for the user, with the fingerprint of their inputs."""
+    return await get_cache().get(_suggestions_key(user_id))
+
+def fresh(entry: Optional[Dict[str, Any]], inputs: List[Dict[str, Any]]) -> Optional[List[str]]:
+    """Cached suggestions if they were generated from exactly these goals."""
+    if entry and entry.get("fingerprint") == _fingerprint(inputs):
+        return entry["suggestions"]
+    return None
+
+async def generate_suggestions(user_id: int, inputs: List[Dict[str, Any]]) -> List[str]:
+    """Ask the AI for suggestions and cache them.
+
+    Nothing has to invalidate the cache: once the goals or their progress
+    change, the fingerprint no longer matches and the next call generates
+    again. The fallback shown when the provider fails is not cached, so
+    the next load tries the provider again.
+    """
+    if not inputs:
+        return STARTER_SUGGESTIONS
+    try:
+        suggestions = await AIService().get_personalized_suggestions(inputs, fallback=False)
+    except Exception as e:
+        logger.error(f"Suggestion generation failed, serving the fallback: {str(e)}")
+        return list(FALLBACK_SUGGESTIONS)
+    await get_cache().set(
+        _suggestions_key(user_id),
+        {"fingerprint": _fingerprint(inputs), "suggestions": suggestions},
+        ttl=settings.SUGGESTIONS_CACHE_TTL_SECONDS
+    )
+    return suggestions
+
+# One generation per user and set of goals, however many loads ask for it;
+# strong references also keep shielded generations alive after a timeout
+_generations: Dict[Tuple[int, str], asyncio.Task] = {}
+
+def _forget(key: Tuple[int, str], task: asyncio.Task) -> None:
+    # A newer generation may already be registered under the same key
+    if _generations.get(key) is task:
+        del _generations[key]
+
+async def generation(
+    user_id: int,
+    inputs: List[Dict[str, Any]],
+    rate_limit: Optional[Callable[[], Awaitable[None]]]
+) -> asyncio.Task:
+    """The shared task generating suggestions for these goals, started if needed.
+
+    Callers await it (shielded if they may time out). Only a caller that
+    finds no generation running spends from ``rate_limit``, which raises
+    RateLimitException when the user has none left.
+    """
+    key = (user_id, _fingerprint(inputs))
+    task = _generations.get(key)
+    if task is not None:
+        return task
+    if rate_limit is not None:
+        await rate_limit()
+        # Another load may have started it while the limit was checked
+        task = _generations.get(key)
+        if task is not None:
+            return task
+    task = asyncio.create_task(generate_suggestions(user_id, inputs))
+    _generations[key] = task
+    task.add_done_callback(functools.partial(_forget, key))
+    return task
+
+class DashboardService:
+    """Everything the dashboard shows, in one request.
+
+    The goals query and the suggestions cache lookup run concurrently.
+    Suggestions that are not cached for the current goals are generated
+    inline up to DASHBOARD_SUGGESTIONS_TIMEOUT_SECONDS; past that, in
+    ``defer`` mode, or when the AI rate limit is spent, the response says
+    they are pending. A started generation finishes in the background,
+    so the next load (or the suggestions endpoint) finds it cached.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def build(
+        self,
+        user: User,
+        defer_suggestions: bool = False,
+        rate_limit: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
+        goals, entry = await asyncio.gather(
+            GoalService(self.db).get_user_goals_with_latest_progress(user.id),
+            cached_suggestions(user.id)
+        )
+        inputs = suggestion_inputs(goals)
+
+        suggestions = STARTER_SUGGESTIONS if not goals else fresh(entry, inputs)
+        if suggestions is None:
+            try:
+                generation_task = await generation(user.id, inputs, rate_limit)
+                if not defer_suggestions:
+                    suggestions = await asyncio.wait_for(
+                        asyncio.shield(generation_task), timeout=settings.DASHBOARD_SUGGESTIONS_TIMEOUT_SECONDS
+                    )
+            except RateLimitException:
+                logger.info(f"Dashboard suggestions for user {user.id} deferred by the rate limit")
+            except asyncio.TimeoutError:
+                logger.info(f"Dashboard suggestions for user {user.id} still generating")
+            except Exception as e:
+                logger.error(f"Dashboard suggestions failed: {str(e)}")
+
+        return {
+            "user": {"id": user.id, "username": user.username, "email": user.email},
+            "goals": [format_goal(goal, latest) for goal, latest in goals],
+            "suggestions": suggestions,
+            "suggestions_pending": suggestions is None
+        }
@@ -0,0 +1,31 @@
+from core.config import settings
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+SMTP_TIMEOUT_SECONDS = 30
+
+def _send(to_email: str, subject: str, body: str) -> None:
+    # Imported here: the mail modules are only needed once an email is sent
+    import smtplib
+    from email.mime.text import MIMEText
+
+    msg = MIMEText(body, "html")
+    msg["Subject"] = subject
+    msg["From"] = settings.SENDER_EMAIL or settings.SMTP_USERNAME
+    msg["To"] = to_email
+
+    with smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS) as server:
+        server.starttls()
+        server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+        server.send_message(msg)
+
+async def send_email(to_email: str, subject: str, body: str) -> None:
+    """Send an HTML email without blocking the event loop.
+
+    smtplib is synchronous, so the SMTP conversation runs in a worker
+    thread. Raises on failure; callers decide whether to retry.
+    """
+    await asyncio.to_thread(_send, to_email, subject, body)
+    logger.info(f"Email sent successfully to {to_email}")
@@ -1,8 +1,9 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from models import Goal
+from sqlalchemy import select, func, and_
+from sqlalchemy.orm import aliased
+from models import Goal, ProgressUpdate
 from schemas.goal import GoalCreate, GoalUpdate
-from typing import List
+from typing import List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -37,3 +38,28 @@ class GoalService:
         except Exception as e:
             logger.error(f"Error fetching goals: {str(e)}")
             raise
+
+    async def get_user_goals_with_latest_progress(
+        self, user_id: int
+    ) -> List[Tuple[Goal, Optional[ProgressUpdate]]]:
+        """Every goal of the user paired with its newest progress update, in one query."""
+        try:
+            ranked = select(
+                ProgressUpdate,
+                func.row_number().over(
+                    partition_by=ProgressUpdate.goal_id,
+                    order_by=(ProgressUpdate.created_at.desc(), ProgressUpdate.id.desc())
+                ).label("position")
+            ).join(Goal, Goal.id == ProgressUpdate.goal_id).filter(
+                Goal.user_id == user_id
+            ).subquery()
+            latest = aliased(ProgressUpdate, ranked)
+
+            query = select(Goal, latest).outerjoin(
+                ranked, and_(ranked.c.goal_id == Goal.id, ranked.c.position == 1)
+            ).filter(Goal.user_id == user_id).order_by(Goal.id)
+            result = await self.db.execute(query)
+            return [(goal, update) for goal, update in result.all()]
+        except Exception as e:
+            logger.error(f"Error fetching goals with progress: {str(e)}")
+            raise
@@ -0,0 +1,64 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from models import Goal, ProgressArchive, ProgressUpdate
+from services.archive import unpack_updates
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+class ProgressHistoryService:
+    """Reads progress history from progress_updates and the archive together.
+
+    Archived updates are all older than the archive cutoff and each goal
+    keeps its latest update hot, so every archived update precedes every
+    hot one and the two merge by concatenation, without sorting.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def updates(self, goal_id: int) -> List[Dict[str, Any]]:
+        """Every update of the goal, newest first."""
+        hot_result = await self.db.execute(
+            select(ProgressUpdate).filter(
+                ProgressUpdate.goal_id == goal_id
+            ).order_by(ProgressUpdate.created_at.desc())
+        )
+        updates = [{
+            "id": update.id,
+            "text": update.update_text,
+            "progress": update.progress_value,
+            "analysis": update.analysis,
+            "created_at": update.created_at.isoformat()
+        } for update in hot_result.scalars().all()]
+
+        archive_result = await self.db.execute(
+            select(ProgressArchive.payload).filter(
+                ProgressArchive.goal_id == goal_id
+            ).order_by(ProgressArchive.last_at.desc())
+        )
+        for payload in archive_result.scalars().all():
+            updates.extend(reversed(unpack_updates(payload)))
+        return updates
+
+    async def archived_series(self, user_id: int) -> List[Tuple[int, bytes]]:
+        """(goal_id, packed series) of every archive chunk of the user's goals, oldest first."""
+        result = await self.db.execute(
+            select(ProgressArchive.goal_id, ProgressArchive.series).join(
+                Goal, Goal.id == ProgressArchive.goal_id
+            ).filter(Goal.user_id == user_id).order_by(ProgressArchive.goal_id, ProgressArchive.first_at)
+        )
+        return [(goal_id, series) for goal_id, series in result.all()]
+
+    async def series(self, goal_id: int) -> Tuple[List[bytes], List[Tuple[datetime, float]]]:
+        """Packed archived series (oldest first), then hot (time, value) pairs ascending."""
+        archive_result = await self.db.execute(
+            select(ProgressArchive.series).filter(
+                ProgressArchive.goal_id == goal_id
+            ).order_by(ProgressArchive.first_at)
+        )
+        hot_result = await self.db.execute(
+            select(ProgressUpdate.created_at, ProgressUpdate.progress_value).filter(
+                ProgressUpdate.goal_id == goal_id
+            ).order_by(ProgressUpdate.created_at)
+        )
+        return list(archive_result.scalars().all()), [(created_at, value) for created_at, value in hot_result.all()]
@@ -0,0 +1,67 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import update, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from models import SchedulerCheckpoint
+from datetime import datetime, timedelta
+from typing import Optional
+import os
+import socket
+
+class JobLease:
+    """Lease on a background job's scheduler_checkpoints row.
+
+    Only the worker holding the lease runs the job. The holder renews it
+    as it makes progress; a lease that is not renewed within ``seconds``
+    expires, so a crashed worker's job is taken over by the next run.
+    """
+
+    def __init__(self, db: AsyncSession, name: str, seconds: float, owner: Optional[str] = None):
+        self.db = db
+        self.name = name
+        self.seconds = seconds
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+
+    def _insert(self):
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            return postgresql.insert(SchedulerCheckpoint)
+        if dialect == "sqlite":
+            return sqlite.insert(SchedulerCheckpoint)
+        raise NotImplementedError(f"Job leases are not supported on {dialect}")
+
+    async def acquire(self) -> bool:
+        await self.db.execute(
+            self._insert().values(name=self.name).on_conflict_do_nothing(index_elements=["name"])
+        )
+        now = datetime.utcnow()
+        result = await self.db.execute(
+            update(SchedulerCheckpoint).where(
+                SchedulerCheckpoint.name == self.name,
+                or_(
+                    SchedulerCheckpoint.lease_owner.is_(None),
+                    SchedulerCheckpoint.lease_owner == self.owner,
+                    SchedulerCheckpoint.lease_expires_at < now
+                )
+            ).values(lease_owner=self.owner, lease_expires_at=now + timedelta(seconds=self.seconds))
+        )
+        await self.db.commit()
+        return result.rowcount == 1
+
+    async def renew(self) -> bool:
+        """Extend the lease in the caller's transaction; False when another worker has taken it over."""
+        result = await self.db.execute(
+            update(SchedulerCheckpoint).where(
+                SchedulerCheckpoint.name == self.name,
+                SchedulerCheckpoint.lease_owner == self.owner
+            ).values(lease_expires_at=datetime.utcnow() + timedelta(seconds=self.seconds))
+        )
+        return result.rowcount == 1
+
+    async def release(self) -> None:
+        await self.db.execute(
+            update(SchedulerCheckpoint).where(
+                SchedulerCheckpoint.name == self.name,
+                SchedulerCheckpoint.lease_owner == self.owner
+            ).values(lease_owner=None, lease_expires_at=None)
+        )
+        await self.db.commit()
@@ -0,0 +1,198 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from models import PROGRESS_SEARCH_COLUMNS, search_document
+from core.config import settings
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+import asyncio
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+TABLE = "progress_updates"
+DEFAULT_PARTITION = f"{TABLE}_default"
+_PARTITION_NAME = re.compile(rf"^{TABLE}_p(\d{{4}})_(\d{{2}})$")
+
+# Rebuilt on the partitioned table after conversion; the names match
+# models.py and migrate.py, so later migrations find them
+_CONSTRAINTS = [
+    f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id, created_at)",
+    f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_goal_id_fkey "
+    "FOREIGN KEY (goal_id) REFERENCES goals (id) ON DELETE CASCADE",
+    f"CREATE INDEX ix_{TABLE}_id ON {TABLE} (id)",
+    f"CREATE INDEX ix_{TABLE}_goal_id ON {TABLE} (goal_id)",
+    f"CREATE INDEX ix_{TABLE}_goal_id_created_at ON {TABLE} (goal_id, created_at)",
+    f"CREATE INDEX ix_{TABLE}_fts ON {TABLE} USING gin ({search_document(PROGRESS_SEARCH_COLUMNS)})",
+]
+
+def month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_p{month.year:04d}_{month.month:02d}"
+
+def create_partition_sql(month: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+class PartitionService:
+    """Keeps progress_updates range-partitioned by month on Postgres.
+
+    Queries bounded on created_at (rollup catch-up, archival scans) only
+    read the partitions in range, and vacuum and index maintenance work
+    on one month at a time instead of the whole history. Partitions are
+    created PROGRESS_PARTITIONS_AHEAD months in advance; rows outside
+    every partition land in a default partition rather than fail. Months
+    older than the archive cutoff (PROGRESS_ARCHIVE_AFTER_DAYS) are
+    detached and dropped once services/archive.py has emptied them;
+    a month still holding a goal's latest update stays attached.
+
+    Ids still come from the one table-wide sequence, so they stay unique
+    across partitions and the archive and search keep using them.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _lock_timeout(self) -> None:
+        # DDL on the parent queues behind long reads; give up instead of
+        # blocking every request that queues behind the DDL in turn
+        await self.db.execute(text(
+            f"SET LOCAL lock_timeout = '{int(settings.PROGRESS_PARTITION_LOCK_TIMEOUT_SECONDS * 1000)}ms'"
+        ))
+
+    async def is_partitioned(self) -> Optional[bool]:
+        """Whether progress_updates is partitioned; None when it does not exist."""
+        # Compared in SQL: asyncpg returns the "char" relkind as bytes
+        return await self.db.scalar(text(
+            f"SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass('{TABLE}')"
+        ))
+
+    async def partitions(self) -> List[date]:
+        """Months that have a partition, ascending."""
+        result = await self.db.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            f"WHERE pg_inherits.inhparent = to_regclass('{TABLE}')"
+        ))
+        months = []
+        for name in result.scalars().all():
+            match = _PARTITION_NAME.match(name)
+            if match:
+                months.append(date(int(match.group(1)), int(match.group(2)), 1))
+        return sorted(months)
+
+    async def convert(self) -> None:
+        """Rebuild an existing unpartitioned progress_updates as a partitioned table.
+
+        Runs in one transaction holding an exclusive lock on the table, so
+        writes wait until the copy finishes: run it in a maintenance window.
+        """
+        await self._lock_timeout()
+        await self.db.execute(text(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE"))
+        sequence = await self.db.scalar(text(f"SELECT pg_get_serial_sequence('{TABLE}', 'id')"))
+        oldest = await self.db.scalar(text(f"SELECT min(created_at) FROM {TABLE}"))
+
+        old = f"{TABLE}_unpartitioned"
+        await self.db.execute(text(f"ALTER TABLE {TABLE} RENAME TO {old}"))
+        await self.db.execute(text(
+            f"CREATE TABLE {TABLE} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)"
+        ))
+        await self.db.execute(text(f"ALTER TABLE {TABLE} ALTER COLUMN created_at SET NOT NULL"))
+        # The sequence would be dropped with the table that owns it
+        await self.db.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {TABLE}.id"))
+
+        first = month_start(oldest.date()) if oldest else month_start(datetime.utcnow().date())
+        for month in self._months(first):
+            await self.db.execute(text(create_partition_sql(month)))
+        await self.db.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT"))
+
+        columns = "id, goal_id, update_text, progress_value, analysis"
+        await self.db.execute(text(
+            f"INSERT INTO {TABLE} ({columns}, created_at) "
+            f"SELECT {columns}, coalesce(created_at, now() AT TIME ZONE 'utc') FROM {old}"
+        ))
+        await self.db.execute(text(f"DROP TABLE {old}"))
+        # Indexes are built once over the copied rows, not maintained per insert
+        for statement in _CONSTRAINTS:
+            await self.db.execute(text(statement))
+        await self.db.commit()
+        logger.info(f"Partitioned {TABLE} by month from {first.isoformat()}")
+
+    def _months(self, first: date) -> List[date]:
+        last = add_months(month_start(datetime.utcnow().date()), settings.PROGRESS_PARTITIONS_AHEAD)
+        months = []
+        month = first
+        while month <= last:
+            months.append(month)
+            month = add_months(month, 1)
+        return months
+
+    async def create_ahead(self) -> List[str]:
+        """Create any missing partition from this month to PROGRESS_PARTITIONS_AHEAD months out."""
+        existing = set(await self.partitions())
+        created = []
+        for month in self._months(month_start(datetime.utcnow().date())):
+            if month in existing:
+                continue
+            await self._lock_timeout()
+            await self.db.execute(text(create_partition_sql(month)))
+            await self.db.commit()
+            created.append(partition_name(month))
+        await self._lock_timeout()
+        await self.db.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT"))
+        await self.db.commit()
+        return created
+
+    async def detach_archived(self, cutoff: datetime) -> List[str]:
+        """Detach and drop partitions that end before ``cutoff`` and hold no rows."""
+        detached = []
+        for month in await self.partitions():
+            if datetime.combine(add_months(month, 1), datetime.min.time()) > cutoff:
+                break
+            name = partition_name(month)
+            if await self.db.scalar(text(f"SELECT EXISTS (SELECT 1 FROM {name})")):
+                logger.info(f"Keeping {name}: it still holds the latest update of some goals")
+                continue
+            await self._lock_timeout()
+            await self.db.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+            await self.db.execute(text(f"DROP TABLE {name}"))
+            await self.db.commit()
+            detached.append(name)
+        return detached
+
+    async def maintain(self) -> List[str]:
+        """Convert the table if needed, create upcoming partitions and retire archived ones."""
+        state = await self.is_partitioned()
+        if state is None:
+            return []
+        actions = []
+        if not state:
+            await self.convert()
+            actions.append(f"{TABLE} partitioned")
+        actions.extend(f"created {name}" for name in await self.create_ahead())
+        cutoff = datetime.utcnow() - timedelta(days=settings.PROGRESS_ARCHIVE_AFTER_DAYS)
+        actions.extend(f"detached {name}" for name in await self.detach_archived(cutoff))
+        return actions
+
+async def run_maintenance() -> List[str]:
+    """Partition maintenance when PROGRESS_PARTITIONING is on and the database is Postgres."""
+    from database import AsyncSessionLocal, engine
+    if not settings.PROGRESS_PARTITIONING or engine.dialect.name != "postgresql":
+        return []
+    async with AsyncSessionLocal() as session:
+        actions = await PartitionService(session).maintain()
+    for action in actions:
+        logger.info(f"Partition maintenance: {action}")
+    return actions
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(f"Partition maintenance: {asyncio.run(run_maintenance()) or 'nothing to do'}")
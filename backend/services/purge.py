@@ -0,0 +1,140 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete
+from models import Goal, ProgressUpdate, User
+from core.config import settings
+from services.leases import JobLease
+from datetime import datetime
+from typing import List, Optional, Set
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+PURGE_JOB = "account_purge"
+
+class PurgeService:
+    """Deletes a soft-deleted account in short transactions.
+
+    Removing a large account with one DELETE would hold locks on every
+    child row until the cascade finishes. Instead progress updates go
+    first in batches of PURGE_BATCH_SIZE, then goals (whose remaining
+    children cascade in the database), then the user row. Each batch
+    commits on its own, so an interrupted purge simply continues where
+    it stopped the next time it runs. With a ``lease``, it is renewed
+    with every goal batch.
+    """
+
+    def __init__(self, db: AsyncSession, lease: Optional[JobLease] = None):
+        self.db = db
+        self.lease = lease
+
+    async def mark_deleted(self, user: User) -> None:
+        user.deleted_at = datetime.utcnow()
+        await self.db.commit()
+
+    async def _goal_batch(self, user_id: int) -> List[int]:
+        result = await self.db.execute(
+            select(Goal.id).filter(Goal.user_id == user_id).order_by(Goal.id).limit(settings.PURGE_BATCH_SIZE)
+        )
+        return list(result.scalars().all())
+
+    async def _delete_updates(self, goal_ids: List[int]) -> int:
+        deleted = 0
+        while True:
+            batch = select(ProgressUpdate.id).filter(
+                ProgressUpdate.goal_id.in_(goal_ids)
+            ).limit(settings.PURGE_BATCH_SIZE).scalar_subquery()
+            result = await self.db.execute(
+                delete(ProgressUpdate).where(ProgressUpdate.id.in_(batch)),
+                execution_options={"synchronize_session": False}
+            )
+            await self.db.commit()
+            deleted += result.rowcount
+            if result.rowcount < settings.PURGE_BATCH_SIZE:
+                return deleted
+            await asyncio.sleep(settings.PURGE_BATCH_PAUSE_SECONDS)
+
+    async def purge_user(self, user_id: int) -> int:
+        """Delete everything the user owns; returns the number of goals removed."""
+        goals_deleted = 0
+        while True:
+            goal_ids = await self._goal_batch(user_id)
+            if not goal_ids:
+                break
+            await self._delete_updates(goal_ids)
+            await self.db.execute(
+                delete(Goal).where(Goal.id.in_(goal_ids)),
+                execution_options={"synchronize_session": False}
+            )
+            if self.lease is not None:
+                await self.lease.renew()
+            await self.db.commit()
+            goals_deleted += len(goal_ids)
+            await asyncio.sleep(settings.PURGE_BATCH_PAUSE_SECONDS)
+
+        await self.db.execute(delete(User).where(User.id == user_id))
+        await self.db.commit()
+        logger.info(f"Purged user {user_id} ({goals_deleted} goals)")
+        return goals_deleted
+
+    async def pending_user_ids(self) -> List[int]:
+        result = await self.db.execute(
+            select(User.id).filter(User.deleted_at.isnot(None)).order_by(User.deleted_at)
+        )
+        return list(result.scalars().all())
+
+async def run_purge(user_id: Optional[int] = None) -> int:
+    """Purge one user, or every account marked deleted when ``user_id`` is None.
+
+    The sweep over every pending account runs at each worker's startup;
+    a lease lets only one worker do it, and the others return 0.
+    """
+    from database import AsyncSessionLocal
+    async with AsyncSessionLocal() as session:
+        if user_id is not None:
+            await PurgeService(session).purge_user(user_id)
+            return 1
+
+        lease = JobLease(session, PURGE_JOB, settings.PURGE_LEASE_SECONDS)
+        if not await lease.acquire():
+            logger.info("Account purge is running elsewhere")
+            return 0
+        try:
+            service = PurgeService(session, lease)
+            purged = 0
+            for pending_id in await service.pending_user_ids():
+                if not await lease.renew():
+                    logger.warning("Account purge lease taken over by another worker, stopping")
+                    break
+                await service.purge_user(pending_id)
+                purged += 1
+            return purged
+        finally:
+            await session.rollback()
+            await lease.release()
+
+# Strong references so running purges are not garbage collected
+_tasks: Set[asyncio.Task] = set()
+
+def _log_failure(task: asyncio.Task) -> None:
+    _tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Purge failed, it resumes on next startup: {str(task.exception())}")
+
+def schedule_purge(user_id: Optional[int] = None) -> None:
+    task = asyncio.create_task(run_purge(user_id))
+    _tasks.add(task)
+    task.add_done_callback(_log_failure)
+
+async def wait_for_purges() -> None:
+    """Wait until every purge started by schedule_purge has finished."""
+    while _tasks:
+        await asyncio.gather(*_tasks, return_exceptions=True)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Purge accounts marked as deleted")
+    parser.add_argument("--user-id", type=int, default=None, help="Only purge this user")
+    args = parser.parse_args()
+    asyncio.run(run_purge(args.user_id))
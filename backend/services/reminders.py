@@ -0,0 +1,259 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from models import Goal, User, ReminderOutbox, SchedulerCheckpoint
+from services.email import send_email
+from services.leases import JobLease
+from core.config import settings
+from datetime import date, datetime, timedelta
+from html import escape
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+REMINDER_JOB = "deadline_reminders"
+MAX_GOALS_PER_EMAIL = 20
+
+class ReminderScheduler:
+    """Finds goals near or past their deadline and emails their owners.
+
+    A run has two phases. ``scan`` walks the goals whose target date falls
+    in the reminder window in (target_date, id) order, one indexed batch at
+    a time, and enqueues one outbox row per user; the keyset cursor is
+    committed with each batch, so a restarted run resumes where it stopped.
+    ``deliver`` then sends the pending outbox rows. The unique (user,
+    run_date) constraint keeps a user to one email per day even when
+    batches are retried. A lease on the checkpoint row keeps concurrent
+    workers from running the same job.
+    """
+
+    def __init__(self, db: AsyncSession, owner: Optional[str] = None):
+        self.db = db
+        self.lease = JobLease(db, REMINDER_JOB, settings.REMINDER_LEASE_SECONDS, owner)
+        self.owner = self.lease.owner
+
+    def _insert(self, model):
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            return postgresql.insert(model)
+        if dialect == "sqlite":
+            return sqlite.insert(model)
+        raise NotImplementedError(f"Reminder upsert is not supported on {dialect}")
+
+    @staticmethod
+    def window(run_date: date) -> Tuple[date, date]:
+        return (
+            run_date - timedelta(days=settings.REMINDER_OVERDUE_DAYS),
+            run_date + timedelta(days=settings.REMINDER_LOOKAHEAD_DAYS)
+        )
+
+    async def acquire_lease(self) -> bool:
+        return await self.lease.acquire()
+
+    async def _renew_lease(self) -> bool:
+        """Extend the lease; False when another worker has taken it over."""
+        return await self.lease.renew()
+
+    async def release_lease(self) -> None:
+        await self.lease.release()
+
+    async def scan(self, run_date: date) -> int:
+        """Enqueue reminders for ``run_date``; returns the number of new outbox rows."""
+        checkpoint = await self.db.get(SchedulerCheckpoint, REMINDER_JOB, populate_existing=True)
+        if checkpoint.run_date != run_date:
+            checkpoint.run_date = run_date
+            checkpoint.cursor_date = None
+            checkpoint.cursor_id = None
+            checkpoint.completed_at = None
+        elif checkpoint.completed_at is not None:
+            return 0
+
+        start, end = self.window(run_date)
+        enqueued = 0
+        while True:
+            query = select(Goal.id, Goal.user_id, Goal.target_date).filter(
+                Goal.target_date >= start,
+                Goal.target_date <= end
+            )
+            if checkpoint.cursor_date is not None:
+                query = query.filter(
+                    tuple_(Goal.target_date, Goal.id) > tuple_(checkpoint.cursor_date, checkpoint.cursor_id)
+                )
+            result = await self.db.execute(
+                query.order_by(Goal.target_date, Goal.id).limit(settings.REMINDER_BATCH_SIZE)
+            )
+            rows = result.all()
+            if not rows:
+                break
+
+            user_ids = sorted({row.user_id for row in rows})
+            inserted = await self.db.execute(
+                self._insert(ReminderOutbox).values([
+                    {"user_id": user_id, "run_date": run_date, "status": "pending", "attempts": 0}
+                    for user_id in user_ids
+                ]).on_conflict_do_nothing(index_elements=["user_id", "run_date"])
+            )
+            enqueued += max(inserted.rowcount, 0)
+
+            # The cursor commits with the batch it describes
+            checkpoint.cursor_date = rows[-1].target_date
+            checkpoint.cursor_id = rows[-1].id
+            await self._renew_lease()
+            await self.db.commit()
+
+            if len(rows) < settings.REMINDER_BATCH_SIZE:
+                break
+
+        checkpoint.completed_at = datetime.utcnow()
+        await self.db.commit()
+        logger.info(f"Reminder scan for {run_date} enqueued {enqueued} emails")
+        return enqueued
+
+    async def _goals_by_user(self, entries: List[ReminderOutbox]) -> Dict[int, List[Any]]:
+        """Goals in reminder range for a batch of outbox rows, in one query.
+
+        Rows of the batch can belong to different run dates, so this loads
+        the union of their windows; _compose narrows it per row.
+        """
+        windows = [self.window(entry.run_date) for entry in entries]
+        result = await self.db.execute(
+            select(Goal.user_id, Goal.description, Goal.target_date).filter(
+                Goal.user_id.in_(sorted({entry.user_id for entry in entries})),
+                Goal.target_date >= min(start for start, _ in windows),
+                Goal.target_date <= max(end for _, end in windows)
+            ).order_by(Goal.user_id, Goal.target_date, Goal.id)
+        )
+        goals: Dict[int, List[Any]] = {}
+        for goal in result.all():
+            goals.setdefault(goal.user_id, []).append(goal)
+        return goals
+
+    def _compose(self, entry: ReminderOutbox, user_goals: List[Any]) -> Optional[Tuple[str, str]]:
+        start, end = self.window(entry.run_date)
+        goals = [goal for goal in user_goals if start <= goal.target_date <= end][:MAX_GOALS_PER_EMAIL]
+        if not goals:
+            return None
+
+        items = []
+        for goal in goals:
+            days = (goal.target_date - entry.run_date).days
+            if days < 0:
+                when = f"{-days} day{'s' if days != -1 else ''} overdue"
+            elif days == 0:
+                when = "due today"
+            else:
+                when = f"due in {days} day{'s' if days != 1 else ''}"
+            items.append(f"<li>{escape(goal.description)} &mdash; {when}</li>")
+
+        body = f"""
+        <p>Some of your goals are reaching their target date:</p>
+        <ul>{''.join(items)}</ul>
+        <p><a href="{settings.FRONTEND_URL}/dashboard">Log your progress</a></p>
+        """
+        return "Upcoming goal deadlines", body
+
+    async def deliver(self) -> int:
+        """Send pending outbox rows in id order; returns the number sent.
+
+        Each row's outcome is committed, with a lease renewal, as soon as
+        its email is sent, and no transaction is open during SMTP calls:
+        a crash or a lost lease repeats at most the email in flight.
+        """
+        sent = 0
+        last_id = 0
+        while True:
+            result = await self.db.execute(
+                select(ReminderOutbox, User.email).join(
+                    User, User.id == ReminderOutbox.user_id
+                ).filter(
+                    ReminderOutbox.status == "pending",
+                    ReminderOutbox.id > last_id
+                ).order_by(ReminderOutbox.id).limit(settings.REMINDER_BATCH_SIZE)
+            )
+            entries = result.all()
+            if not entries:
+                break
+
+            goals = await self._goals_by_user([entry for entry, _ in entries])
+            await self.db.commit()
+            for entry, email in entries:
+                last_id = entry.id
+                message = self._compose(entry, goals.get(entry.user_id, []))
+                if message is None:
+                    # Goals were deleted or moved since the scan
+                    entry.status = "skipped"
+                else:
+                    entry.attempts += 1
+                    try:
+                        await send_email(email, *message)
+                        entry.status = "sent"
+                        entry.sent_at = datetime.utcnow()
+                        sent += 1
+                    except Exception as e:
+                        logger.error(f"Reminder email to user {entry.user_id} failed: {str(e)}")
+                        entry.last_error = str(e)
+                        if entry.attempts >= settings.REMINDER_MAX_ATTEMPTS:
+                            entry.status = "failed"
+
+                # The outcome is recorded even when the lease was lost, so
+                # the new owner does not send this email again
+                owned = await self._renew_lease()
+                await self.db.commit()
+                if not owned:
+                    logger.warning("Reminder lease taken over by another worker, stopping delivery")
+                    return sent
+
+        return sent
+
+async def run_reminders_once(run_date: Optional[date] = None) -> Dict[str, int]:
+    from database import AsyncSessionLocal
+    async with AsyncSessionLocal() as session:
+        scheduler = ReminderScheduler(session)
+        if not await scheduler.acquire_lease():
+            logger.info("Reminder job is running elsewhere")
+            return {"enqueued": 0, "sent": 0}
+        try:
+            enqueued = await scheduler.scan(run_date or date.today())
+            sent = await scheduler.deliver()
+        finally:
+            await session.rollback()
+            await scheduler.release_lease()
+    return {"enqueued": enqueued, "sent": sent}
+
+async def _reminder_loop() -> None:
+    while True:
+        try:
+            await run_reminders_once()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Reminder run failed: {str(e)}")
+        await asyncio.sleep(settings.REMINDER_INTERVAL_SECONDS)
+
+_task: Optional[asyncio.Task] = None
+
+def start_reminder_scheduler() -> None:
+    global _task
+    if settings.REMINDERS_ENABLED and _task is None:
+        _task = asyncio.create_task(_reminder_loop())
+
+async def stop_reminder_scheduler() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Send deadline reminder emails once")
+    parser.add_argument("--date", type=date.fromisoformat, default=None,
+                        help="Run date (YYYY-MM-DD); defaults to today")
+    args = parser.parse_args()
+    print(asyncio.run(run_reminders_once(args.date)))
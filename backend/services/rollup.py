@@ -0,0 +1,236 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, case, distinct
+from sqlalchemy.dialects import postgresql, sqlite
+from models import Goal, ProgressUpdate, ProgressDailyRollup
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+CATCH_UP_BATCH_SIZE = 500
+
+class RollupService:
+    """Maintains and queries the ``progress_daily_rollup`` table.
+
+    Dashboard reads only touch the rollup, so their cost grows with the
+    number of days shown rather than the number of raw progress updates.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def _insert(self):
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            return postgresql.insert(ProgressDailyRollup)
+        if dialect == "sqlite":
+            return sqlite.insert(ProgressDailyRollup)
+        raise NotImplementedError(f"Rollup upsert is not supported on {dialect}")
+
+    async def record_progress(self, goal: Goal, progress_update: ProgressUpdate) -> None:
+        """Fold one new progress update into its day's rollup row.
+
+        Runs in the caller's transaction so the rollup commits together
+        with the update it describes.
+        """
+        rollup = ProgressDailyRollup.__table__.c
+        stmt = self._insert().values(
+            goal_id=goal.id,
+            day=progress_update.created_at.date(),
+            user_id=goal.user_id,
+            category=goal.category,
+            last_value=progress_update.progress_value,
+            update_count=1,
+            last_update_at=progress_update.created_at
+        )
+        is_newer = stmt.excluded.last_update_at >= rollup.last_update_at
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[rollup.goal_id, rollup.day],
+            set_={
+                "update_count": rollup.update_count + 1,
+                "category": stmt.excluded.category,
+                "last_value": case((is_newer, stmt.excluded.last_value), else_=rollup.last_value),
+                "last_update_at": case((is_newer, stmt.excluded.last_update_at), else_=rollup.last_update_at)
+            }
+        )
+        await self.db.execute(stmt)
+
+    async def update_goal_category(self, goal_id: int, category: str) -> None:
+        await self.db.execute(
+            update(ProgressDailyRollup).where(
+                ProgressDailyRollup.goal_id == goal_id
+            ).values(category=category)
+        )
+
+    async def _write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        stmt = self._insert().values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["goal_id", "day"],
+            set_={
+                "user_id": stmt.excluded.user_id,
+                "category": stmt.excluded.category,
+                "last_value": stmt.excluded.last_value,
+                "update_count": stmt.excluded.update_count,
+                "last_update_at": stmt.excluded.last_update_at
+            }
+        )
+        await self.db.execute(stmt)
+
+    async def catch_up(self, since: Optional[date] = None) -> int:
+        """Recompute rollup rows for every day from ``since`` onwards.
+
+        Defaults to the day before the newest rollup row, which repairs any
+        incremental writes that were lost; an empty table is rebuilt fully.
+        Raw updates are streamed in (goal, time) order, so memory use is
+        bounded by the batch size; everything commits at the end because a
+        commit would close the streaming cursor. Returns the number of rows
+        written. Archived updates (services/archive.py) are not read: their
+        days keep the rows written before archival, so a full rebuild after
+        an archive run only covers the days still in progress_updates.
+        """
+        if since is None:
+            newest = await self.db.scalar(select(func.max(ProgressDailyRollup.day)))
+            since = newest - timedelta(days=1) if newest else None
+
+        query = select(
+            ProgressUpdate.goal_id,
+            ProgressUpdate.progress_value,
+            ProgressUpdate.created_at,
+            Goal.user_id,
+            Goal.category
+        ).join(Goal, Goal.id == ProgressUpdate.goal_id).order_by(
+            ProgressUpdate.goal_id, ProgressUpdate.created_at
+        )
+        if since is not None:
+            query = query.filter(
+                ProgressUpdate.created_at >= datetime.combine(since, datetime.min.time())
+            )
+
+        written = 0
+        batch: List[Dict[str, Any]] = []
+        current = None
+        result = await self.db.stream(query)
+        async for row in result:
+            key = (row.goal_id, row.created_at.date())
+            if current is None or current["key"] != key:
+                if current is not None:
+                    batch.append(current["row"])
+                current = {
+                    "key": key,
+                    "row": {
+                        "goal_id": row.goal_id,
+                        "day": key[1],
+                        "user_id": row.user_id,
+                        "category": row.category,
+                        "update_count": 0
+                    }
+                }
+            current["row"]["update_count"] += 1
+            current["row"]["last_value"] = row.progress_value
+            current["row"]["last_update_at"] = row.created_at
+
+            if len(batch) >= CATCH_UP_BATCH_SIZE:
+                await self._write_batch(batch)
+                written += len(batch)
+                batch = []
+        await result.close()
+
+        if current is not None:
+            batch.append(current["row"])
+        if batch:
+            await self._write_batch(batch)
+            written += len(batch)
+        await self.db.commit()
+
+        logger.info(f"Rollup catch-up since {since} wrote {written} rows")
+        return written
+
+    async def category_summary(self, user_id: int, start: date, end: date) -> List[Dict[str, Any]]:
+        rollup = ProgressDailyRollup
+        in_range = (
+            (rollup.user_id == user_id) & (rollup.day >= start) & (rollup.day <= end)
+        )
+
+        # Each goal's latest day inside the range gives its current value
+        latest_day = select(
+            rollup.goal_id, func.max(rollup.day).label("day")
+        ).filter(in_range).group_by(rollup.goal_id).subquery()
+
+        latest_values = select(
+            rollup.category,
+            func.avg(rollup.last_value).label("average_progress")
+        ).join(
+            latest_day,
+            (latest_day.c.goal_id == rollup.goal_id) & (latest_day.c.day == rollup.day)
+        ).group_by(rollup.category).subquery()
+
+        totals = select(
+            rollup.category,
+            func.count(distinct(rollup.goal_id)).label("goals"),
+            func.count(distinct(rollup.day)).label("active_days"),
+            func.sum(rollup.update_count).label("updates")
+        ).filter(in_range).group_by(rollup.category).subquery()
+
+        result = await self.db.execute(
+            select(
+                totals.c.category,
+                totals.c.goals,
+                totals.c.active_days,
+                totals.c.updates,
+                latest_values.c.average_progress
+            ).join(
+                latest_values, latest_values.c.category == totals.c.category
+            ).order_by(totals.c.category)
+        )
+        return [{
+            "category": row.category,
+            "goals": row.goals,
+            "active_days": row.active_days,
+            "updates": int(row.updates or 0),
+            "average_progress": round(float(row.average_progress or 0), 2)
+        } for row in result.all()]
+
+    async def daily_series(
+        self,
+        user_id: int,
+        start: date,
+        end: date,
+        category: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        rollup = ProgressDailyRollup
+        query = select(
+            rollup.day,
+            func.count(rollup.goal_id).label("goals"),
+            func.sum(rollup.update_count).label("updates"),
+            func.avg(rollup.last_value).label("average_progress")
+        ).filter(
+            rollup.user_id == user_id,
+            rollup.day >= start,
+            rollup.day <= end
+        )
+        if category:
+            query = query.filter(rollup.category == category)
+
+        result = await self.db.execute(query.group_by(rollup.day).order_by(rollup.day))
+        return [{
+            "day": row.day.isoformat(),
+            "goals": row.goals,
+            "updates": int(row.updates or 0),
+            "average_progress": round(float(row.average_progress or 0), 2)
+        } for row in result.all()]
+
+async def run_catch_up(since: Optional[date] = None) -> int:
+    from database import AsyncSessionLocal
+    async with AsyncSessionLocal() as session:
+        return await RollupService(session).catch_up(since)
+
+if __name__ == "__main__":
+    import argparse
+    import asyncio
+
+    parser = argparse.ArgumentParser(description="Rebuild progress_daily_rollup rows")
+    parser.add_argument("--since", type=date.fromisoformat, default=None,
+                        help="First day to recompute (YYYY-MM-DD); defaults to the last rolled-up day")
+    args = parser.parse_args()
+    asyncio.run(run_catch_up(args.since))
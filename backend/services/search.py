@@ -0,0 +1,115 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, column, Integer, String, Text, DateTime, Float
+from models import GOAL_SEARCH_COLUMNS, PROGRESS_SEARCH_COLUMNS, SEARCH_LANGUAGE, search_document
+from typing import Any, Dict, List
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+_RESULT_COLUMNS = (
+    column("id", Integer),
+    column("goal_id", Integer),
+    column("category", String),
+    column("text", Text),
+    column("analysis", Text),
+    column("created_at", DateTime),
+    column("rank", Float),
+)
+
+_POSTGRES_GOALS = text(f"""
+    SELECT goals.id, goals.id AS goal_id, goals.category, goals.description AS text,
+           NULL AS analysis, goals.created_at,
+           ts_rank({search_document(GOAL_SEARCH_COLUMNS, "goals")}, query) AS rank
+    FROM goals, websearch_to_tsquery('{SEARCH_LANGUAGE}', :q) AS query
+    WHERE goals.user_id = :user_id
+      AND {search_document(GOAL_SEARCH_COLUMNS, "goals")} @@ query
+    ORDER BY rank DESC, goals.id DESC
+    LIMIT :limit
+""").columns(*_RESULT_COLUMNS)
+
+_POSTGRES_PROGRESS = text(f"""
+    SELECT progress_updates.id, progress_updates.goal_id, goals.category,
+           progress_updates.update_text AS text, progress_updates.analysis,
+           progress_updates.created_at,
+           ts_rank({search_document(PROGRESS_SEARCH_COLUMNS, "progress_updates")}, query) AS rank
+    FROM progress_updates
+    JOIN goals ON goals.id = progress_updates.goal_id,
+         websearch_to_tsquery('{SEARCH_LANGUAGE}', :q) AS query
+    WHERE goals.user_id = :user_id
+      AND {search_document(PROGRESS_SEARCH_COLUMNS, "progress_updates")} @@ query
+    ORDER BY rank DESC, progress_updates.id DESC
+    LIMIT :limit
+""").columns(*_RESULT_COLUMNS)
+
+# bm25() is lower-is-better, so it is negated to rank like ts_rank
+_SQLITE_GOALS = text("""
+    SELECT goals.id, goals.id AS goal_id, goals.category, goals.description AS text,
+           NULL AS analysis, goals.created_at, -bm25(goals_fts) AS rank
+    FROM goals_fts JOIN goals ON goals.id = goals_fts.rowid
+    WHERE goals_fts MATCH :q AND goals.user_id = :user_id
+    ORDER BY rank DESC, goals.id DESC
+    LIMIT :limit
+""").columns(*_RESULT_COLUMNS)
+
+_SQLITE_PROGRESS = text("""
+    SELECT progress_updates.id, progress_updates.goal_id, goals.category,
+           progress_updates.update_text AS text, progress_updates.analysis,
+           progress_updates.created_at, -bm25(progress_updates_fts) AS rank
+    FROM progress_updates_fts
+    JOIN progress_updates ON progress_updates.id = progress_updates_fts.rowid
+    JOIN goals ON goals.id = progress_updates.goal_id
+    WHERE progress_updates_fts MATCH :q AND goals.user_id = :user_id
+    ORDER BY rank DESC, progress_updates.id DESC
+    LIMIT :limit
+""").columns(*_RESULT_COLUMNS)
+
+def _fts5_query(q: str) -> str:
+    """Quote every word so user input cannot inject FTS5 query syntax."""
+    words = re.findall(r"\w+", q)
+    return " ".join('"' + word + '"' for word in words)
+
+class SearchService:
+    """Ranked full-text search over a user's goals and progress updates.
+
+    Postgres uses the GIN expression indexes created in models.py; SQLite
+    (local testing) uses the FTS5 shadow tables kept in sync by triggers.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def search(self, user_id: int, q: str, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            queries, term = (_POSTGRES_GOALS, _POSTGRES_PROGRESS), q
+        elif dialect == "sqlite":
+            queries, term = (_SQLITE_GOALS, _SQLITE_PROGRESS), _fts5_query(q)
+        else:
+            raise NotImplementedError(f"Full-text search is not supported on {dialect}")
+
+        if not term.strip():
+            return {"results": [], "has_more": False}
+
+        # Each source is fetched in rank order up to the end of the requested
+        # page (+1 to detect a next page) and the two lists are merged.
+        window = offset + limit + 1
+        results: List[Dict[str, Any]] = []
+        for kind, query in zip(("goal", "progress"), queries):
+            rows = await self.db.execute(query, {"q": term, "user_id": user_id, "limit": window})
+            results.extend({
+                "type": kind,
+                "id": row.id,
+                "goal_id": row.goal_id,
+                "category": row.category,
+                "text": row.text,
+                "analysis": row.analysis,
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+                "rank": round(float(row.rank), 6)
+            } for row in rows.all())
+
+        results.sort(key=lambda result: result["rank"], reverse=True)
+        return {
+            "results": results[offset:offset + limit],
+            "has_more": len(results) > offset + limit
+        }
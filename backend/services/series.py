@@ -0,0 +1,90 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.archive import SERIES_DTYPE
+from services.history import ProgressHistoryService
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+
+DAY_SECONDS = 86400
+# (width, origin) in epoch seconds; weeks start on Monday 1970-01-05
+BUCKETS = {
+    "hour": (3600, 0),
+    "day": (DAY_SECONDS, 0),
+    "week": (7 * DAY_SECONDS, 4 * DAY_SECONDS),
+}
+
+def bucket_last(t: np.ndarray, v: np.ndarray, bucket: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Collapse ascending samples to the last value per time bucket, stamped with the bucket start.
+
+    Progress is a level rather than a rate, so the last value in a
+    bucket is what the goal stood at when it closed.
+    """
+    width, origin = BUCKETS[bucket]
+    keys = np.floor((t - origin) / width)
+    last = np.flatnonzero(np.append(keys[1:] != keys[:-1], True))
+    return keys[last] * width + origin, v[last]
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets downsampling; returns the indices to keep.
+
+    Keeps the first and last samples and, from each of ``threshold - 2``
+    equal-count buckets in between, the sample forming the largest
+    triangle with the previously kept sample and the next bucket's mean.
+    Bucket edges and means are computed in one pass; only the choice per
+    bucket is sequential, because it depends on the previous choice.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(np.int64)
+    counts = np.diff(edges)
+    # reduceat over x[:-1] ends the last bucket before the final sample
+    mean_x = np.add.reduceat(x[:-1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:-1], edges[:-1]) / counts
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - next_x[i]) * (y[start:end] - ay) - (ax - x[start:end]) * (next_y[i] - ay))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+class ProgressSeriesService:
+    """A goal's progress over time, reduced to a fixed number of points for charts."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def load(self, goal_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Epoch seconds and progress values of every hot and archived update, ascending."""
+        archived, hot = await ProgressHistoryService(self.db).series(goal_id)
+        chunks = [np.frombuffer(blob, dtype=SERIES_DTYPE) for blob in archived]
+        if hot:
+            times, values = zip(*hot)
+            hot_t = np.array(times, dtype="datetime64[us]").astype(np.int64) / 1e6
+            hot_v = np.nan_to_num(np.array(values, dtype=float))
+        else:
+            hot_t, hot_v = np.empty(0), np.empty(0)
+        t = np.concatenate([chunk["t"] for chunk in chunks] + [hot_t])
+        v = np.concatenate([chunk["v"].astype(float) for chunk in chunks] + [hot_v])
+        return t, v
+
+    async def series(self, goal_id: int, points: int, bucket: Optional[str] = None) -> Dict[str, Any]:
+        t, v = await self.load(goal_id)
+        total = len(t)
+        if bucket is not None and total:
+            t, v = bucket_last(t, v, bucket)
+        keep = lttb(t, v, points)
+        t, v = t[keep], v[keep]
+        return {
+            "timestamps": np.datetime_as_string(t.astype("datetime64[s]"), unit="s").tolist(),
+            "values": np.round(v, 2).tolist(),
+            "total": total
+        }
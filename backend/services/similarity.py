@@ -0,0 +1,137 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from models import Goal, GoalVector, ProgressUpdate
+from typing import Any, Dict, List
+import numpy as np
+import re
+import zlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+VECTOR_DIM = 512
+MERGE_THRESHOLD = 0.85
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from i in into is it my of on or so "
+    "that the this to up with will".split()
+)
+
+def _terms(description: str) -> List[str]:
+    words = [
+        word for word in re.findall(r"[a-z0-9]+", description.lower())
+        if len(word) > 1 and word not in _STOPWORDS
+    ]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+def term_vector(description: str) -> np.ndarray:
+    """Hash unigrams and bigrams into a fixed-size sublinear TF vector.
+
+    crc32 is used instead of hash() because vectors are persisted and
+    hash() is randomized per process.
+    """
+    terms = _terms(description or "")
+    buckets = np.fromiter(
+        (zlib.crc32(term.encode()) % VECTOR_DIM for term in terms),
+        dtype=np.int64,
+        count=len(terms)
+    )
+    counts = np.bincount(buckets, minlength=VECTOR_DIM).astype(np.float32)
+    return np.where(counts > 0, 1.0 + np.log(np.maximum(counts, 1.0)), 0.0).astype(np.float32)
+
+def encode_vector(vector: np.ndarray) -> bytes:
+    return vector.astype("<f2").tobytes()
+
+def decode_vectors(blobs: List[bytes]) -> np.ndarray:
+    return np.frombuffer(b"".join(blobs), dtype="<f2").reshape(-1, VECTOR_DIM).astype(np.float32)
+
+def cosine_scores(matrix: np.ndarray, query_row: int) -> np.ndarray:
+    """TF-IDF cosine similarity of every row against ``matrix[query_row]``.
+
+    IDF comes from the same matrix, so it adapts to the goals being compared.
+    """
+    n_docs = matrix.shape[0]
+    df = np.count_nonzero(matrix > 0, axis=0)
+    idf = np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+    weighted = matrix * idf
+    norms = np.linalg.norm(weighted, axis=1)
+    weighted /= np.where(norms > 0, norms, 1.0)[:, None]
+    return weighted @ weighted[query_row]
+
+class SimilarityService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def index_goal(self, goal: Goal) -> None:
+        """Store the goal's description vector; call after every description write."""
+        await self.db.merge(GoalVector(
+            goal_id=goal.id,
+            user_id=goal.user_id,
+            vector=encode_vector(term_vector(goal.description))
+        ))
+
+    async def find_similar(
+        self,
+        goal: Goal,
+        limit: int = 5,
+        min_score: float = 0.2
+    ) -> List[Dict[str, Any]]:
+        """Return the user's goals most similar to ``goal``, best first."""
+        result = await self.db.execute(
+            select(
+                Goal.id, Goal.category, Goal.description, Goal.target_date, GoalVector.vector
+            ).outerjoin(GoalVector, GoalVector.goal_id == Goal.id).filter(
+                Goal.user_id == goal.user_id
+            )
+        )
+        rows = result.all()
+        if len(rows) < 2:
+            return []
+
+        # Goals written before vectors existed are indexed on first use
+        blobs = []
+        for row in rows:
+            if row.vector is None:
+                vector = encode_vector(term_vector(row.description))
+                self.db.add(GoalVector(goal_id=row.id, user_id=goal.user_id, vector=vector))
+                blobs.append(vector)
+            else:
+                blobs.append(row.vector)
+
+        ids = np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows))
+        query_row = int(np.flatnonzero(ids == goal.id)[0])
+        scores = cosine_scores(decode_vectors(blobs), query_row)
+        scores[query_row] = -1.0
+
+        candidates = np.flatnonzero(scores >= min_score)
+        if candidates.size > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-scores[candidates])]
+        if candidates.size == 0:
+            return []
+
+        analyses = await self._latest_analyses([rows[i].id for i in candidates])
+        return [{
+            "goal_id": rows[i].id,
+            "category": rows[i].category,
+            "description": rows[i].description,
+            "target_date": rows[i].target_date.isoformat(),
+            "score": round(float(scores[i]), 4),
+            "merge_suggested": bool(scores[i] >= MERGE_THRESHOLD),
+            "latest_analysis": analyses.get(rows[i].id)
+        } for i in candidates]
+
+    async def _latest_analyses(self, goal_ids: List[int]) -> Dict[int, str]:
+        """Latest AI analysis of each goal, so callers can reuse prior insight."""
+        latest = select(
+            ProgressUpdate.goal_id, func.max(ProgressUpdate.created_at).label("created_at")
+        ).filter(ProgressUpdate.goal_id.in_(goal_ids)).group_by(ProgressUpdate.goal_id).subquery()
+
+        result = await self.db.execute(
+            select(ProgressUpdate.goal_id, ProgressUpdate.analysis).join(
+                latest,
+                (latest.c.goal_id == ProgressUpdate.goal_id)
+                & (latest.c.created_at == ProgressUpdate.created_at)
+            )
+        )
+        return {row.goal_id: row.analysis for row in result.all()}
@@ -0,0 +1,11 @@
+# backend/tests/conftest.py
+import os
+import sys
+from pathlib import Path
+
+# Modules import from the backend root (``from models import ...``) and read
+# settings at import time, so both are set before any test module loads
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("CACHE_BACKEND", "memory")
@@ -0,0 +1,29 @@
+# backend/tests/test_analytics.py
+import numpy as np
+
+from services.analytics import PROJECTION_HORIZON_DAYS, compute_goal_analytics
+
+def _analytics(days, values, now_days):
+    days = np.array(days, dtype=float)
+    return compute_goal_analytics(
+        np.zeros(len(days), dtype=np.int64), days, np.array(values, dtype=float),
+        1, np.array([now_days + 30.0]), now_days
+    )
+
+def test_steady_progress_is_projected():
+    result = _analytics([0, 10, 20], [0, 10, 20], 20.0)
+    assert result["velocity"][0] == 1.0
+    assert result["projected"][0] == 100.0
+
+def test_near_flat_progress_is_never_projected():
+    # ~2.3e-5 %/day would finish millions of days out, past date.max
+    days = np.arange(0, 200, 10)
+    result = _analytics(days, 50 + days * 2.3e-5, 190.0)
+    assert 0 < result["velocity"][0] < 1e-4
+    assert np.isnan(result["projected"][0])
+
+def test_projection_within_the_horizon_is_kept():
+    slope = 50 / (PROJECTION_HORIZON_DAYS - 10)
+    result = _analytics([0, 10], [50 - 10 * slope, 50], 10.0)
+    assert np.isfinite(result["projected"][0])
+    assert result["projected"][0] - 10.0 <= PROJECTION_HORIZON_DAYS
@@ -0,0 +1,22 @@
+# backend/tests/test_config.py
+from core.config import DEFAULT_AI_PROFILES, GenerationProfile, Settings
+
+def test_profile_without_override_is_the_default():
+    assert Settings().ai_profile("progress_analysis") == DEFAULT_AI_PROFILES["progress_analysis"]
+
+def test_unknown_task_gets_the_base_profile():
+    assert Settings().ai_profile("unknown") == GenerationProfile()
+
+def test_override_keeps_default_fields(monkeypatch):
+    monkeypatch.setenv("AI_PROFILES", '{"progress_analysis": {"model": "other-model", "max_tokens": 200}}')
+    profile = Settings().ai_profile("progress_analysis")
+    assert profile.model == "other-model"
+    assert profile.max_tokens == 200
+    assert profile.temperature == DEFAULT_AI_PROFILES["progress_analysis"].temperature
+    assert profile.json_mode is True
+
+def test_override_can_turn_off_json_mode():
+    settings = Settings(AI_PROFILES={"progress_analysis": {"json_mode": False}})
+    profile = settings.ai_profile("progress_analysis")
+    assert profile.json_mode is False
+    assert profile.max_tokens == DEFAULT_AI_PROFILES["progress_analysis"].max_tokens
@@ -0,0 +1,49 @@
+# backend/tests/test_dashboard.py
+import asyncio
+
+from services import dashboard
+
+INPUTS = [{"category": "Health", "description": "Run a marathon", "progress": 10}]
+
+def test_concurrent_loads_share_one_generation(monkeypatch):
+    calls = []
+
+    async def generate(user_id, inputs):
+        calls.append(user_id)
+        await asyncio.sleep(0.01)
+        return ["Keep going"]
+
+    async def rate_limit():
+        # The Redis backend yields to the loop while it checks the limit
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+    async def load():
+        task = await dashboard.generation(1, INPUTS, rate_limit=rate_limit)
+        return task, await asyncio.shield(task)
+
+    async def main():
+        return await asyncio.gather(load(), load(), load())
+
+    monkeypatch.setattr(dashboard, "generate_suggestions", generate)
+    results = asyncio.run(main())
+    assert calls == [1]
+    assert len({id(task) for task, _ in results}) == 1
+    assert all(suggestions == ["Keep going"] for _, suggestions in results)
+    assert dashboard._generations == {}
+
+def test_finished_generation_does_not_evict_a_newer_one():
+    async def main():
+        key = (1, "fingerprint")
+        old = asyncio.get_running_loop().create_future()
+        old.add_done_callback(lambda task: dashboard._forget(key, task))
+        newer = asyncio.get_running_loop().create_future()
+        dashboard._generations[key] = newer
+        old.set_result(None)
+        await asyncio.sleep(0)
+        try:
+            return dashboard._generations.get(key)
+        finally:
+            dashboard._generations.pop(key, None)
+
+    assert asyncio.run(main()) is not None
@@ -6,6 +6,7 @@ import { LogOut, Trash2, Eye, ExternalLink } from 'lucide-react';
 import { AddGoalModal } from '@/components/AddGoalModal';
 import { useAlert } from '@/context/AlertContext';
 import LoadingSpinner from '@/components/LoadingSpinner';
+import { subscribeToLiveUpdates } from '@/services/liveUpdates';
 import {
   Dialog,
   DialogContent,
@@ -29,7 +30,8 @@ const Dashboard = () => {
   const fetchAttemptsRef = useRef(0);
   const maxFetchAttempts = 3;
 
-  const fetchGoals = useCallback(async () => {
+  // Goals and, when already generated, suggestions in one request
+  const fetchDashboard = useCallback(async () => {
     if (!userId) {
       navigate('/login');
       return;
@@ -49,7 +51,7 @@ const Dashboard = () => {
         return;
       }
 
-      const response = await fetch(`${API_URL}/goals/user/${userId}`, {
+      const response = await fetch(`${API_URL}/dashboard?suggestions=defer`, {
         credentials: 'include',
         headers: {
           'Accept': 'application/json',
@@ -79,6 +81,7 @@ const Dashboard = () => {
         setGoals(cleanedGoals);
         setError(null);  // Clear any previous errors
         fetchAttemptsRef.current = 0;  // Reset attempts on success
+        return data;
       } else {
         throw new Error(data?.detail || 'Failed to fetch goals');
       }
@@ -144,7 +147,7 @@ const Dashboard = () => {
       const data = await response.json();
       if (data?.success) {
         showAlert('Goal deleted successfully', 'success');
-        await fetchGoals();
+        setGoals(current => current.filter(goal => goal.id !== goalId));
       }
     } catch (error) {
       showAlert(error.message, 'error');
@@ -179,16 +182,44 @@ const Dashboard = () => {
       }
 
       setLoading(true);
+      let dashboard;
       try {
-        await fetchGoals();
-        await fetchSuggestions();
+        dashboard = await fetchDashboard();
       } finally {
         setLoading(false);
       }
+      // Render the goals first; slow AI suggestions follow when not cached yet
+      if (!dashboard) return;
+      if (dashboard.suggestions_pending) {
+        fetchSuggestions();
+      } else {
+        setSuggestions(dashboard.suggestions);
+      }
     };
 
     checkAuth();
-  }, [userId, navigate, fetchGoals, fetchSuggestions]);
+  }, [userId, navigate, fetchDashboard, fetchSuggestions]);
+
+  // Apply changes made on other devices without polling the goals list
+  useEffect(() => {
+    if (!userId) return undefined;
+
+    return subscribeToLiveUpdates(({ type, data }) => {
+      if (type === 'goal.created') {
+        setGoals(current => current.some(goal => goal.id === data.id)
+          ? current
+          : [...current, { ...data, progress: 0 }]);
+      } else if (type === 'goal.updated') {
+        setGoals(current => current.map(goal => goal.id === data.id ? { ...goal, ...data } : goal));
+      } else if (type === 'goal.deleted') {
+        setGoals(current => current.filter(goal => goal.id !== data.id));
+      } else if (type === 'progress.analyzed') {
+        setGoals(current => current.map(goal => goal.id === data.goal_id
+          ? { ...goal, progress: data.update.progress }
+          : goal));
+      }
+    });
+  }, [userId]);
 
   const renderGoalCard = (goal) => {
     const progressColor = goal.progress >= 70 ? 'bg-green-100 text-green-800' :
@@ -248,7 +279,7 @@ const Dashboard = () => {
             onClick={() => {
               fetchAttemptsRef.current = 0;  // Reset attempts
               setError(null);  // Clear error
-              fetchGoals();    // Try again
+              fetchDashboard();    // Try again
             }}
             className="w-full"
           >
@@ -267,7 +298,7 @@ const Dashboard = () => {
           <p className="text-gray-600 mt-2">Track and manage your personal goals</p>
         </div>
         <div className="flex gap-4">
-          <AddGoalModal onGoalAdded={fetchGoals} />
+          <AddGoalModal onGoalAdded={fetchDashboard} />
           <Button variant="outline" onClick={handleLogout}>
             <LogOut className="mr-2 h-4 w-4" /> Logout
           </Button>
@@ -292,7 +323,7 @@ const Dashboard = () => {
           <div className="col-span-full text-center py-12 bg-white rounded-lg">
             <h3 className="text-xl font-semibold text-gray-900 mb-2">No Goals Yet</h3>
             <p className="text-gray-500 mb-4">Create your first goal to start tracking your progress</p>
-            <AddGoalModal onGoalAdded={fetchGoals} />
+            <AddGoalModal onGoalAdded={fetchDashboard} />
           </div>
         ) : (
           goals.map(renderGoalCard)
@@ -0,0 +1,46 @@
+const WS_URL = 'wss://ai-powered-goal-tracker.onrender.com/api/v1/ws';
+
+// Opens the live-updates socket and keeps it open, reconnecting with
+// backoff. Calls onEvent({ type, data }) for every event except pings.
+// Returns a function that closes the socket for good.
+export const subscribeToLiveUpdates = (onEvent) => {
+  let socket = null;
+  let retryDelay = 1000;
+  let retryTimer = null;
+  let closed = false;
+
+  const connect = () => {
+    const token = localStorage.getItem('token');
+    if (!token || closed) return;
+
+    socket = new WebSocket(`${WS_URL}?token=${encodeURIComponent(token)}`);
+
+    socket.onopen = () => {
+      retryDelay = 1000;
+    };
+
+    socket.onmessage = (message) => {
+      const event = JSON.parse(message.data);
+      if (event.type === 'ping') {
+        socket.send('pong');
+        return;
+      }
+      onEvent(event);
+    };
+
+    socket.onclose = (event) => {
+      // 1008: the token was rejected, reconnecting will not help
+      if (closed || event.code === 1008) return;
+      retryTimer = setTimeout(connect, retryDelay);
+      retryDelay = Math.min(retryDelay * 2, 30000);
+    };
+  };
+
+  connect();
+
+  return () => {
+    closed = true;
+    clearTimeout(retryTimer);
+    if (socket) socket.close();
+  };
+};